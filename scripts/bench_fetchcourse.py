@@ -0,0 +1,70 @@
+"""Micro-benchmark: per-request engine vs shared engine for /api/fetchcourse.
+
+Replays the database part of `/api/fetchcourse` against the configured
+database, once with a fresh engine per call (legacy behaviour) and once with
+the process-wide engine, then prints p50/p95 latencies.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_fetchcourse.py <session_id> [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.bdd import DBManager, dispose_engine
+from src.bdd.engine import DATABASE_URL_ASYNC
+from src.bdd.query import FETCH_DOCUMENT_BY_SESSION
+
+
+async def legacy_fetch(session_id: str) -> None:
+    """Fetch a document the way routes did before the shared engine."""
+    engine = create_async_engine(DATABASE_URL_ASYNC, echo=False, future=True)
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                FETCH_DOCUMENT_BY_SESSION, {"session_id": session_id}
+            )
+            result.fetchone()
+    finally:
+        # Legacy code never disposed; we do it here to avoid exhausting slots
+        await engine.dispose()
+
+
+async def shared_fetch(session_id: str) -> None:
+    """Fetch a document through DBManager and the shared pool."""
+    await DBManager().get_document_by_session_id(session_id)
+
+
+async def measure(label: str, fn, session_id: str, iterations: int) -> None:
+    """Run `fn` sequentially and print latency percentiles in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn(session_id)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<16} p50={p50:8.2f} ms  p95={p95:8.2f} ms  (n={iterations})")
+
+
+async def main() -> None:
+    session_id = sys.argv[1]
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    # Warm up the shared pool so the first checkout is not counted
+    await shared_fetch(session_id)
+
+    await measure("per-call engine", legacy_fetch, session_id, iterations)
+    await measure("shared engine", shared_fetch, session_id, iterations)
+
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Benchmark: sequential loop vs batched grading of open questions.
+
+Grades the same set of (question, expected answer, user answer) triples
+three ways: the legacy sequential loop over agent_correct_plain_question,
+correct_plain_questions(mode="concurrent") and
+correct_plain_questions(mode="single_call"). Prints wall time per run and
+how often each mode agrees with the sequential loop. The LLM response cache
+is bypassed so every run hits Gemini.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_grading.py [questions] [rounds]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from src.utils.correct_plain_question import (
+    agent_correct_plain_question,
+    correct_plain_questions,
+)
+
+SAMPLES = [
+    ("Combien font 7 - 4 ?", "7 - 4 = 3", "3"),
+    ("Quelle est la capitale de l'Italie ?", "Rome", "Milan"),
+    ("Quel gaz les plantes absorbent-elles ?", "Le dioxyde de carbone (CO2)", "du CO2"),
+    ("Dérivée de x^2 ?", "2x", "x"),
+    ("Qui a écrit Les Misérables ?", "Victor Hugo", "Hugo"),
+]
+
+
+def build_questions(count: int):
+    questions = []
+    for i in range(count):
+        question, expected, answer = SAMPLES[i % len(SAMPLES)]
+        questions.append((f"{question} (#{i})", expected, answer))
+    return questions
+
+
+async def sequential(questions):
+    """Grade the way /api/correctallquestions did before (one await per question)."""
+    results = []
+    for question, expected, answer in questions:
+        results.append(
+            await agent_correct_plain_question(
+                answer=answer, question=question, response=expected, use_cache=False
+            )
+        )
+    return results
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return (time.perf_counter() - start) * 1000, result
+
+
+async def main(count: int, rounds: int) -> None:
+    questions = build_questions(count)
+    runs = {
+        "sequential loop": lambda: sequential(questions),
+        "concurrent": lambda: correct_plain_questions(
+            questions, mode="concurrent", use_cache=False
+        ),
+        "single call": lambda: correct_plain_questions(
+            questions, mode="single_call", use_cache=False
+        ),
+    }
+
+    reference = None
+    print(f"{count} questions, {rounds} round(s)")
+    for label, make_call in runs.items():
+        wall = []
+        agreement = []
+        for _ in range(rounds):
+            elapsed, results = await timed(make_call())
+            wall.append(elapsed)
+            if reference is None:
+                reference = results
+            agreement.append(sum(a == b for a, b in zip(results, reference)) / count)
+        print(
+            f"{label:>16}: wall p50={statistics.median(wall):.0f}ms "
+            f"max={max(wall):.0f}ms  agreement={statistics.mean(agreement):.0%}"
+        )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    asyncio.run(main(count, rounds))
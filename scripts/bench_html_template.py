@@ -0,0 +1,109 @@
+"""Benchmark: HTML build time of a course export, legacy vs template pipeline.
+
+Builds the HTML of a synthetic 10-part course (no diagrams, so only the
+template work is measured) three ways:
+
+- legacy: course Markdown, then a fresh `markdown.markdown` with 4
+  extensions, the logo re-read and re-encoded, and the stylesheet f-string,
+- template (cold): src.utils.pdf_template with an empty part memo,
+- template (warm): same course again, every part served from the memo.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_html_template.py [parts] [rounds]
+"""
+
+import base64
+import statistics
+import sys
+import time
+
+import markdown
+
+from src.models import CourseOutput, Part
+from src.utils import pdf_template
+from src.utils.pdf_template import LOGO_PATH, MARKDOWN_EXTENSIONS, PAGE_CSS, course_html
+from src.utils.save_files import course_output_to_markdown
+
+CONTENT = """Un paragraphe d'explication avec du **gras**, de l'*italique* et du `code`.
+
+| Colonne | Valeur |
+|---------|--------|
+| a       | 1      |
+| b       | 2      |
+
+```python
+def f(x):
+    return x * 2
+```
+
+- point un
+- point deux
+
+> Une citation pour finir.
+"""
+
+
+def build_course(parts: int) -> CourseOutput:
+    return CourseOutput(
+        id="bench",
+        title="Benchmark export",
+        parts=[
+            Part(id_part=str(i), title=f"Partie {i}", content=f"{CONTENT * 3}\n{i}")
+            for i in range(parts)
+        ],
+    )
+
+
+def legacy_html(course: CourseOutput) -> str:
+    """Build the HTML the way _build_html_template did before."""
+    html_content = markdown.markdown(
+        course_output_to_markdown(course), extensions=MARKDOWN_EXTENSIONS
+    )
+    with open(LOGO_PATH, "rb") as img_file:
+        logo_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head><meta charset="utf-8"><style>{PAGE_CSS}</style></head>
+    <body>
+        <div id="header_content"><img src="data:image/png;base64,{logo_base64}" /></div>
+        {html_content}
+    </body>
+    </html>
+    """
+
+
+def cold_html(course: CourseOutput) -> str:
+    pdf_template._part_content_html.cache_clear()
+    return course_html(course)
+
+
+def measure(label: str, fn, course: CourseOutput, rounds: int) -> None:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(course)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(
+        f"{label:>16}: p50={statistics.median(samples):7.2f}ms "
+        f"p95={p95:7.2f}ms (n={rounds})"
+    )
+
+
+def main(parts: int, rounds: int) -> None:
+    course = build_course(parts)
+    print(f"{parts}-part course, {rounds} round(s)")
+    measure("legacy", legacy_html, course, rounds)
+    measure("template (cold)", cold_html, course, rounds)
+    course_html(course)
+    measure("template (warm)", course_html, course, rounds)
+    print(f"part memo: {pdf_template.part_cache_info()}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
@@ -0,0 +1,92 @@
+"""Benchmark: curl subprocess vs pooled async client for Kroki renders.
+
+Renders the same set of diagrams concurrently through the legacy path (one
+`curl` subprocess per diagram inside asyncio.to_thread) and through the
+shared KrokiClient, then prints wall time and per-diagram p50/p95.
+
+Point KROKI_URL at a local container to benchmark without the public
+service: docker run -p 8000:8000 yuzutech/kroki
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_kroki.py [diagrams] [rounds]
+"""
+
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+from src.config import diagram_settings
+from src.utils.kroki_client import close_kroki_client, get_kroki_client
+
+SOURCES = [
+    ("mermaid", "graph TD\n  A[Start] --> B{{Choice {i}}}\n  B -->|yes| C[Done]\n  B -->|no| A"),
+    ("graphviz", "digraph G {{ a -> b; b -> c; c -> a; label=\"{i}\" }}"),
+    ("plantuml", "@startuml\nAlice -> Bob: hello {i}\nBob --> Alice: ok\n@enduml"),
+]
+
+
+def curl_render(diagram_type: str, code: str) -> bytes:
+    """Render one diagram the way the pipeline did before (curl subprocess)."""
+    proc = subprocess.run(
+        [
+            "curl", "-sS", "-f", "-X", "POST",
+            "-H", "Content-Type: text/plain",
+            f"{diagram_settings.KROKI_URL.rstrip('/')}/{diagram_type}/png",
+            "--data-binary", "@-",
+        ],
+        input=code.encode("utf-8"),
+        capture_output=True,
+        check=False,
+        timeout=30,
+    )
+    return proc.stdout if proc.returncode == 0 else b""
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(label: str, make_call, diagrams: int, rounds: int) -> None:
+    """Render `diagrams` diagrams concurrently per round and print latencies."""
+    samples = []
+    wall = []
+    for r in range(rounds):
+        jobs = []
+        for i in range(diagrams):
+            diagram_type, source = SOURCES[i % len(SOURCES)]
+            jobs.append(make_call(diagram_type, source.format(i=f"{r}-{i}")))
+        start = time.perf_counter()
+        samples.extend(await asyncio.gather(*(timed(job) for job in jobs)))
+        wall.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(
+        f"{label:<10} {diagrams} diagrams  wall={statistics.median(wall):8.1f} ms  "
+        f"per-diagram p50={p50:7.1f} ms  p95={p95:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    diagrams = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    client = get_kroki_client()
+
+    await run(
+        "subprocess",
+        lambda t, code: asyncio.to_thread(curl_render, t, code),
+        diagrams,
+        rounds,
+    )
+    await run("httpx", lambda t, code: client.render(t, code), diagrams, rounds)
+
+    await close_kroki_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""Load test: request latency while PDF exports run.
+
+Fires `exports` concurrent PDF exports of a synthetic diagram-heavy course
+and, meanwhile, a stream of simulated chat turns (an await standing in for
+the Gemini call, plus the event-loop time around it). Runs twice: rendering
+inline on the event loop (the legacy `pisa.CreatePDF` call) and through the
+PDF process pool. Prints chat-turn latency p50/p95/max next to a baseline
+without exports; with the pool, chat latency should match the baseline.
+
+With --url, the same is done against a running server instead: exports go
+to POST /api/downloadcourse for <session_id> and GET /api/health is probed.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_pdf_export.py [exports] [parts]
+    PYTHONPATH=. uv run python scripts/bench_pdf_export.py --url http://localhost:8000 <session_id> [exports]
+"""
+
+import asyncio
+import base64
+import statistics
+import sys
+import time
+
+import httpx
+
+from src.models import CourseOutput, Part
+from src.utils.kroki_client import close_kroki_client, get_kroki_client
+from src.utils.pdf_pool import PDFRenderBusy, close_pdf_pool, get_pdf_pool
+from src.utils.save_files import course_pdf_bytes
+
+CHAT_TURN_SECONDS = 0.2  # simulated Gemini round-trip
+CHAT_INTERVAL_SECONDS = 0.05
+
+MARKDOWN = """Un paragraphe d'explication avec du **gras**, de l'*italique* et du `code`.
+
+| Colonne | Valeur |
+|---------|--------|
+| a       | 1      |
+| b       | 2      |
+
+```python
+def f(x):
+    return x * 2
+```
+
+- point un
+- point deux
+"""
+
+
+async def build_course(parts: int) -> CourseOutput:
+    """Synthetic course with one rendered diagram per part."""
+    png = await get_kroki_client().render(
+        "graphviz", "digraph G { a -> b; b -> c; c -> a; c -> d; d -> a }", "png"
+    )
+    await close_kroki_client()
+    image = base64.b64encode(png).decode("ascii")
+    return CourseOutput(
+        id="bench",
+        title="Benchmark export",
+        parts=[
+            Part(
+                id_part=str(i),
+                title=f"Partie {i}",
+                content=MARKDOWN * 4,
+                schema_description="Diagramme",
+                diagram_type="graphviz",
+                img_base64=image,
+            )
+            for i in range(parts)
+        ],
+    )
+
+
+def summary(label: str, samples) -> None:
+    samples = sorted(samples)
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(
+        f"{label:>22}: p50={statistics.median(samples):7.0f}ms "
+        f"p95={p95:7.0f}ms max={samples[-1]:7.0f}ms (n={len(samples)})"
+    )
+
+
+async def chat_turns(stop: asyncio.Event):
+    """Simulated chat turns until `stop` is set; returns their latencies."""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(CHAT_TURN_SECONDS)
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(CHAT_INTERVAL_SECONDS)
+    return samples
+
+
+async def inline_export(course: CourseOutput) -> None:
+    """Export the way /api/downloadcourse did before (CPU on the event loop)."""
+    await asyncio.sleep(0)
+    course_pdf_bytes(course)
+
+
+async def pooled_export(course: CourseOutput) -> None:
+    try:
+        await get_pdf_pool().run(course_pdf_bytes, course)
+    except PDFRenderBusy:
+        pass
+
+
+async def local(exports: int, parts: int) -> None:
+    course = await build_course(parts)
+    # Spawn the worker processes before measuring
+    await get_pdf_pool().run(course_pdf_bytes, course)
+
+    stop = asyncio.Event()
+    baseline = asyncio.create_task(chat_turns(stop))
+    await asyncio.sleep(3)
+    stop.set()
+    summary("no export", await baseline)
+
+    for label, export in (("inline pisa", inline_export), ("process pool", pooled_export)):
+        stop = asyncio.Event()
+        chat = asyncio.create_task(chat_turns(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(export(course) for _ in range(exports)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        summary(f"{label} ({elapsed:.1f}s)", await chat)
+
+    close_pdf_pool()
+
+
+async def remote(url: str, session_id: str, exports: int) -> None:
+    async with httpx.AsyncClient(base_url=url, timeout=300) as client:
+
+        async def probe(stop: asyncio.Event):
+            samples = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                samples.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(CHAT_INTERVAL_SECONDS)
+            return samples
+
+        async def export():
+            response = await client.post(
+                "/api/downloadcourse", data={"session_id": session_id}
+            )
+            return response.status_code
+
+        stop = asyncio.Event()
+        baseline = asyncio.create_task(probe(stop))
+        await asyncio.sleep(3)
+        stop.set()
+        summary("no export", await baseline)
+
+        stop = asyncio.Event()
+        health = asyncio.create_task(probe(stop))
+        statuses = await asyncio.gather(*(export() for _ in range(exports)))
+        stop.set()
+        summary(f"{exports} exports", await health)
+        print(
+            "export status codes:",
+            {code: statuses.count(code) for code in sorted(set(statuses))},
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--url":
+        asyncio.run(
+            remote(
+                sys.argv[2],
+                sys.argv[3],
+                int(sys.argv[4]) if len(sys.argv) > 4 else 8,
+            )
+        )
+    else:
+        asyncio.run(
+            local(
+                int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+                int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+            )
+        )
@@ -0,0 +1,120 @@
+"""Benchmark: peak RSS and time of a course PDF export, base64 vs file images.
+
+Renders a synthetic course with 12 diagrams two ways, each in a fresh
+process so peak RSS is not shared between runs:
+
+- base64: the legacy path, diagrams inlined as data URIs in the course
+  Markdown, converted to HTML, then rendered by xhtml2pdf,
+- files: `course_pdf_bytes`, diagrams written to temp files once and
+  handed to xhtml2pdf through its link callback.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_pdf_memory.py [diagrams] [size]
+"""
+
+import asyncio
+import base64
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from xhtml2pdf import pisa
+
+from src.models import CourseOutput, Part
+from src.utils.kroki_client import close_kroki_client, get_kroki_client
+from src.utils.pdf_template import html_document, markdown_to_html
+from src.utils.save_files import course_output_to_markdown, course_pdf_bytes
+
+MARKDOWN = """Un paragraphe d'explication avec du **gras**, de l'*italique* et du `code`.
+
+- point un
+- point deux
+"""
+
+
+async def render_diagram(size: int) -> bytes:
+    """A PNG diagram from Kroki, with `size` nodes in a chain."""
+    edges = "; ".join(f"n{i} -> n{i + 1}" for i in range(size))
+    png = await get_kroki_client().render("graphviz", f"digraph G {{ {edges} }}", "png")
+    await close_kroki_client()
+    return png
+
+
+def build_course(diagrams: int, png: bytes, directory: str):
+    """Course with `diagrams` parts referencing one PNG, and its image files."""
+    image = base64.b64encode(png).decode("ascii")
+    parts, image_files = [], {}
+    for i in range(diagrams):
+        img_hash = f"bench-{i}"
+        path = os.path.join(directory, f"{img_hash}.png")
+        with open(path, "wb") as f:
+            f.write(png)
+        image_files[img_hash] = path
+        parts.append(
+            Part(
+                id_part=str(i),
+                title=f"Partie {i}",
+                content=MARKDOWN * 4,
+                schema_description="Diagramme",
+                diagram_type="graphviz",
+                img_base64=image,
+                img_format="png",
+            )
+        )
+    return CourseOutput(id="bench", title="Benchmark export", parts=parts), image_files
+
+
+def base64_export(course: CourseOutput, image_files) -> int:
+    """Export the way it was done before: data URIs through Markdown and HTML."""
+    full_html = html_document(markdown_to_html(course_output_to_markdown(course)))
+    pdf_buffer = BytesIO()
+    pisa.CreatePDF(src=full_html, dest=pdf_buffer, encoding="utf-8")
+    return len(pdf_buffer.getvalue())
+
+
+def file_export(course: CourseOutput, image_files) -> int:
+    """Export with diagrams referenced by file (the inline base64 is dropped)."""
+    for idx, part in enumerate(course.parts):
+        part.img_hash, part.img_base64 = f"bench-{idx}", None
+    return len(course_pdf_bytes(course, image_files))
+
+
+def run(label: str, diagrams: int, png: bytes, results) -> None:
+    """Child process: build the course, export it, report time and peak RSS."""
+    with tempfile.TemporaryDirectory(prefix="bench_pdf_") as directory:
+        course, image_files = build_course(diagrams, png, directory)
+        export = base64_export if label == "base64" else file_export
+        start = time.perf_counter()
+        size = export(course, image_files)
+        elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((label, elapsed, peak, size))
+
+
+def main(diagrams: int, size: int) -> None:
+    png = asyncio.run(render_diagram(size))
+    print(f"{diagrams} diagrams of {len(png) / 1024:.0f} KiB each")
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    for label in ("base64", "files"):
+        process = context.Process(target=run, args=(label, diagrams, png, results))
+        process.start()
+        label, elapsed, peak, pdf_size = results.get()
+        process.join()
+        print(
+            f"{label:>8}: {elapsed * 1000:7.0f}ms peak RSS={peak:6.1f} MiB "
+            f"pdf={pdf_size / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 12,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 40,
+    )
@@ -0,0 +1,65 @@
+"""Benchmark: DBManager (SQLAlchemy) vs DBReader (asyncpg pool) read paths.
+
+Runs the hot sidebar/document reads against the configured database through
+both paths and prints p50/p95 latencies per query.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_read_path.py <user_id> <session_id> [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from src.bdd import DBManager, DBReader, dispose_engine
+from src.utils import create_db_pool
+
+
+async def measure(label: str, call, iterations: int) -> None:
+    """Await `call()` sequentially and print latency percentiles in ms."""
+    await call()  # warm-up: connection checkout + statement preparation
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<40} p50={p50:8.2f} ms  p95={p95:8.2f} ms")
+
+
+async def main() -> None:
+    user_id = sys.argv[1]
+    session_id = sys.argv[2]
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    pool = await create_db_pool()
+    readers = {"DBManager": DBManager(), "DBReader": DBReader(pool)}
+
+    for name, reader in readers.items():
+        await measure(
+            f"{name}.fetch_all_chats",
+            lambda: reader.fetch_all_chats(user_id),
+            iterations,
+        )
+        await measure(
+            f"{name}.fetch_all_deepcourses",
+            lambda: reader.fetch_all_deepcourses(user_id),
+            iterations,
+        )
+        await measure(
+            f"{name}.get_document_by_session_id",
+            lambda: reader.get_document_by_session_id(session_id),
+            iterations,
+        )
+
+    await pool.close()
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Benchmark: per-diagram render latency across diagram backends.
+
+For every diagram type, renders the same sources through each backend that
+supports it (Kroki and any installed local backend: `dot`, `plantuml`,
+vl-convert) and prints p50/p95 latency and output size. The render cache is
+bypassed; sources vary per round so Kroki cannot serve them from its own cache.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_renderers.py [rounds] [png|svg]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+from src.utils.diagram_renderers import RENDERERS
+from src.utils.kroki_client import close_kroki_client
+
+
+def vegalite_source(i: int) -> str:
+    return json.dumps(
+        {
+            "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+            "title": f"Run {i}",
+            "data": {"values": [{"x": k, "y": k * k} for k in range(10)]},
+            "mark": "line",
+            "encoding": {
+                "x": {"field": "x", "type": "quantitative"},
+                "y": {"field": "y", "type": "quantitative"},
+            },
+        }
+    )
+
+
+SOURCES: Dict[str, Callable[[int], str]] = {
+    "graphviz": lambda i: f'digraph G {{ rankdir=LR; a -> b -> c -> d; b -> d; label="{i}" }}',
+    "plantuml": lambda i: f"@startuml\nAlice -> Bob: request {i}\nBob --> Alice: response\n@enduml",
+    "vegalite": vegalite_source,
+    "mermaid": lambda i: f"graph TD\n  A[Start] --> B{{Choice {i}}}\n  B -->|yes| C[Done]\n  B -->|no| A",
+}
+
+
+async def bench(
+    renderer, diagram_type: str, source: Callable[[int], str], rounds: int, fmt: str
+) -> None:
+    samples = []
+    size = 0
+    failures = 0
+    for r in range(rounds):
+        start = time.perf_counter()
+        data = await renderer.render(diagram_type, source(r), fmt)
+        samples.append((time.perf_counter() - start) * 1000)
+        if data is None:
+            failures += 1
+        else:
+            size = len(data)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(
+        f"{diagram_type:<9} {renderer.name:<9} p50={p50:8.1f} ms  p95={p95:8.1f} ms  "
+        f"size={size / 1024:7.1f} KB  failures={failures}/{rounds}"
+    )
+
+
+async def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "png"
+
+    for diagram_type, source in SOURCES.items():
+        for renderer in RENDERERS.values():
+            if not renderer.supports(diagram_type, fmt):
+                continue
+            if not renderer.available():
+                print(f"{diagram_type:<9} {renderer.name:<9} (not installed)")
+                continue
+            await bench(renderer, diagram_type, source, rounds, fmt)
+
+    await close_kroki_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
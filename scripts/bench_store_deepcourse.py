@@ -0,0 +1,160 @@
+"""Benchmark: row-by-row vs batched persistence of a 16-chapter deep course.
+
+Builds a synthetic 16-chapter DeepCourseOutput, stores it once with the
+legacy loop (one CREATE_CHAPTER and three STORE_BASIC_DOCUMENT per chapter)
+and once through DBManager.store_deepcourse (one executemany per table),
+then prints p50/p95 latencies. Inserted rows are deleted after each run.
+
+Usage:
+    PYTHONPATH=. uv run python scripts/bench_store_deepcourse.py <user_id> [iterations]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from src.bdd import DBManager, dispose_engine
+from src.bdd.query import CREATE_CHAPTER, CREATE_DEEPCOURSE, STORE_BASIC_DOCUMENT
+from src.models import (
+    Chapter,
+    CourseOutput,
+    DeepCourseOutput,
+    ExerciseOutput,
+    Part,
+)
+
+CHAPTERS = 16
+
+CLEANUP = [
+    text(
+        'DELETE FROM public.document WHERE chapter_id IN '
+        '(SELECT id FROM public.chapter WHERE deep_course_id = :id)'
+    ),
+    text("DELETE FROM public.chapter WHERE deep_course_id = :id"),
+    text("DELETE FROM public.deepcourse WHERE id = :id"),
+]
+
+
+def build_deepcourse() -> tuple[DeepCourseOutput, list[dict]]:
+    """Return a synthetic 16-chapter deep course and its session mapping."""
+    exercise = {
+        "title": "Exercices",
+        "exercises": [
+            {
+                "type": "open",
+                "topic": "Topic",
+                "questions": [
+                    {"question": "Q?", "answers": "A", "explanation": "E" * 200}
+                ],
+            }
+        ],
+    }
+    chapters = []
+    sessions = []
+    for i in range(CHAPTERS):
+        chapters.append(
+            Chapter(
+                id_chapter=str(uuid4()),
+                title=f"Chapitre {i}",
+                course=CourseOutput(
+                    id=str(uuid4()),
+                    title=f"Cours {i}",
+                    parts=[
+                        Part(title=f"Partie {j}", content="Lorem ipsum " * 200)
+                        for j in range(4)
+                    ],
+                ),
+                exercice=ExerciseOutput.model_validate({"id": str(uuid4()), **exercise}),
+                evaluation=ExerciseOutput.model_validate({"id": str(uuid4()), **exercise}),
+            )
+        )
+        sessions.append(
+            {
+                "session_id_exercise": str(uuid4()),
+                "session_id_course": str(uuid4()),
+                "session_id_evaluation": str(uuid4()),
+            }
+        )
+    return DeepCourseOutput(id=str(uuid4()), title="Bench", chapters=chapters), sessions
+
+
+async def legacy_store(db: DBManager, user_id: str, content, sessions) -> None:
+    """Store the deep course with one statement per row (previous behaviour)."""
+    async with db.engine.begin() as conn:
+        await conn.execute(
+            CREATE_DEEPCOURSE,
+            {"id": content.id, "titre": content.title, "google_sub": user_id},
+        )
+        for chapter, chapter_sessions in zip(content.chapters, sessions):
+            await conn.execute(
+                CREATE_CHAPTER,
+                {
+                    "id": chapter.id_chapter,
+                    "deep_course_id": content.id,
+                    "titre": chapter.title,
+                    "is_complete": False,
+                },
+            )
+            now = datetime.now()
+            for document, key, document_type in (
+                (chapter.exercice, "session_id_exercise", "exercise"),
+                (chapter.course, "session_id_course", "course"),
+                (chapter.evaluation, "session_id_evaluation", "eval"),
+            ):
+                await conn.execute(
+                    STORE_BASIC_DOCUMENT,
+                    {
+                        "id": document.id,
+                        "google_sub": user_id,
+                        "session_id": chapter_sessions[key],
+                        "chapter_id": chapter.id_chapter,
+                        "document_type": document_type,
+                        "contenu": json.dumps(document.model_dump()),
+                        "created_at": now,
+                        "updated_at": now,
+                    },
+                )
+
+
+async def batched_store(db: DBManager, user_id: str, content, sessions) -> None:
+    await db.store_deepcourse(user_id, content, sessions)
+
+
+async def measure(label: str, store, db: DBManager, user_id: str, iterations: int):
+    """Run `store` on fresh deep courses and print latency percentiles in ms."""
+    samples = []
+    for _ in range(iterations + 1):
+        content, sessions = build_deepcourse()
+        start = time.perf_counter()
+        await store(db, user_id, content, sessions)
+        samples.append((time.perf_counter() - start) * 1000)
+
+        async with db.engine.begin() as conn:
+            for statement in CLEANUP:
+                await conn.execute(statement, {"id": content.id})
+
+    samples = sorted(samples[1:])  # first run is warm-up
+    p50 = statistics.median(samples)
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(f"{label:<12} {CHAPTERS} chapters  p50={p50:8.2f} ms  p95={p95:8.2f} ms")
+
+
+async def main() -> None:
+    user_id = sys.argv[1]
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    db = DBManager()
+    await measure("row-by-row", legacy_store, db, user_id, iterations)
+    await measure("batched", batched_store, db, user_id, iterations)
+
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
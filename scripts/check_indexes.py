@@ -0,0 +1,91 @@
+"""EXPLAIN-based regression check for the document/chapter indexes.
+
+Runs EXPLAIN (FORMAT JSON) for each hot query against the configured
+database and fails if the planner does not use the expected index.
+Sequential scans are disabled for the check so the result does not depend
+on table size (tiny dev tables would otherwise always seq-scan).
+
+Usage:
+    PYTHONPATH=. uv run python scripts/check_indexes.py
+"""
+
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import text
+
+from src.bdd import DBManager, dispose_engine
+from src.bdd.query import (
+    FETCH_ALL_CHAPTERS,
+    FETCH_ALL_CHATS,
+    FETCH_CHAPTER_DOCUMENTS,
+    FETCH_DOCUMENT_BY_SESSION,
+    FETCH_DOCUMENT_CONTENT_BY_ID,
+)
+
+# (label, query, params, expected index)
+CASES = [
+    ("FETCH_ALL_CHATS", FETCH_ALL_CHATS, {"user_id": "x"}, "ix_document_chat_listing"),
+    (
+        "FETCH_DOCUMENT_BY_SESSION",
+        FETCH_DOCUMENT_BY_SESSION,
+        {"session_id": "x"},
+        "ux_document_session_id",
+    ),
+    (
+        "FETCH_DOCUMENT_CONTENT_BY_ID",
+        FETCH_DOCUMENT_CONTENT_BY_ID,
+        {"session_id": "x"},
+        "ux_document_session_id",
+    ),
+    (
+        "FETCH_CHAPTER_DOCUMENTS",
+        FETCH_CHAPTER_DOCUMENTS,
+        {"chapter_id": "x"},
+        "ix_document_chapter_id",
+    ),
+    (
+        "FETCH_ALL_CHAPTERS",
+        FETCH_ALL_CHAPTERS,
+        {"deep_course_id": "x"},
+        "ix_chapter_deep_course_position",
+    ),
+]
+
+
+def iter_index_names(plan: Dict[str, Any]) -> Iterator[str]:
+    """Yield every index name referenced in an EXPLAIN JSON plan tree."""
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from iter_index_names(child)
+
+
+async def main() -> int:
+    db_manager = DBManager()
+    failures = 0
+
+    async with db_manager.engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+
+        for label, query, params, expected in CASES:
+            explain = text("EXPLAIN (FORMAT JSON) " + query.text.strip().rstrip(";"))
+            result = await conn.execute(explain, params)
+            raw = result.scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            used = set(iter_index_names(plan))
+
+            if expected in used:
+                print(f"✅ {label}: {expected}")
+            else:
+                failures += 1
+                print(f"❌ {label}: expected {expected}, got {sorted(used) or 'no index'}")
+
+    await dispose_engine()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
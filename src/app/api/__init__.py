@@ -5,14 +5,17 @@ Aggregates all API endpoint routers into a single main router.
 
 from fastapi import APIRouter
 
+from .asset import router as asset_router
 from .changesettings import router as changesettings_router
 from .chat import router as chat_router
 from .correctallquestions import router as correctallquestions_router
 from .correctplainquestion import router as correctplainquestion_router
+from .deepcoursejob import router as deepcoursejob_router
 from .deletechapter import router as deletechapter_router
 from .deletechat import router as deletechat_router
 from .deletedeepcourse import router as deletedeepcourse_router
 from .downloadcourse import router as downloadcourse_router
+from .downloaddeepcourse import router as downloaddeepcourse_router
 from .fetchallchapters import router as fetchallchapters_router
 from .fetchallchats import router as fetchallchats_router
 from .fetchalldeepcourses import router as fetchalldeepcourses_router
@@ -52,17 +55,23 @@ api_router.include_router(fetchallchapters_router)
 api_router.include_router(fetchchapterdocuments_router)
 api_router.include_router(correctallquestions_router)
 api_router.include_router(downloadcourse_router)
+api_router.include_router(downloaddeepcourse_router)
+api_router.include_router(asset_router)
+api_router.include_router(deepcoursejob_router)
 
 __all__ = [
     "api_router",
+    "asset_router",
     "changesettings_router",
     "chat_router",
     "correctallquestions_router",
     "correctplainquestion_router",
+    "deepcoursejob_router",
     "deletechapter_router",
     "deletechat_router",
     "deletedeepcourse_router",
     "downloadcourse_router",
+    "downloaddeepcourse_router",
     "fetchallchapters_router",
     "fetchallchats_router",
     "fetchalldeepcourses_router",
@@ -0,0 +1,104 @@
+"""Endpoint to serve content-addressed assets (diagram images)."""
+
+import gzip
+import logging
+from typing import Dict, Optional, Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from src.bdd import DBManager, DBReader, get_db_reader
+from src.bdd.assets import is_gzipped
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/asset", tags=["Asset"])
+
+# Assets are addressed by the hash of their content, so a URL never changes meaning.
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# SVG diagrams come from LLM-written source and are served from the API origin:
+# opening one must never run script or load anything.
+SECURITY_HEADERS = {
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+    "X-Content-Type-Options": "nosniff",
+}
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (honours q=0 and "*")."""
+    if not accept_encoding:
+        return False
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            qualities[coding.lower()] = q
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def _etag(asset_hash: str, gzipped: bool) -> str:
+    """Strong ETag of one representation (encoding) of an asset."""
+    return f'"{asset_hash}-gz"' if gzipped else f'"{asset_hash}"'
+
+
+@router.get("/{asset_hash}")
+async def fetch_asset(
+    asset_hash: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    bdd_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
+):
+    """Serve a stored asset by its SHA-256 hash.
+
+    Gzip-compressed assets (svgz diagrams) are sent as-is with
+    `Content-Encoding: gzip`, or decompressed for clients not accepting gzip.
+    Each encoding has its own ETag: `"<hash>-gz"` for gzip, `"<hash>"` as-is.
+    A sandboxing Content-Security-Policy keeps SVG from running script.
+    """
+    accepts_gzip = _accepts_gzip(accept_encoding)
+    headers = {
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+        **SECURITY_HEADERS,
+    }
+
+    # Assets are immutable: any representation this client can be sent is valid
+    candidates = [_etag(asset_hash, gzipped=True)] if accepts_gzip else []
+    candidates.append(_etag(asset_hash, gzipped=False))
+    if if_none_match:
+        sent = [t.strip() for t in if_none_match.split(",")]
+        for etag in candidates:
+            if etag in sent:
+                return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    asset = await bdd_manager.fetch_asset(asset_hash)
+    if not asset:
+        logger.warning(f"No asset found for hash={asset_hash}")
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    data = bytes(asset["data"])
+    gzipped = False
+    if is_gzipped(data):
+        if accepts_gzip:
+            headers["Content-Encoding"] = "gzip"
+            gzipped = True
+        else:
+            data = gzip.decompress(data)
+    headers["ETag"] = _etag(asset_hash, gzipped)
+
+    return Response(
+        content=data,
+        media_type=asset["mime_type"],
+        headers=headers,
+    )
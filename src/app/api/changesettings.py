@@ -2,9 +2,9 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 
 router = APIRouter(prefix="/changesettings", tags=["ChangeSettings"])
 
@@ -15,9 +15,9 @@ async def change_settings(
     new_given_name: Optional[str] = Form(None),
     new_notion_token: Optional[str] = Form(None),
     new_niveau_etude: Optional[str] = Form(None),
+    db_manager: DBManager = Depends(get_db_manager),
 ):
     """Update user settings (name, Notion token, study level)."""
-    db_manager = DBManager()
     await db_manager.change_settings(
         user_id, 
         new_given_name, 
@@ -1,23 +1,33 @@
 """Endpoint to correct multiple plain text questions."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from src.bdd import DBManager, get_db_manager
 from src.dto import CorrectMultipleQuestionsRequest, CorrectPlainQuestionResponse
-from src.utils import agent_correct_plain_question
+from src.utils import correct_plain_questions
 
 router = APIRouter(prefix="/correctallquestions", tags=["CorrectAllQuestions"])
 
 
 @router.post("", response_model=list[CorrectPlainQuestionResponse])
-async def correct_multiple_plain_questions(request: CorrectMultipleQuestionsRequest):
+async def correct_multiple_plain_questions(
+    request: CorrectMultipleQuestionsRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Evaluate multiple user answers and return correctness for each."""
-    results = []
-    for q in request.questions:
-        is_correct = await agent_correct_plain_question(
-            answer=q.user_answer,
-            question=q.question,
-            response=q.expected_answer
+    results = await correct_plain_questions(
+        [(q.question, q.expected_answer, q.user_answer) for q in request.questions],
+        mode=request.mode,
+    )
+
+    if request.doc_id:
+        await db_manager.correct_plain_questions(
+            request.doc_id,
+            [
+                {"id_question": q.id_question, "is_correct": is_correct, "answer": q.user_answer}
+                for q, is_correct in zip(request.questions, results)
+                if q.id_question
+            ],
         )
-        results.append(CorrectPlainQuestionResponse(is_correct=is_correct))
-    
-    return results
\ No newline at end of file
+
+    return [CorrectPlainQuestionResponse(is_correct=is_correct) for is_correct in results]
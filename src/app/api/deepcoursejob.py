@@ -0,0 +1,50 @@
+"""Endpoints to follow and retry background deep course generation."""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from src.bdd.job_queue import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/deepcoursejob", tags=["DeepCourseJob"])
+
+
+class DeepCourseJobStatus(BaseModel):
+    deepcourse_id: str
+    status: str
+    progress: float
+    total_steps: int
+    done_steps: int
+    failed_steps: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+async def _job_status(job_id: str) -> DeepCourseJobStatus:
+    status = await get_job_queue().status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return DeepCourseJobStatus(deepcourse_id=status.pop("id"), **status)
+
+
+@router.get("/{job_id}", response_model=DeepCourseJobStatus)
+async def deepcourse_job_status(job_id: str):
+    """Status of a deep course job; progress is the % of settled steps."""
+    return await _job_status(job_id)
+
+
+@router.post("/{job_id}/retry", response_model=DeepCourseJobStatus)
+async def retry_deepcourse_job(job_id: str):
+    """Queue a finished job again to regenerate only its failed artifacts."""
+    if not await get_job_queue().retry_failed(job_id):
+        await _job_status(job_id)
+        raise HTTPException(status_code=409, detail="Job is still running")
+    logger.info(f"Deep course job {job_id} requeued")
+    return await _job_status(job_id)
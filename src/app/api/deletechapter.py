@@ -1,8 +1,8 @@
 """Endpoint to delete a chapter."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.config import app_settings
 from src.dto import DeleteChapterRequest
 
@@ -10,9 +10,11 @@ router = APIRouter(prefix="/deletechapter", tags=["DeleteChapter"])
 
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_chapter(req: DeleteChapterRequest):
+async def delete_chapter(
+    req: DeleteChapterRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Delete a chapter and associated documents."""
-    db_manager = DBManager()
     app_name = app_settings.APP_NAME
 
     await db_manager.delete_chapter(req.chapter_id)
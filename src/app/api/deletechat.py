@@ -1,9 +1,9 @@
 """Endpoint to delete a chat session."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from google.adk.sessions import DatabaseSessionService
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.config import app_settings
 from src.dto import DeleteChatRequest
 
@@ -12,9 +12,11 @@ router = APIRouter(prefix="/deletechat", tags=["DeleteChat"])
 
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_chat(req: DeleteChatRequest):
+async def delete_chat(
+    req: DeleteChatRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Delete a chat session and associated data."""
-    db_manager = DBManager()
     #session_service = DatabaseSessionService() 
     app_name = app_settings.APP_NAME
 
@@ -2,9 +2,9 @@
 
 import logging
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +12,12 @@ router = APIRouter(prefix="/deletedeepcourse", tags=["DeleteDeepCourse"])
 
 
 @router.delete("", status_code=204)
-async def delete_deepcourse(user_id: str = Form(...), deepcourse_id: str = Form(...)):
+async def delete_deepcourse(
+    user_id: str = Form(...),
+    deepcourse_id: str = Form(...),
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Delete a deep course for a user."""
-    db_manager = DBManager()
     logger.info(f"Deleting deepcourse_id={deepcourse_id} for user_id={user_id}")
 
     await db_manager.delete_deepcourse(user_id, deepcourse_id)
@@ -2,25 +2,38 @@
 
 import json
 import logging
+import tempfile
+from typing import Optional
 
-from fastapi import APIRouter, Form, HTTPException
+from fastapi import APIRouter, Depends, Form, Header, HTTPException, Response
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
+from src.bdd.assets import write_course_assets
 from src.models import CourseOutput
-from src.utils.save_files import generate_course_pdf_response
+from src.utils.pdf_cache import get_pdf_cache, pdf_version
+from src.utils.pdf_pool import PDFRenderBusy, PDFRenderTimeout, get_pdf_pool
+from src.utils.save_files import course_pdf_bytes, pdf_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/downloadcourse", tags=["DownloadCourse"])
 
+# Revalidate each time: the ETag changes as soon as the course does
+CACHE_CONTROL = "private, no-cache"
+
 
 @router.post("")
 async def download_course(
     session_id: str = Form(...),
+    if_none_match: Optional[str] = Header(None),
+    dbmanager: DBManager = Depends(get_db_manager),
 ):
-    """Download a course as PDF by session ID."""
+    """Download a course as PDF by session ID.
+
+    The PDF is cached per course version, which is also its ETag: a request
+    with a matching `If-None-Match` gets a 304 without any rendering.
+    """
     try:
-        dbmanager = DBManager()
         test_course = await dbmanager.get_document_by_session_id(session_id)
 
         if not test_course:
@@ -37,10 +50,41 @@ async def download_course(
         else:
             course_data = contenu
 
+        version = pdf_version(course_data)
+        etag = f'"{version}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
         objet_course = CourseOutput.model_validate(course_data)
 
-        return generate_course_pdf_response(objet_course)
+        async def render() -> bytes:
+            logger.info(f"Rendering PDF for course: {objet_course.title}")
+            # Diagrams go to the renderer as files, not base64 in the course
+            with tempfile.TemporaryDirectory(prefix="course_assets_") as workdir:
+                image_files = await write_course_assets(objet_course, dbmanager, workdir)
+                return await get_pdf_pool().run(
+                    course_pdf_bytes, objet_course, image_files
+                )
 
+        pdf_bytes = await get_pdf_cache().get_or_render(
+            test_course["id"], version, render
+        )
+        return pdf_response(pdf_bytes, objet_course.title, headers)
+
+    except HTTPException:
+        raise
+    except PDFRenderBusy as e:
+        logger.warning(f"PDF export rejected: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="PDF export queue is full, retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except PDFRenderTimeout as e:
+        logger.error(f"PDF export timed out: {e}")
+        raise HTTPException(status_code=504, detail="PDF generation timed out")
     except json.JSONDecodeError as e:
         logger.error(f"JSON parsing error: {e}")
         raise HTTPException(
@@ -0,0 +1,48 @@
+"""Endpoint to download a whole deep course (every chapter) at once."""
+
+import logging
+from typing import Literal
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.bdd import DBManager, get_db_manager
+from src.utils.deepcourse_export import MEDIA_TYPES, stream_deepcourse_export
+from src.utils.save_files import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/downloaddeepcourse", tags=["DownloadDeepCourse"])
+
+
+@router.post("")
+async def download_deepcourse(
+    deepcourse_id: str = Form(...),
+    export_format: Literal["zip", "pdf"] = Form("zip"),
+    db_manager: DBManager = Depends(get_db_manager),
+):
+    """Download every chapter (course, exercises, evaluation) of a deep course.
+
+    "zip" streams one PDF per chapter as soon as each is rendered; "pdf"
+    streams a single document once all chapters are rendered.
+    """
+    rows = await db_manager.get_deepcourse_and_chapter_with_id(deepcourse_id)
+    chapters = await db_manager.fetch_all_chapters(deepcourse_id)
+    if not rows or not chapters:
+        logger.warning(f"No chapters found for deepcourse_id={deepcourse_id}")
+        raise HTTPException(status_code=404, detail="Deep course not found")
+
+    title = rows[0]["deepcourse_title"] or "deepcourse"
+    filename = f"{sanitize_filename(title)}.{export_format}"
+    logger.info(
+        f"Exporting deepcourse_id={deepcourse_id} ({len(chapters)} chapters) as {export_format}"
+    )
+
+    return StreamingResponse(
+        stream_deepcourse_export(chapters, db_manager, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"
+        },
+    )
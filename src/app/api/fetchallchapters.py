@@ -1,12 +1,12 @@
 """Endpoint to fetch all chapters for a deep course."""
 
 import logging
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 from pydantic import BaseModel
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +25,12 @@ class FetchAllChaptersResponse(BaseModel):
 
 
 @router.post("")
-async def fetch_all_chapters(deepcourse_id: str = Form(...)):
+async def fetch_all_chapters(
+    deepcourse_id: str = Form(...),
+    db_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
+):
     """Fetch all chapters for a deep course."""
     logger.info(f"Fetching all chapters for deep_course_id={deepcourse_id}")
-    db_manager = DBManager()
     chapters = await db_manager.fetch_all_chapters(deepcourse_id)
     listed_chapters = [Chapter.model_validate(chapter) for chapter in chapters]
     logger.info(
@@ -1,12 +1,12 @@
 """Endpoint to fetch all chat sessions for a user."""
 
 import logging
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +29,12 @@ class FetchAllChatResponse(BaseModel):
 
 
 @router.post("")
-async def fetch_all_chats(data: FetchAllChatRequest):
+async def fetch_all_chats(
+    data: FetchAllChatRequest,
+    db_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
+):
     """Fetch all chat sessions for a user."""
     logger.info(f"Fetching all chats for user_id={data.user_id}")
-    db_manager = DBManager()
     sessions = await db_manager.fetch_all_chats(data.user_id)
     listed_sessions = [Session.model_validate(session) for session in sessions]
     logger.info(
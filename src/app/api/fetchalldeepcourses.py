@@ -1,12 +1,12 @@
 """Endpoint to fetch all deep courses for a user."""
 
 import logging
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 from pydantic import BaseModel
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +25,11 @@ class FetchAllChatDeepCoursesResponse(BaseModel):
 
 
 @router.post("", response_model=FetchAllChatDeepCoursesResponse)
-async def fetch_all_deepcourses(user_id: str = Form(...)):
+async def fetch_all_deepcourses(
+    user_id: str = Form(...),
+    db_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
+):
     """Fetch all deep courses for a user with their completion rate."""
-    db_manager = DBManager()
     logger.info(f"Fetching all deepcourses for user_id={user_id}")
     
     deep_courses_data = await db_manager.fetch_all_deepcourses(user_id)
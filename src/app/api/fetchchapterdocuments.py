@@ -1,11 +1,12 @@
 """Endpoint to fetch chapter documents (session IDs)."""
 
 import logging
+from typing import Union
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 from pydantic import BaseModel
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +23,9 @@ class FetchChapterDocumentResponse(BaseModel):
 @router.post("", response_model=FetchChapterDocumentResponse)
 async def fetch_chapter_documents(
     chapter_id: str = Form(...),
+    bdd_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
 ):
     """Fetch all document session IDs for a chapter."""
-    bdd_manager = DBManager()
 
     logger.info(f"Fetching documents for chapter_id={chapter_id}")
 
@@ -3,25 +3,23 @@
 import logging
 from typing import List, Optional, Literal, cast
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 from google.adk.sessions import DatabaseSessionService
 
-from src.config import app_settings, database_settings
+from src.bdd import get_session_service
+from src.config import app_settings
 from src.dto import EventMessage, FetchChatResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/fetchchat", tags=["FetchChat"])
 
-db_session_service = DatabaseSessionService(
-    db_url=database_settings.dsn, 
-)
-
 
 @router.post("", response_model=FetchChatResponse)
 async def fetch_chat(
     user_id: str = Form(...),
     session_id: Optional[str] = Form(None),
+    db_session_service: DatabaseSessionService = Depends(get_session_service),
 ):
     """Fetch chat history for a given session."""
     logger.info(
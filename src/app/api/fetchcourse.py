@@ -2,10 +2,14 @@
 
 import json
 import logging
+from datetime import datetime, timedelta
+from typing import Union
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
+from src.bdd.assets import inline_course_svgs
+from src.config import app_settings
 from src.models import CourseOutput
 
 logger = logging.getLogger(__name__)
@@ -16,9 +20,18 @@ router = APIRouter(prefix="/fetchcourse", tags=["FetchCourse"])
 @router.post("", response_model=CourseOutput)
 async def fetch_course(
     session_id: str = Form(...),
+    inline_svg: bool = Form(False),
+    bdd_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
 ):
-    """Fetch a course for a given session from the database."""
-    bdd_manager = DBManager()
+    """Fetch a course for a given session from the database.
+
+    Diagrams are referenced by `img_hash` (served by /api/asset). With
+    `inline_svg`, SVG diagrams are also returned as markup in `img_svg`.
+    Parts whose `diagram_status` is "pending" get their diagram later: poll
+    until none is pending. Diagrams still pending COURSES_STALE_SECONDS after
+    the last patch were abandoned (crash or redeploy) and are reported as
+    "failed".
+    """
 
     logger.info(f"Fetching course for session_id={session_id}")
 
@@ -53,8 +66,26 @@ async def fetch_course(
         if "id" not in course_data:
             course_data["id"] = session_id
 
+        course = CourseOutput.model_validate(course_data)
+
+        # Diagram backfill abandoned: stop the client from polling forever
+        updated_at = course_object.get("updated_at")
+        if (
+            updated_at is not None
+            and datetime.now() - updated_at
+            > timedelta(seconds=app_settings.COURSES_STALE_SECONDS)
+        ):
+            stale = [p for p in course.parts if p.diagram_status == "pending"]
+            if stale:
+                logger.warning(f"Stale diagrams for session_id={session_id}")
+            for part in stale:
+                part.diagram_status = "failed"
+
+        if inline_svg:
+            course = await inline_course_svgs(course, bdd_manager)
+
         logger.info(f"Retrieved course for session_id={session_id}")
-        return CourseOutput.model_validate(course_data)
+        return course
 
     except (json.JSONDecodeError, ValueError, KeyError, TypeError) as e:
         logger.error(f"Error parsing course content: {e}")
@@ -2,10 +2,13 @@
 
 import json
 import logging
+from datetime import datetime, timedelta
+from typing import Union
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 
-from src.bdd import DBManager
+from src.bdd import DBManager, DBReader, get_db_reader
+from src.config import app_settings
 from src.models import ExerciseOutput
 
 logger = logging.getLogger(__name__)
@@ -16,9 +19,15 @@ router = APIRouter(prefix="/fetchexercise", tags=["FetchExercise"])
 @router.post("", response_model=ExerciseOutput)
 async def fetch_exercise(
     session_id: str = Form(...),
+    bdd_manager: Union[DBReader, DBManager] = Depends(get_db_reader),
 ):
-    """Fetch an exercise for a given session from the database."""
-    bdd_manager = DBManager()
+    """Fetch an exercise for a given session from the database.
+
+    While `status` is "generating", exercise blocks are still being appended:
+    poll until it becomes "completed" (or "failed"). A document still
+    "generating" whose last block is older than EXERCISES_STALE_SECONDS was
+    abandoned (crash or redeploy mid-generation) and is reported as "failed".
+    """
 
     logger.info(f"Fetching exercise for session_id={session_id}")
 
@@ -53,6 +62,17 @@ async def fetch_exercise(
             if "title" not in exercise_data.keys():
                 exercise_data["title"] = ""
 
+            # Generation abandoned: stop the client from polling forever
+            updated_at = exo_data.get("updated_at")
+            if (
+                exercise_data.get("status") == "generating"
+                and updated_at is not None
+                and datetime.now() - updated_at
+                > timedelta(seconds=app_settings.EXERCISES_STALE_SECONDS)
+            ):
+                logger.warning(f"Stale exercise generation for session_id={session_id}")
+                exercise_data["status"] = "failed"
+
             logger.info(f"Retrieved exercise for session_id={session_id}")
             return ExerciseOutput.model_validate(exercise_data)
 
@@ -2,6 +2,12 @@
 
 from fastapi import APIRouter
 
+from src.utils.diagram_cache import get_diagram_cache
+from src.utils.llm_cache import get_llm_cache
+from src.utils.llm_scheduler import get_llm_scheduler
+from src.utils.pdf_cache import get_pdf_cache
+from src.utils.pdf_pool import get_pdf_pool
+
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
@@ -9,3 +15,15 @@ router = APIRouter(prefix="/health", tags=["Health"])
 async def health():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+async def metrics():
+    """In-process counters: render and LLM response caches, LLM scheduler queues, PDF pool and cache."""
+    return {
+        "diagram_cache": get_diagram_cache().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "llm_scheduler": get_llm_scheduler().stats(),
+        "pdf_cache": get_pdf_cache().stats(),
+        "pdf_pool": get_pdf_pool().stats(),
+    }
@@ -2,9 +2,9 @@
 
 from logging import getLogger
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.dto import LoginRequest, LoginResponse
 
 logger = getLogger(__name__)
@@ -12,8 +12,10 @@ logger = getLogger(__name__)
 router = APIRouter(prefix="/login", tags=["Login"])
 
 @router.post("", response_model=LoginResponse)
-async def login(req: LoginRequest):
-    db_manager = DBManager()
+async def login(
+    req: LoginRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     user = await db_manager.login_user(req.email)
 
     logger.info(f"id: {user['google_sub'] if user else 'N/A'}, email: {user['email'] if user else 'N/A'} logged in.")
@@ -1,15 +1,17 @@
 """Endpoint to mark a chapter as incomplete."""
 
-from fastapi import APIRouter, Form
+from fastapi import APIRouter, Depends, Form
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 
 router = APIRouter(prefix="/markchapteruncomplete", tags=["MarkChapterUncomplete"])
 
 
 @router.put("")
-async def mark_chapter_uncomplete(chapter_id: str = Form(...)):
+async def mark_chapter_uncomplete(
+    chapter_id: str = Form(...),
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Mark a chapter as incomplete."""
-    db_manager = DBManager()
     await db_manager.mark_chapter_uncomplete(chapter_id)
     return {"is_complete": False}
@@ -1,16 +1,18 @@
 """Endpoint to mark a QCM question as corrected."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.dto import MarkIsCorrectedQCMRequest, MarkIsCorrectedQCMResponse
 
 router = APIRouter(prefix="/markiscorrectedqcm", tags=["MarkIsCorrectedQCM"])
 
 
 @router.put("", response_model=MarkIsCorrectedQCMResponse)
-async def mark_iscorrected_qcm(req: MarkIsCorrectedQCMRequest):
+async def mark_iscorrected_qcm(
+    req: MarkIsCorrectedQCMRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Mark a QCM question as corrected."""
-    db_manager = DBManager()
     await db_manager.mark_is_corrected_qcm(req.doc_id, req.question_id)
     return MarkIsCorrectedQCMResponse(is_corrected=True)
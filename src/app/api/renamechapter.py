@@ -1,16 +1,18 @@
 """Endpoint to rename a chapter."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.dto import RenameChapterRequest, RenameChapterResponse
 
 router = APIRouter(prefix="/renamechapter", tags=["RenameChapter"])
 
 
 @router.put("", response_model=RenameChapterResponse)
-async def rename_chapter(req: RenameChapterRequest):
+async def rename_chapter(
+    req: RenameChapterRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     """Rename a chapter."""
-    db_manager = DBManager()
     await db_manager.rename_chapter(req.chapter_id, req.title)
     return RenameChapterResponse(chapter_id=req.chapter_id, title=req.title)
@@ -3,9 +3,9 @@
 import logging
 from uuid import uuid4
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from src.bdd import DBManager
+from src.bdd import DBManager, get_db_manager
 from src.dto import SignupRequest, SignupResponse
 
 logger = logging.getLogger(__name__)
@@ -13,8 +13,10 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/signup", tags=["Signup"])
 
 @router.post("", response_model=SignupResponse)
-async def signup(req: SignupRequest):
-    db_manager = DBManager()
+async def signup(
+    req: SignupRequest,
+    db_manager: DBManager = Depends(get_db_manager),
+):
     google_sub = str(uuid4())
     user = await db_manager.signup_user(
         google_sub, req.email, req.name or "", notion_token="", study=""
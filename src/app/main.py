@@ -7,14 +7,25 @@ and both development and production server modes.
 import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.app.api import api_router
+from src.bdd import (
+    dispose_engine,
+    dispose_session_service,
+    get_engine,
+    get_session_service,
+)
 from src.config import app_settings
 from src.utils import create_db_pool
+from src.utils.background import drain_background_tasks
+from src.utils.job_worker import get_job_worker_pool
+from src.utils.kroki_client import close_kroki_client
+from src.utils.pdf_pool import close_pdf_pool
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,10 +40,53 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("google.adk").setLevel(logging.WARNING)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open database pools on startup and close them on shutdown."""
+    logger.info("Starting FastAPI application...")
+
+    if os.getenv("SKIP_DB_INIT", "false").lower() == "true":
+        app.state.db_pool = None
+        logger.warning("DB init skipped (SKIP_DB_INIT=true).")
+    else:
+        try:
+            timeout = int(os.getenv("DB_CONNECT_TIMEOUT", "30"))
+            app.state.db_pool = await asyncio.wait_for(
+                create_db_pool(), timeout=timeout
+            )
+            logger.info("Database pool initialized and ready.")
+        except Exception as e:
+            logger.exception("DB init failed; starting without DB.")
+            app.state.db_pool = None
+
+        # Shared SQLAlchemy engine used by DBManager (routes and tools)
+        app.state.db_engine = get_engine()
+        # Shared ADK session service (schema reflected once per process)
+        app.state.session_service = get_session_service()
+        # Deep course jobs queued in Postgres (also resumes abandoned ones)
+        app.state.job_workers = get_job_worker_pool()
+        app.state.job_workers.start()
+
+    yield
+
+    logger.info("Shutting down FastAPI application...")
+    if getattr(app.state, "job_workers", None) is not None:
+        await app.state.job_workers.stop()
+    await drain_background_tasks(app_settings.BACKGROUND_DRAIN_TIMEOUT)
+    if app.state.db_pool is not None:
+        await app.state.db_pool.close()
+        logger.info("Database pool closed successfully.")
+    await dispose_engine()
+    dispose_session_service()
+    await close_kroki_client()
+    close_pdf_pool()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
         title=app_settings.APP_NAME,
+        lifespan=lifespan,
         debug=app_settings.DEBUG,
         docs_url="/docs",
         redoc_url="/redoc",
@@ -57,33 +111,6 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router, prefix="/api")
 
-    @app.on_event("startup")
-    async def on_startup():
-        """Initialize database connection on application startup."""
-        logger.info("Starting FastAPI application...")
-
-        if os.getenv("SKIP_DB_INIT", "false").lower() == "true":
-            app.state.db_pool = None
-            logger.warning("DB init skipped (SKIP_DB_INIT=true).")
-            return
-
-        try:
-            timeout = int(os.getenv("DB_CONNECT_TIMEOUT", "30"))
-            app.state.db_pool = await asyncio.wait_for(
-                create_db_pool(), timeout=timeout
-            )
-            logger.info("Database pool initialized and ready.")
-        except Exception as e:
-            logger.exception("DB init failed; starting without DB.")
-            app.state.db_pool = None
-
-    @app.on_event("shutdown")
-    async def on_shutdown():
-        """Close database connections on application shutdown."""
-        logger.info("Shutting down FastAPI application...")
-        await app.state.db_pool.close()
-        logger.info("Database pool closed successfully.")
-
     return app
 
 
@@ -1,5 +1,33 @@
-from .dbmanager import DBManager
+from .artifact_service import (
+    ArtifactQuotaExceededError,
+    PostgresArtifactService,
+    get_artifact_service,
+)
+from .dbmanager import DBManager, get_db_manager
+from .engine import dispose_engine, get_engine
+from .gemini_file_cache import (
+    ArtifactReferencePlugin,
+    GeminiFileCache,
+    artifact_reference,
+    get_gemini_file_cache,
+)
+from .reader import DBReader, get_db_reader
+from .session_service import dispose_session_service, get_session_service
 
 __all__ = [
-    "DBManager"
-]
\ No newline at end of file
+    "ArtifactQuotaExceededError",
+    "ArtifactReferencePlugin",
+    "artifact_reference",
+    "DBManager",
+    "DBReader",
+    "dispose_engine",
+    "dispose_session_service",
+    "get_artifact_service",
+    "get_db_manager",
+    "get_db_reader",
+    "GeminiFileCache",
+    "get_engine",
+    "get_gemini_file_cache",
+    "get_session_service",
+    "PostgresArtifactService",
+]
@@ -0,0 +1,249 @@
+"""Postgres-backed ADK artifact service for chat uploads.
+
+Replaces the per-worker InMemoryArtifactService: uploads were kept in RAM
+forever and were invisible to other uvicorn workers or Cloud Run instances.
+
+- Bytes are stored once in `artifact_blob`, keyed by their SHA-256, and
+  every saved version is a row in `artifact` pointing to its blob.
+- Artifacts expire after ARTIFACT_TTL_HOURS; expired rows and unreferenced
+  blobs are purged periodically.
+- Each user may keep at most ARTIFACT_USER_QUOTA_MB of live artifacts.
+  A user's saves are serialized by a transaction-scoped advisory lock, so
+  concurrent uploads cannot both pass the quota or pick the same version.
+- Recently used blobs are kept in a per-process LRU bounded to
+  ARTIFACT_CACHE_MAX_MB. Blobs are immutable, so the cache never needs
+  invalidation across instances.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from google.adk.artifacts import BaseArtifactService
+from google.genai import types
+
+from src.bdd.engine import get_engine
+from src.bdd.query import (
+    DELETE_ARTIFACT,
+    FETCH_ARTIFACT,
+    FETCH_ARTIFACT_BLOB,
+    FETCH_ARTIFACT_USER_USAGE,
+    LIST_ARTIFACT_KEYS,
+    LIST_ARTIFACT_VERSIONS,
+    LOCK_ARTIFACT_USER,
+    PURGE_EXPIRED_ARTIFACTS,
+    PURGE_ORPHAN_ARTIFACT_BLOBS,
+    STORE_ARTIFACT_BLOB,
+    STORE_ARTIFACT_VERSION,
+)
+from src.config import database_settings
+from src.utils.lru import BytesLRU
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 600
+
+
+class ArtifactQuotaExceededError(Exception):
+    """Raised when saving an artifact would exceed the user's quota."""
+
+
+class PostgresArtifactService(BaseArtifactService):
+    """ADK artifact service storing versioned, content-addressed uploads in Postgres."""
+
+    def __init__(
+        self,
+        ttl: timedelta,
+        user_quota_bytes: int,
+        cache_max_bytes: int,
+    ):
+        self.ttl = ttl
+        self.user_quota_bytes = user_quota_bytes
+        self._cache = BytesLRU(cache_max_bytes)
+        self._last_purge = 0.0
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: Optional[str], filename: str):
+        return {
+            "app_name": app_name,
+            "user_id": user_id,
+            "session_id": session_id or "",
+            "filename": filename,
+        }
+
+    async def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        artifact: types.Part,
+        session_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Save a new version of an artifact.
+
+        Returns:
+            The version number (0 for the first save)
+
+        Raises:
+            ArtifactQuotaExceededError: If the user's live artifacts would exceed the quota
+            ValueError: If the part carries no inline data
+        """
+        if artifact.inline_data is None or artifact.inline_data.data is None:
+            raise ValueError("Only inline artifacts can be stored")
+
+        data = artifact.inline_data.data
+        digest = hashlib.sha256(data).hexdigest()
+        mime_type = artifact.inline_data.mime_type or "application/octet-stream"
+
+        await self._maybe_purge()
+
+        async with get_engine().begin() as conn:
+            # Quota check, version number and insert happen under one lock
+            await conn.execute(LOCK_ARTIFACT_USER, {"user_id": user_id})
+            result = await conn.execute(FETCH_ARTIFACT_USER_USAGE, {"user_id": user_id})
+            used = result.scalar_one()
+            if used + len(data) > self.user_quota_bytes:
+                raise ArtifactQuotaExceededError(
+                    f"Artifact quota exceeded for user {user_id}: "
+                    f"{used + len(data)} > {self.user_quota_bytes} bytes"
+                )
+
+            await conn.execute(
+                STORE_ARTIFACT_BLOB, {"hash": digest, "size": len(data), "data": data}
+            )
+            result = await conn.execute(
+                STORE_ARTIFACT_VERSION,
+                {
+                    **self._key(app_name, user_id, session_id, filename),
+                    "hash": digest,
+                    "mime_type": mime_type,
+                    "expires_at": datetime.now(timezone.utc) + self.ttl,
+                },
+            )
+            version = result.scalar_one()
+
+        self._cache.put(digest, data)
+        return version
+
+    async def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+        version: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Optional[types.Part]:
+        """Load an artifact version (latest by default), or None if missing/expired."""
+        async with get_engine().connect() as conn:
+            result = await conn.execute(
+                FETCH_ARTIFACT,
+                {**self._key(app_name, user_id, session_id, filename), "version": version},
+            )
+            row = result.fetchone()
+            if not row:
+                return None
+
+            data = self._cache.get(row.hash)
+            if data is None:
+                result = await conn.execute(FETCH_ARTIFACT_BLOB, {"hash": row.hash})
+                data = bytes(result.scalar_one())
+                self._cache.put(row.hash, data)
+
+        return types.Part.from_bytes(data=data, mime_type=row.mime_type)
+
+    async def list_artifact_keys(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """List the filenames of live artifacts in a session."""
+        async with get_engine().connect() as conn:
+            result = await conn.execute(
+                LIST_ARTIFACT_KEYS,
+                {"app_name": app_name, "user_id": user_id, "session_id": session_id or ""},
+            )
+            return [row.filename for row in result.fetchall()]
+
+    async def delete_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Delete every version of an artifact (blobs are purged later)."""
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                DELETE_ARTIFACT, self._key(app_name, user_id, session_id, filename)
+            )
+
+    async def list_versions(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[int]:
+        """List the live versions of an artifact."""
+        async with get_engine().connect() as conn:
+            result = await conn.execute(
+                LIST_ARTIFACT_VERSIONS,
+                self._key(app_name, user_id, session_id, filename),
+            )
+            return [row.version for row in result.fetchall()]
+
+    async def purge_expired(self) -> None:
+        """Delete expired artifact versions and blobs no version references."""
+        async with get_engine().begin() as conn:
+            expired = await conn.execute(PURGE_EXPIRED_ARTIFACTS)
+            orphans = await conn.execute(PURGE_ORPHAN_ARTIFACT_BLOBS)
+        self._last_purge = time.monotonic()
+        if expired.rowcount or orphans.rowcount:
+            logger.info(
+                f"🧹 Artifacts purged: {expired.rowcount} version(s), "
+                f"{orphans.rowcount} blob(s)"
+            )
+
+    async def _maybe_purge(self) -> None:
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        try:
+            await self.purge_expired()
+        except Exception as e:
+            logger.warning(f"Artifact purge failed: {e}")
+
+
+_artifact_service: Optional[PostgresArtifactService] = None
+
+
+def get_artifact_service() -> PostgresArtifactService:
+    """
+    Return the shared PostgresArtifactService, creating it on first call.
+
+    Returns:
+        Process-wide artifact service configured from DatabaseSettings
+    """
+    global _artifact_service
+
+    if _artifact_service is None:
+        _artifact_service = PostgresArtifactService(
+            ttl=timedelta(hours=database_settings.ARTIFACT_TTL_HOURS),
+            user_quota_bytes=database_settings.ARTIFACT_USER_QUOTA_MB * 1024 * 1024,
+            cache_max_bytes=database_settings.ARTIFACT_CACHE_MAX_MB * 1024 * 1024,
+        )
+
+    return _artifact_service
@@ -0,0 +1,162 @@
+"""Content-addressed storage for generated diagram images.
+
+Diagram PNGs used to be embedded as base64 in `document.contenu`, turning
+courses into multi-megabyte JSON rows. They are now stored once as raw bytes
+in the `asset` table, keyed by the SHA-256 of their content, and the course
+JSON only keeps the hash (`Part.img_hash`). Images are served by
+`/api/asset/{hash}`; the PDF export reads them as files
+(`write_course_assets`).
+
+Diagrams may be PNG or SVG (`Part.img_format`). "svgz" assets are SVG stored
+gzip-compressed and served with `Content-Encoding: gzip`.
+"""
+
+import base64
+import binascii
+import gzip
+import hashlib
+import logging
+import os
+from typing import Any, Dict, List, Protocol, Tuple
+
+from src.models import CourseOutput
+from src.utils.svg_sanitizer import sanitize_svg
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {"png": "image/png", "svg": "image/svg+xml", "svgz": "image/svg+xml"}
+GZIP_MAGIC = b"\x1f\x8b"
+FILE_EXTENSIONS = {"image/png": ".png", "image/svg+xml": ".svg"}
+
+
+class AssetSource(Protocol):
+    """Anything able to fetch asset rows by hash (DBManager, DBReader)."""
+
+    async def fetch_assets(self, hashes: List[str]) -> List[Dict[str, Any]]: ...
+
+
+def asset_hash(data: bytes) -> str:
+    """Return the content address (hex SHA-256) of an asset."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_gzipped(data: bytes) -> bool:
+    """Whether asset bytes are gzip-compressed (svgz diagrams)."""
+    return data[:2] == GZIP_MAGIC
+
+
+def extract_course_assets(
+    course: CourseOutput,
+) -> Tuple[CourseOutput, List[Dict[str, Any]]]:
+    """
+    Move inline base64 diagrams out of a course.
+
+    Args:
+        course: Course whose parts may carry `img_base64`
+
+    Returns:
+        Tuple of (copy of the course referencing images by `img_hash`,
+        list of asset rows `{hash, mime_type, data}` to persist)
+    """
+    stripped = course.model_copy(deep=True)
+    assets: Dict[str, Dict[str, Any]] = {}
+
+    for part in stripped.parts:
+        if not part.img_base64:
+            continue
+        try:
+            data = base64.b64decode(part.img_base64)
+        except (binascii.Error, ValueError) as e:
+            logger.warning(f"[ASSETS] Invalid base64 image in part {part.id_part}: {e}")
+            continue
+
+        digest = asset_hash(data)
+        assets[digest] = {
+            "hash": digest,
+            "mime_type": MIME_TYPES[part.img_format],
+            "data": data,
+        }
+        part.img_hash = digest
+        part.img_base64 = None
+
+    return stripped, list(assets.values())
+
+
+async def write_course_assets(
+    course: CourseOutput, source: AssetSource, directory: str
+) -> Dict[str, str]:
+    """
+    Write referenced diagrams to files, for exports passing images by path.
+
+    svgz assets are decompressed. No image is base64-encoded or copied into
+    the course.
+
+    Args:
+        course: Course whose parts may reference images by `img_hash`
+        source: Object exposing `fetch_assets(hashes)`
+        directory: Existing directory receiving one file per asset
+
+    Returns:
+        Dict mapping each resolvable `img_hash` to its file path
+    """
+    hashes = sorted({p.img_hash for p in course.parts if p.img_hash})
+    if not hashes:
+        return {}
+
+    paths: Dict[str, str] = {}
+    for row in await source.fetch_assets(hashes):
+        data = bytes(row["data"])
+        if is_gzipped(data):
+            data = gzip.decompress(data)
+        extension = FILE_EXTENSIONS.get(row["mime_type"], "")
+        path = os.path.join(directory, f"{row['hash']}{extension}")
+        with open(path, "wb") as f:
+            f.write(data)
+        paths[row["hash"]] = path
+
+    return paths
+
+
+async def inline_course_svgs(
+    course: CourseOutput, source: AssetSource
+) -> CourseOutput:
+    """
+    Inline referenced SVG diagrams as markup (`img_svg`), decompressing svgz.
+
+    The markup is sanitized again (see `sanitize_svg`): the frontend inserts
+    it into its own DOM.
+
+    PNG parts keep their `img_hash` only; clients load them from /api/asset.
+
+    Args:
+        course: Course whose parts may reference images by `img_hash`
+        source: Object exposing `fetch_assets(hashes)`
+
+    Returns:
+        The same course, with `img_svg` filled for every resolvable SVG part
+    """
+    hashes = sorted(
+        {
+            p.img_hash
+            for p in course.parts
+            if p.img_hash and p.img_format in ("svg", "svgz") and not p.img_svg
+        }
+    )
+    if not hashes:
+        return course
+
+    rows = await source.fetch_assets(hashes)
+    by_hash = {row["hash"]: bytes(row["data"]) for row in rows}
+
+    for part in course.parts:
+        data = by_hash.get(part.img_hash) if part.img_hash else None
+        if data is None or part.img_format not in ("svg", "svgz"):
+            continue
+        if is_gzipped(data):
+            data = gzip.decompress(data)
+        # Assets stored before renders were sanitized may still carry script
+        svg = sanitize_svg(data)
+        if svg is not None:
+            part.img_svg = svg.decode("utf-8")
+
+    return course
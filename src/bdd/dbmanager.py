@@ -7,28 +7,33 @@ Some functions are created but not yet used in the codebase.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 import json
-from google.adk.sessions import DatabaseSessionService
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.bdd.query import (
+    APPEND_DOCUMENT_EXERCISE,
     CHANGE_SETTINGS,
     CHECK_TABLES,
     CLEAR_ALL_TABLES,
     CORRECT_PLAIN_QUESTION,
     CREATE_CHAPTER,
     CREATE_DEEPCOURSE,
+    CREATE_SCHEMA_MIGRATIONS_TABLE,
     DELETE_CHAPTER,
     DELETE_DEEPCOURSE,
+    DELETE_DOCUMENT_PDF,
     DELETE_DOCUMENTS,
     DELETE_DOCUMENTS_BY_CHAPTER,
     DROP_ALL_TABLES,
     FETCH_ALL_CHAPTERS,
     FETCH_ALL_CHATS,
     FETCH_ALL_DEEPCOURSES,
+    FETCH_APPLIED_MIGRATIONS,
+    FETCH_ASSET,
+    FETCH_ASSETS,
+    FETCH_CHAPTER_DOCUMENT_CONTENTS,
     FETCH_CHAPTER_DOCUMENTS,
     FETCH_DOCUMENT_BY_SESSION,
     FETCH_DOCUMENT_CONTENT_BY_ID,
@@ -38,31 +43,21 @@ from src.bdd.query import (
     MARK_CHAPTER_COMPLETE,
     MARK_CHAPTER_UNCOMPLETE,
     MARK_IS_CORRECTED_QCM,
+    PATCH_DOCUMENT_PART,
+    RECORD_MIGRATION,
     RENAME_CHAPTER,
+    SET_DOCUMENT_STATUS,
     SIGNUP_USER,
+    STORE_ASSET,
     STORE_BASIC_DOCUMENT,
     UPDATE_DOCUMENT_CONTENT,
 )
+from src.bdd.assets import extract_course_assets
+from src.bdd.engine import get_engine, get_sessionmaker
+from src.bdd.migrations import MIGRATIONS
 from src.bdd.schema_sql import Base
-from src.config import database_settings
-from src.models import CourseOutput, DeepCourseOutput, ExerciseOutput
-
-
-# Database URL configuration
-DATABASE_URL_SYNC = database_settings.dsn
-
-# Convert sync DSN to async DSN
-if "+asyncpg" not in DATABASE_URL_SYNC:
-    if "+psycopg2" in DATABASE_URL_SYNC:
-        DATABASE_URL_ASYNC = DATABASE_URL_SYNC.replace("+psycopg2", "+asyncpg")
-    else:
-        DATABASE_URL_ASYNC = DATABASE_URL_SYNC.replace(
-            "postgresql://", "postgresql+asyncpg://"
-        )
-else:
-    DATABASE_URL_ASYNC = DATABASE_URL_SYNC
-
-print("🧩 Async DSN:", DATABASE_URL_ASYNC)
+from src.bdd.session_service import get_session_service
+from src.models import CourseOutput, DeepCourseOutput, ExerciseOutput, Part
 
 
 class DBManager:
@@ -71,17 +66,14 @@ class DBManager:
 
     Handles all database operations with async/await pattern.
     Uses ADK's sync engine for initial schema creation, then manages
-    all backend operations through an async SQLAlchemy engine.
+    all backend operations through the process-wide async SQLAlchemy engine.
+    Instances are cheap: they only hold references to the shared pool.
     """
 
     def __init__(self):
-        """Initialize async engine and session factory."""
-        # Async engine for all backend operations
-        self.engine = create_async_engine(DATABASE_URL_ASYNC, echo=False, future=True)
-        self.SessionLocal = async_sessionmaker(
-            self.engine, expire_on_commit=False, class_=AsyncSession
-        )
-        print("⚙️  Async engine initialized (backend).")
+        """Bind to the shared async engine and session factory."""
+        self.engine = get_engine()
+        self.SessionLocal = get_sessionmaker()
 
     # -----------------------------------------------------
     # CRÉATION COMPLÈTE DE LA BASE VIA ADK
@@ -92,24 +84,48 @@ class DBManager:
 
         - Uses ADK (sync) to create its core tables (sessions, events, states)
         - Creates business logic tables on the same engine
-        - Recreates async engine for backend
+        - Records schema migrations (no-ops on a freshly created schema)
         """
         print("🚀 Complete database initialization via ADK...")
 
         # 1. Launch ADK (sync) → creates its own tables
-        adk_service = DatabaseSessionService(db_url=DATABASE_URL_SYNC)
+        adk_service = get_session_service()
         adk_engine = adk_service.db_engine
 
         # 2. Create business logic tables on ADK engine
         Base.metadata.create_all(bind=adk_engine)
         print("✅ ADK + business logic tables created (via ADK sync engine).")
 
-        # 3. Recreate async engine for backend
-        self.engine = create_async_engine(DATABASE_URL_ASYNC, echo=False, future=True)
-        self.SessionLocal = async_sessionmaker(
-            self.engine, expire_on_commit=False, class_=AsyncSession
-        )
-        print("🔄 Async engine restored for backend.")
+        # 3. Bring migration bookkeeping up to date
+        await self.apply_migrations()
+
+    async def apply_migrations(self) -> List[str]:
+        """
+        Apply pending schema migrations in order.
+
+        Each migration runs in its own transaction together with its
+        bookkeeping row, so a failure leaves earlier migrations applied.
+
+        Returns:
+            Names of the migrations applied by this call
+        """
+        async with self.engine.begin() as conn:
+            await conn.execute(CREATE_SCHEMA_MIGRATIONS_TABLE)
+            result = await conn.execute(FETCH_APPLIED_MIGRATIONS)
+            already_applied = {row[0] for row in result.fetchall()}
+
+        applied = []
+        for name, statements in MIGRATIONS:
+            if name in already_applied:
+                continue
+            async with self.engine.begin() as conn:
+                for statement in statements:
+                    await conn.execute(statement)
+                await conn.execute(RECORD_MIGRATION, {"name": name})
+            print(f"📦 Migration applied: {name}")
+            applied.append(name)
+
+        return applied
 
     async def get_db(self):
         """Context manager for async database session."""
@@ -136,6 +152,36 @@ class DBManager:
         print("📋 Existing tables:", tables)
         return tables
 
+    # Asset operations
+    @staticmethod
+    def _prepare_content(content: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+        """Split inline diagrams out of a course before it is serialized."""
+        if isinstance(content, CourseOutput):
+            return extract_course_assets(content)
+        return content, []
+
+    async def _store_assets(self, conn, assets: List[Dict[str, Any]]):
+        """Insert content-addressed assets, skipping those already stored."""
+        if not assets:
+            return
+        await conn.execute(
+            STORE_ASSET,
+            [{**asset, "size": len(asset["data"])} for asset in assets],
+        )
+
+    async def fetch_asset(self, asset_hash: str):
+        """Fetch one asset (hash, mime_type, data) by its content hash."""
+        async with self.engine.begin() as conn:
+            result = await conn.execute(FETCH_ASSET, {"hash": asset_hash})
+            row = result.fetchone()
+            return dict(row._mapping) if row else None
+
+    async def fetch_assets(self, hashes: List[str]):
+        """Fetch several assets by content hash."""
+        async with self.engine.begin() as conn:
+            result = await conn.execute(FETCH_ASSETS, {"hashes": list(hashes)})
+            return [dict(row._mapping) for row in result.fetchall()]
+
     # Chat operations
     async def fetch_all_chats(self, user_id: str):
         """Fetch all chat sessions for a given user."""
@@ -162,11 +208,13 @@ class DBManager:
         created_at = datetime.now()
         updated_at = created_at
         chapter_id = chapter_id if chapter_id else None
+        content, assets = self._prepare_content(content)
         contenu_json = json.dumps(
             content.model_dump() if hasattr(content, "model_dump") else content
         )
 
         async with self.engine.begin() as conn:
+            await self._store_assets(conn, assets)
             await conn.execute(
                 STORE_BASIC_DOCUMENT,
                 {
@@ -181,6 +229,58 @@ class DBManager:
                 },
             )
 
+    async def append_exercise(self, document_id: str, exercise: Dict[str, Any]):
+        """Append one exercise block to an exercise document (atomic in SQL)."""
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                APPEND_DOCUMENT_EXERCISE,
+                {
+                    "id": document_id,
+                    "exercise": json.dumps(exercise),
+                    "updated_at": datetime.now(),
+                },
+            )
+
+    async def set_document_status(self, document_id: str, status: str):
+        """Set the generation status stored in a document's content."""
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                SET_DOCUMENT_STATUS,
+                {"id": document_id, "status": status, "updated_at": datetime.now()},
+            )
+
+    async def patch_course_part(self, document_id: str, part: Part):
+        """
+        Write the diagram of one part into a stored course (other parts untouched).
+
+        Args:
+            document_id: Course document id
+            part: Part (matched on id_part) carrying its diagram fields
+        """
+        course, assets = self._prepare_content(
+            CourseOutput(id=document_id, title="", parts=[part])
+        )
+        patch = course.parts[0].model_dump(
+            include={
+                "diagram_code",
+                "diagram_status",
+                "img_base64",
+                "img_format",
+                "img_hash",
+            }
+        )
+        async with self.engine.begin() as conn:
+            await self._store_assets(conn, assets)
+            await conn.execute(
+                PATCH_DOCUMENT_PART,
+                {
+                    "id": document_id,
+                    "id_part": part.id_part,
+                    "patch": json.dumps(patch),
+                    "updated_at": datetime.now(),
+                },
+            )
+
     async def delete_document(self, document_id: str):
         """Delete a document."""
         async with self.engine.begin() as conn:
@@ -189,16 +289,24 @@ class DBManager:
     async def update_document(
         self, document_id: str, new_content: Union[ExerciseOutput, CourseOutput]
     ):
-        """Update document content."""
+        """Update document content (and drop its cached PDF)."""
+        new_content, assets = self._prepare_content(new_content)
         contenu_json = json.dumps(
             new_content.model_dump()
             if hasattr(new_content, "model_dump")
             else new_content
         )
         async with self.engine.begin() as conn:
+            await self._store_assets(conn, assets)
             await conn.execute(
-                UPDATE_DOCUMENT_CONTENT, {"id": document_id, "contenu": contenu_json}
+                UPDATE_DOCUMENT_CONTENT,
+                {
+                    "id": document_id,
+                    "contenu": contenu_json,
+                    "updated_at": datetime.now(),
+                },
             )
+            await conn.execute(DELETE_DOCUMENT_PDF, {"document_id": document_id})
 
     async def fetch_all_deepcourses(self, user_id: str):
         """Fetch all deep courses for a given user."""
@@ -216,6 +324,68 @@ class DBManager:
             chapters = [dict(row._mapping) for row in result.fetchall()]
         return chapters
 
+    @classmethod
+    def _chapter_rows(
+        cls,
+        user_id: str,
+        deepcourse_id: str,
+        chapter_id: str,
+        title: str,
+        sessions: Dict[str, str],
+        exercice,
+        course,
+        evaluation,
+        now: datetime,
+        position: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Build the chapter row, its 3 document rows and the course assets.
+
+        Args:
+            sessions: Dict with session_id_exercise, session_id_course and
+                session_id_evaluation keys.
+            position: Index of the chapter in its deep course, None to append
+                it after the last one.
+
+        Returns:
+            Tuple of (CREATE_CHAPTER params, STORE_BASIC_DOCUMENT params,
+            STORE_ASSET rows)
+        """
+        course, assets = cls._prepare_content(course)
+
+        chapter_row = {
+            "id": chapter_id,
+            "deep_course_id": deepcourse_id,
+            "titre": title,
+            "is_complete": False,
+            "position": position,
+        }
+
+        document_rows = []
+        for document, session_key, document_type in (
+            (exercice, "session_id_exercise", "exercise"),
+            (course, "session_id_course", "course"),
+            (evaluation, "session_id_evaluation", "eval"),
+        ):
+            document_rows.append(
+                {
+                    "id": getattr(document, "id", None) or str(uuid4()),
+                    "google_sub": user_id,
+                    "session_id": sessions[session_key],
+                    "chapter_id": chapter_id,
+                    "document_type": document_type,
+                    "contenu": json.dumps(
+                        document.model_dump()
+                        if hasattr(document, "model_dump")
+                        else document
+                    ),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        return chapter_row, document_rows, assets
+
     async def store_chapter(
         self,
         title,
@@ -228,70 +398,35 @@ class DBManager:
         exercice,
         course,
         evaluation,
+        position: Optional[int] = None,
     ):
-        """Store a chapter of a deep course with its exercise, course, and evaluation."""
-        now = datetime.now()
+        """Store a chapter of a deep course with its exercise, course, and evaluation.
+
+        The chapter goes at `position` in the deep course, or after the last
+        chapter when None.
+        """
+        chapter_row, document_rows, assets = self._chapter_rows(
+            user_id,
+            deepcourse_id,
+            chapter_id,
+            title,
+            {
+                "session_id_exercise": session_exercise,
+                "session_id_course": session_course,
+                "session_id_evaluation": session_evaluation,
+            },
+            exercice,
+            course,
+            evaluation,
+            datetime.now(),
+            position,
+        )
 
         async with self.engine.begin() as conn:
-            await conn.execute(
-                CREATE_CHAPTER,
-                {
-                    "id": chapter_id,
-                    "deep_course_id": deepcourse_id,
-                    "titre": title,
-                    "is_complete": False,
-                },
-            )
-            exercise_json = json.dumps(
-                exercice.model_dump() if hasattr(exercice, "model_dump") else exercice
-            )
-            await conn.execute(
-                STORE_BASIC_DOCUMENT,
-                {
-                    "id": exercice.id,
-                    "google_sub": user_id,
-                    "session_id": session_exercise,
-                    "chapter_id": chapter_id,
-                    "document_type": "exercise",
-                    "contenu": exercise_json,
-                    "created_at": now,
-                    "updated_at": now,
-                },
-            )
-            course_json = json.dumps(
-                course.model_dump() if hasattr(course, "model_dump") else course
-            )
-            await conn.execute(
-                STORE_BASIC_DOCUMENT,
-                {
-                    "id": course.id,
-                    "google_sub": user_id,
-                    "session_id": session_course,
-                    "chapter_id": chapter_id,
-                    "document_type": "course",
-                    "contenu": course_json,
-                    "created_at": now,
-                    "updated_at": now,
-                },
-            )
-            evaluation_json = json.dumps(
-                evaluation.model_dump()
-                if hasattr(evaluation, "model_dump")
-                else evaluation
-            )
-            await conn.execute(
-                STORE_BASIC_DOCUMENT,
-                {
-                    "id": evaluation.id,
-                    "google_sub": user_id,
-                    "session_id": session_evaluation,
-                    "chapter_id": chapter_id,
-                    "document_type": "eval",
-                    "contenu": evaluation_json,
-                    "created_at": now,
-                    "updated_at": now,
-                },
-            )
+            await self._store_assets(conn, assets)
+            await conn.execute(CREATE_CHAPTER, chapter_row)
+            # One executemany for the 3 documents instead of 3 round-trips
+            await conn.execute(STORE_BASIC_DOCUMENT, document_rows)
 
     async def store_deepcourse(
         self,
@@ -303,7 +438,9 @@ class DBManager:
         Store complete deep course.
 
         Creates the deep course and stores each chapter with its 3 documents
-        (exercise, course, evaluation).
+        (exercise, course, evaluation). Rows are built up front and sent as
+        one executemany per table, so a 16-chapter course costs 4 statements
+        instead of up to 65.
 
         Args:
             user_id: User ID (google_sub).
@@ -317,92 +454,39 @@ class DBManager:
                 }, ...]
         """
         deepcourse_id = content.id or str(uuid4())
+        now = datetime.now()
+
+        chapter_rows: List[Dict[str, Any]] = []
+        document_rows: List[Dict[str, Any]] = []
+        assets: List[Dict[str, Any]] = []
+
+        for idx, chapter in enumerate(content.chapters):
+            chapter_row, chapter_documents, chapter_assets = self._chapter_rows(
+                user_id,
+                deepcourse_id,
+                chapter.id_chapter or str(uuid4()),
+                chapter.title,
+                dict_session[idx],
+                chapter.exercice,
+                chapter.course,
+                chapter.evaluation,
+                now,
+                idx,
+            )
+            chapter_rows.append(chapter_row)
+            document_rows.extend(chapter_documents)
+            assets.extend(chapter_assets)
 
         async with self.engine.begin() as conn:
             await conn.execute(
                 CREATE_DEEPCOURSE,
                 {"id": deepcourse_id, "titre": content.title, "google_sub": user_id},
             )
-
-            for idx, chapter in enumerate(content.chapters):
-                chapter_id = chapter.id_chapter or str(uuid4())
-
-                await conn.execute(
-                    CREATE_CHAPTER,
-                    {
-                        "id": chapter_id,
-                        "deep_course_id": deepcourse_id,
-                        "titre": chapter.title,
-                        "is_complete": False,
-                    },
-                )
-
-                chapter_sessions = dict_session[idx]
-                session_exercise = chapter_sessions["session_id_exercise"]
-                session_course = chapter_sessions["session_id_course"]
-                session_evaluation = chapter_sessions["session_id_evaluation"]
-
-                now = datetime.now()
-
-                exercise_id = chapter.exercice.id or str(uuid4())
-                exercise_json = json.dumps(
-                    chapter.exercice.model_dump()
-                    if hasattr(chapter.exercice, "model_dump")
-                    else chapter.exercice
-                )
-                await conn.execute(
-                    STORE_BASIC_DOCUMENT,
-                    {
-                        "id": exercise_id,
-                        "google_sub": user_id,
-                        "session_id": session_exercise,
-                        "chapter_id": chapter_id,
-                        "document_type": "exercise",
-                        "contenu": exercise_json,
-                        "created_at": now,
-                        "updated_at": now,
-                    },
-                )
-
-                course_id = chapter.course.id or str(uuid4())
-                course_json = json.dumps(
-                    chapter.course.model_dump()
-                    if hasattr(chapter.course, "model_dump")
-                    else chapter.course
-                )
-                await conn.execute(
-                    STORE_BASIC_DOCUMENT,
-                    {
-                        "id": course_id,
-                        "google_sub": user_id,
-                        "session_id": session_course,
-                        "chapter_id": chapter_id,
-                        "document_type": "course",
-                        "contenu": course_json,
-                        "created_at": now,
-                        "updated_at": now,
-                    },
-                )
-
-                evaluation_id = chapter.evaluation.id or str(uuid4())
-                evaluation_json = json.dumps(
-                    chapter.evaluation.model_dump()
-                    if hasattr(chapter.evaluation, "model_dump")
-                    else chapter.evaluation
-                )
-                await conn.execute(
-                    STORE_BASIC_DOCUMENT,
-                    {
-                        "id": evaluation_id,
-                        "google_sub": user_id,
-                        "session_id": session_evaluation,
-                        "chapter_id": chapter_id,
-                        "document_type": "eval",
-                        "contenu": evaluation_json,
-                        "created_at": now,
-                        "updated_at": now,
-                    },
-                )
+            if chapter_rows:
+                await conn.execute(CREATE_CHAPTER, chapter_rows)
+            await self._store_assets(conn, assets)
+            if document_rows:
+                await conn.execute(STORE_BASIC_DOCUMENT, document_rows)
 
     async def delete_deepcourse(self, user_id: str, deepcourse_id: str):
         """Delete complete deep course for a given user with associated documents."""
@@ -429,6 +513,14 @@ class DBManager:
             row = result.fetchone()
             return dict(row._mapping) if row else None
 
+    async def fetch_chapter_contents(self, chapter_id: str) -> Dict[str, Any]:
+        """Fetch the contents of a chapter's documents, keyed by document type."""
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                FETCH_CHAPTER_DOCUMENT_CONTENTS, {"chapter_id": chapter_id}
+            )
+            return {row.document_type: row.contenu for row in result.fetchall()}
+
     async def rename_chapter(self, chapter_id: str, title: str):
         """Rename a chapter."""
         async with self.engine.begin() as conn:
@@ -530,6 +622,24 @@ class DBManager:
                 },
             )
 
+    async def correct_plain_questions(
+        self, doc_id: str, corrections: List[Dict[str, Any]]
+    ):
+        """
+        Update the correction status of several questions in one transaction.
+
+        Args:
+            doc_id: Exercise document id
+            corrections: Dicts with id_question, is_correct and answer
+        """
+        if not corrections:
+            return
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                CORRECT_PLAIN_QUESTION,
+                [{"doc_id": doc_id, **correction} for correction in corrections],
+            )
+
     async def mark_is_corrected_qcm(self, doc_id: str, question_id: str):
         """Mark a QCM question as corrected in a document."""
         async with self.engine.begin() as conn:
@@ -556,6 +666,16 @@ class DBManager:
             return dict(row._mapping) if row else None
 
 
+def get_db_manager() -> DBManager:
+    """
+    FastAPI dependency providing a DBManager bound to the shared pool.
+
+    Usage:
+        async def route(db_manager: DBManager = Depends(get_db_manager)): ...
+    """
+    return DBManager()
+
+
 if __name__ == "__main__":
     import asyncio
 
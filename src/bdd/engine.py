@@ -0,0 +1,100 @@
+"""Process-wide SQLAlchemy async engine.
+
+A single engine (and therefore a single connection pool) is shared by every
+DBManager instance, so routes and tools no longer pay a TCP + auth handshake
+per call. The engine is created lazily on first use or eagerly by the FastAPI
+lifespan, and disposed on shutdown.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.config import database_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Database URL configuration
+DATABASE_URL_SYNC = database_settings.dsn
+
+# Convert sync DSN to async DSN
+if "+asyncpg" not in DATABASE_URL_SYNC:
+    if "+psycopg2" in DATABASE_URL_SYNC:
+        DATABASE_URL_ASYNC = DATABASE_URL_SYNC.replace("+psycopg2", "+asyncpg")
+    else:
+        DATABASE_URL_ASYNC = DATABASE_URL_SYNC.replace(
+            "postgresql://", "postgresql+asyncpg://"
+        )
+else:
+    DATABASE_URL_ASYNC = DATABASE_URL_SYNC
+
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Return the shared async engine, creating it on first call.
+
+    Pool sizing comes from DatabaseSettings (DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING).
+
+    Returns:
+        Process-wide AsyncEngine
+    """
+    global _engine, _session_factory
+
+    if _engine is None:
+        _engine = create_async_engine(
+            DATABASE_URL_ASYNC,
+            echo=False,
+            future=True,
+            pool_size=database_settings.DB_POOL_SIZE,
+            max_overflow=database_settings.DB_MAX_OVERFLOW,
+            pool_timeout=database_settings.DB_POOL_TIMEOUT,
+            pool_recycle=database_settings.DB_POOL_RECYCLE,
+            pool_pre_ping=database_settings.DB_POOL_PRE_PING,
+        )
+        _session_factory = async_sessionmaker(
+            _engine, expire_on_commit=False, class_=AsyncSession
+        )
+        logger.info(
+            f"⚙️  Shared async engine initialized "
+            f"(pool_size={database_settings.DB_POOL_SIZE}, "
+            f"max_overflow={database_settings.DB_MAX_OVERFLOW})"
+        )
+
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Return the session factory bound to the shared engine.
+
+    Returns:
+        async_sessionmaker producing AsyncSession objects
+    """
+    get_engine()
+    assert _session_factory is not None
+    return _session_factory
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection and forget the shared engine."""
+    global _engine, _session_factory
+
+    if _engine is None:
+        return
+
+    await _engine.dispose()
+    _engine = None
+    _session_factory = None
+    logger.info("Shared async engine disposed.")
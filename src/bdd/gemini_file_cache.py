@@ -0,0 +1,327 @@
+"""Gemini Files API reference cache for chat artifacts.
+
+Chat turns used to re-attach every session artifact inline, re-sending a
+20 MB syllabus with each message. Artifacts are now uploaded once to the
+Gemini Files API; the returned URI and its expiry are stored per session in
+`gemini_file`, and later turns attach the file by URI. Expired (or soon to
+expire) references are re-uploaded from the artifact service.
+
+Files API URIs expire (about 48 h), so they never go into the session
+history: chat messages carry `artifact://<filename>` references, which
+`ArtifactReferencePlugin` resolves to a valid URI before each model call.
+Files API URIs persisted by earlier versions are replaced by a text note
+(the current turn re-attaches every session artifact anyway). Since every
+turn references every artifact, only the newest reference to each file is
+resolved; older ones become a short note, so a request carries each file
+once however long the conversation.
+
+The upload backend is chosen by GEMINI_FILES_BACKEND: "gemini" for the real
+Files API, "fake" for an in-process stand-in that needs no network. The fake
+backend only loads under pytest, so its URIs can never reach the model.
+"""
+
+import hashlib
+import io
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Protocol, Tuple
+from urllib.parse import quote, unquote
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.artifacts import BaseArtifactService
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from src.bdd.engine import get_engine
+from src.bdd.query import FETCH_GEMINI_FILE, UPSERT_GEMINI_FILE
+from src.config import gemini_settings
+
+logger = logging.getLogger(__name__)
+
+# Re-upload references that expire within this margin
+REFRESH_MARGIN = timedelta(minutes=10)
+
+# Session artifact reference kept in the chat history
+ARTIFACT_SCHEME = "artifact://"
+
+# URIs that expire or only exist in tests: never replayed from history
+EPHEMERAL_URI_PREFIXES = ("https://generativelanguage.googleapis.com/", "fake://")
+
+EXPIRED_FILE_NOTE = "[Fichier joint à un message précédent, plus disponible ici]"
+
+REPEATED_FILE_NOTE = "[Fichier joint à nouveau plus loin dans la conversation]"
+
+
+def artifact_reference(filename: str) -> types.Part:
+    """A `file_data` part naming a session artifact, resolved per model call."""
+    return types.Part(
+        file_data=types.FileData(file_uri=f"{ARTIFACT_SCHEME}{quote(filename)}")
+    )
+
+
+@dataclass
+class UploadedFile:
+    """A file reference returned by an upload backend."""
+
+    uri: str
+    mime_type: str
+    expires_at: datetime
+
+
+class FileUploadBackend(Protocol):
+    """Uploads bytes and returns a URI the model can read."""
+
+    async def upload(self, data: bytes, mime_type: str, display_name: str) -> UploadedFile: ...
+
+
+class GeminiFilesBackend:
+    """Uploads through the Gemini Files API (files are kept about 48 h)."""
+
+    async def upload(self, data: bytes, mime_type: str, display_name: str) -> UploadedFile:
+        file = await gemini_settings.CLIENT.aio.files.upload(
+            file=io.BytesIO(data),
+            config=types.UploadFileConfig(mime_type=mime_type, display_name=display_name),
+        )
+        expires_at = file.expiration_time or datetime.now(timezone.utc) + timedelta(
+            hours=gemini_settings.GEMINI_FILES_TTL_HOURS
+        )
+        return UploadedFile(
+            uri=file.uri, mime_type=file.mime_type or mime_type, expires_at=expires_at
+        )
+
+
+class FakeFilesBackend:
+    """Offline stand-in: returns deterministic `fake://` URIs and counts uploads.
+
+    Raises:
+        RuntimeError: If created outside pytest
+    """
+
+    def __init__(self, ttl: timedelta):
+        if "pytest" not in sys.modules:
+            raise RuntimeError("FakeFilesBackend is only available in tests")
+        self.ttl = ttl
+        self.uploads: Dict[str, bytes] = {}
+
+    async def upload(self, data: bytes, mime_type: str, display_name: str) -> UploadedFile:
+        digest = hashlib.sha256(data).hexdigest()
+        self.uploads[digest] = data
+        return UploadedFile(
+            uri=f"fake://files/{digest}",
+            mime_type=mime_type,
+            expires_at=datetime.now(timezone.utc) + self.ttl,
+        )
+
+
+class GeminiFileCache:
+    """Per-session cache of Files API references, persisted in Postgres."""
+
+    def __init__(self, backend: FileUploadBackend):
+        self.backend = backend
+
+    async def _load(self, key: Dict[str, str]):
+        async with get_engine().connect() as conn:
+            result = await conn.execute(FETCH_GEMINI_FILE, key)
+            return result.fetchone()
+
+    async def _store(self, key: Dict[str, str], uploaded: UploadedFile) -> None:
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                UPSERT_GEMINI_FILE,
+                {
+                    **key,
+                    "uri": uploaded.uri,
+                    "mime_type": uploaded.mime_type,
+                    "expires_at": uploaded.expires_at,
+                },
+            )
+
+    async def upload(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact: types.Part,
+    ) -> types.Part:
+        """
+        Upload an artifact and remember its reference for the session.
+
+        Returns:
+            A `file_data` part pointing to the uploaded file
+        """
+        uploaded = await self.backend.upload(
+            artifact.inline_data.data,
+            artifact.inline_data.mime_type or "application/octet-stream",
+            filename,
+        )
+        await self._store(
+            {
+                "app_name": app_name,
+                "user_id": user_id,
+                "session_id": session_id,
+                "filename": filename,
+            },
+            uploaded,
+        )
+        logger.info(f"📎 Uploaded {filename} to files backend: {uploaded.uri}")
+        return types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type)
+
+    async def get_part(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact_service: BaseArtifactService,
+    ) -> Optional[types.Part]:
+        """
+        Return a URI part for a session artifact, re-uploading it if the reference expired.
+
+        Returns:
+            A `file_data` part, or None if the artifact no longer exists
+        """
+        key = {
+            "app_name": app_name,
+            "user_id": user_id,
+            "session_id": session_id,
+            "filename": filename,
+        }
+        row = await self._load(key)
+
+        if row and row.expires_at > datetime.now(timezone.utc) + REFRESH_MARGIN:
+            return types.Part.from_uri(file_uri=row.uri, mime_type=row.mime_type)
+
+        artifact = await artifact_service.load_artifact(
+            app_name=app_name, user_id=user_id, session_id=session_id, filename=filename
+        )
+        if artifact is None:
+            return None
+
+        logger.info(f"📎 File reference for {filename} missing or expired, re-uploading")
+        return await self.upload(**key, artifact=artifact)
+
+    async def resolve_contents(
+        self,
+        contents: List[types.Content],
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        artifact_service: BaseArtifactService,
+    ) -> List[types.Content]:
+        """
+        Resolve the file references of a model request.
+
+        The newest `artifact://` reference to each file becomes a valid Files
+        API part (or the inline artifact if the upload fails), older ones a
+        text note; Files API URIs stored in the history by earlier versions
+        become a text note too. Contents are copied, not mutated,
+        so the session history keeps its references.
+
+        Returns:
+            Contents ready to be sent to the model
+        """
+        resolved: Dict[str, Optional[types.Part]] = {}
+
+        async def resolve(filename: str) -> Optional[types.Part]:
+            if filename not in resolved:
+                key = {
+                    "app_name": app_name,
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "filename": filename,
+                }
+                try:
+                    part = await self.get_part(**key, artifact_service=artifact_service)
+                except Exception as e:
+                    logger.warning(f"File reference unavailable for {filename}: {e}")
+                    part = await artifact_service.load_artifact(**key)
+                resolved[filename] = part
+            return resolved[filename]
+
+        def reference(part: types.Part) -> Optional[str]:
+            uri = part.file_data.file_uri if part.file_data else None
+            if uri and uri.startswith(ARTIFACT_SCHEME):
+                return unquote(uri[len(ARTIFACT_SCHEME):])
+            return None
+
+        newest: Dict[str, Tuple[int, int]] = {}
+        for i, content in enumerate(contents):
+            for j, part in enumerate(content.parts or []):
+                filename = reference(part)
+                if filename is not None:
+                    newest[filename] = (i, j)
+
+        output = []
+        for i, content in enumerate(contents):
+            if not any(part.file_data for part in content.parts or []):
+                output.append(content)
+                continue
+
+            parts = []
+            for j, part in enumerate(content.parts):
+                uri = part.file_data.file_uri if part.file_data else None
+                filename = reference(part)
+                if filename is not None and newest[filename] != (i, j):
+                    parts.append(types.Part(text=REPEATED_FILE_NOTE))
+                elif filename is not None:
+                    artifact = await resolve(filename)
+                    parts.append(artifact or types.Part(text=EXPIRED_FILE_NOTE))
+                elif uri and uri.startswith(EPHEMERAL_URI_PREFIXES):
+                    parts.append(types.Part(text=EXPIRED_FILE_NOTE))
+                else:
+                    parts.append(part)
+            output.append(content.model_copy(update={"parts": parts}))
+        return output
+
+
+class ArtifactReferencePlugin(BasePlugin):
+    """Resolves `artifact://` references right before each model call."""
+
+    def __init__(self, file_cache: GeminiFileCache):
+        super().__init__(name="artifact_references")
+        self.file_cache = file_cache
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        invocation = callback_context._invocation_context
+        llm_request.contents = await self.file_cache.resolve_contents(
+            llm_request.contents,
+            app_name=invocation.session.app_name,
+            user_id=invocation.session.user_id,
+            session_id=invocation.session.id,
+            artifact_service=invocation.artifact_service,
+        )
+        return None
+
+
+_file_cache: Optional[GeminiFileCache] = None
+
+
+def get_gemini_file_cache() -> GeminiFileCache:
+    """
+    Return the shared GeminiFileCache, creating it on first call.
+
+    Returns:
+        Process-wide cache using the backend selected by GEMINI_FILES_BACKEND
+    """
+    global _file_cache
+
+    if _file_cache is None:
+        ttl = timedelta(hours=gemini_settings.GEMINI_FILES_TTL_HOURS)
+        backend: FileUploadBackend = (
+            FakeFilesBackend(ttl)
+            if gemini_settings.GEMINI_FILES_BACKEND == "fake"
+            else GeminiFilesBackend()
+        )
+        _file_cache = GeminiFileCache(backend)
+        logger.info(f"⚙️  Gemini file cache initialized ({type(backend).__name__})")
+
+    return _file_cache
@@ -0,0 +1,262 @@
+"""Postgres-backed queue of background generation jobs.
+
+A job (`generation_job`) is split into steps (`generation_job_step`), each a
+unit that can be checkpointed and retried on its own: for a deep course, one
+step per chapter artifact (exercise, course, evaluation) and one step per
+chapter insert. Workers claim queued jobs with `FOR UPDATE SKIP LOCKED`,
+refresh a heartbeat while they run, and a job whose heartbeat is older than
+JOB_STALE_SECONDS (crashed or redeployed worker) is claimed again and resumes
+from its pending steps, at most JOB_MAX_ATTEMPTS times: a job that keeps
+killing its worker (out of memory, renderer crash) is then marked failed.
+
+Job status: queued → running → completed | partial (some steps failed) |
+failed (the job itself raised). Step status: pending → done | failed.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from src.bdd.assets import extract_course_assets
+from src.bdd.engine import get_engine
+from src.bdd.query import (
+    CLAIM_JOB,
+    ENQUEUE_JOB,
+    FAIL_EXHAUSTED_JOBS,
+    FETCH_JOB_STATUS,
+    FETCH_JOB_STEPS,
+    FINISH_JOB,
+    HEARTBEAT_JOB,
+    INSERT_JOB_STEPS,
+    REQUEUE_JOB,
+    RESET_FAILED_JOB_STEPS,
+    STORE_ASSET,
+    UPDATE_JOB_STEP,
+)
+from src.models import CourseOutput
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_JOB_STATUSES = ("completed", "partial", "failed")
+
+
+@dataclass
+class Job:
+    """A claimed job."""
+
+    id: str
+    kind: str
+    google_sub: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class JobStep:
+    """One checkpointed unit of a job."""
+
+    step_key: str
+    chapter_index: int
+    kind: str
+    document_id: str
+    status: str = "pending"
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class JobQueue:
+    """Enqueue, claim and checkpoint generation jobs."""
+
+    async def enqueue(
+        self,
+        job_id: str,
+        kind: str,
+        google_sub: str,
+        payload: Dict[str, Any],
+        steps: Sequence[JobStep],
+        statements: Sequence[Tuple[Any, Dict[str, Any]]] = (),
+    ) -> None:
+        """
+        Insert a queued job and its steps.
+
+        Args:
+            job_id: Job id (also the id of the document the job produces)
+            kind: Job kind, used by workers to pick a handler
+            google_sub: Owner of the job
+            payload: JSON input of the handler
+            steps: Steps to run, all pending
+            statements: Extra (query, params) run in the same transaction
+        """
+        async with get_engine().begin() as conn:
+            for query, params in statements:
+                await conn.execute(query, params)
+            await conn.execute(
+                ENQUEUE_JOB,
+                {
+                    "id": job_id,
+                    "kind": kind,
+                    "google_sub": google_sub,
+                    "payload": json.dumps(payload),
+                },
+            )
+            if steps:
+                await conn.execute(
+                    INSERT_JOB_STEPS,
+                    [
+                        {
+                            "job_id": job_id,
+                            "step_key": step.step_key,
+                            "chapter_index": step.chapter_index,
+                            "kind": step.kind,
+                            "document_id": step.document_id,
+                        }
+                        for step in steps
+                    ],
+                )
+
+    async def claim(
+        self, worker_id: str, kinds: List[str], stale_seconds: int, max_attempts: int
+    ) -> Optional[Job]:
+        """
+        Claim the oldest queued (or abandoned) job of the given kinds.
+
+        Abandoned jobs already claimed `max_attempts` times are marked failed
+        instead of being claimed again.
+        """
+        params = {
+            "kinds": kinds,
+            "stale_seconds": stale_seconds,
+            "max_attempts": max_attempts,
+        }
+        async with get_engine().begin() as conn:
+            failed = await conn.execute(FAIL_EXHAUSTED_JOBS, params)
+            if failed.rowcount:
+                logger.error(
+                    f"[JOBS] {failed.rowcount} job(s) failed after {max_attempts} lost runs"
+                )
+            result = await conn.execute(CLAIM_JOB, {**params, "worker_id": worker_id})
+            row = result.fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row.id,
+            kind=row.kind,
+            google_sub=row.google_sub,
+            payload=row.payload,
+            attempts=row.attempts,
+        )
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> None:
+        """Tell other workers the job is still being processed."""
+        async with get_engine().begin() as conn:
+            await conn.execute(HEARTBEAT_JOB, {"id": job_id, "worker_id": worker_id})
+
+    async def finish(
+        self, job_id: str, worker_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        """Release a job with its final status ("queued" hands it back)."""
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                FINISH_JOB,
+                {"id": job_id, "worker_id": worker_id, "status": status, "error": error},
+            )
+
+    async def fetch_steps(self, job_id: str) -> List[JobStep]:
+        """Steps of a job, ordered by chapter."""
+        async with get_engine().connect() as conn:
+            result = await conn.execute(FETCH_JOB_STEPS, {"job_id": job_id})
+            return [JobStep(**row._mapping) for row in result.fetchall()]
+
+    async def checkpoint(
+        self,
+        job_id: str,
+        step: JobStep,
+        result: Optional[BaseModel] = None,
+    ) -> None:
+        """
+        Persist a step's status, attempts and result.
+
+        Course diagrams are moved to the asset table first, so checkpoints
+        only hold `img_hash` references.
+        """
+        assets: List[Dict[str, Any]] = []
+        if isinstance(result, CourseOutput):
+            result, assets = extract_course_assets(result)
+        if result is not None:
+            step.result = result.model_dump()
+
+        async with get_engine().begin() as conn:
+            if assets:
+                await conn.execute(
+                    STORE_ASSET,
+                    [{**asset, "size": len(asset["data"])} for asset in assets],
+                )
+            await conn.execute(
+                UPDATE_JOB_STEP,
+                {
+                    "job_id": job_id,
+                    "step_key": step.step_key,
+                    "status": step.status,
+                    "attempts": step.attempts,
+                    "result": json.dumps(step.result) if step.result is not None else None,
+                    "error": step.error,
+                },
+            )
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Job status with step counts and progress.
+
+        Returns:
+            Dict with id, kind, status, error, attempts, created_at, updated_at,
+            total_steps, done_steps, failed_steps and progress (0-100), or None
+        """
+        async with get_engine().connect() as conn:
+            result = await conn.execute(FETCH_JOB_STATUS, {"id": job_id})
+            row = result.fetchone()
+        if row is None:
+            return None
+        status = dict(row._mapping)
+        finished = status["done_steps"] + status["failed_steps"]
+        status["progress"] = (
+            round(100 * finished / status["total_steps"], 1)
+            if status["total_steps"]
+            else 0.0
+        )
+        return status
+
+    async def retry_failed(self, job_id: str) -> bool:
+        """
+        Reset the failed steps of a finished job and queue it again.
+
+        Returns:
+            False if the job does not exist or is still queued/running
+        """
+        async with get_engine().begin() as conn:
+            result = await conn.execute(REQUEUE_JOB, {"id": job_id})
+            if not result.rowcount:
+                return False
+            await conn.execute(RESET_FAILED_JOB_STEPS, {"job_id": job_id})
+        return True
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Return the shared JobQueue, creating it on first call.
+
+    Returns:
+        Process-wide job queue
+    """
+    global _job_queue
+
+    if _job_queue is None:
+        _job_queue = JobQueue()
+
+    return _job_queue
@@ -0,0 +1,391 @@
+"""
+Versioned schema migrations for the business tables.
+
+Each migration is a named list of statements applied once, in order, inside
+its own transaction, and recorded in `public.schema_migrations`. Statements
+must be idempotent so they can also run on databases created from the
+current `schema_sql` models (see DBManager.create_db).
+
+Run manually with:
+    PYTHONPATH=. uv run python -m src.bdd.migrations
+"""
+
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+MIGRATIONS: List[Tuple[str, List[TextClause]]] = [
+    (
+        # document.contenu was JSON: every query re-parsed the text blob via
+        # contenu::jsonb. JSONB is stored pre-parsed and can be indexed.
+        "0001_document_contenu_jsonb",
+        [
+            text(
+                """
+ALTER TABLE public.document
+    ALTER COLUMN contenu TYPE JSONB USING contenu::jsonb
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_document_contenu_title
+    ON public.document ((contenu ->> 'title'))
+"""
+            ),
+        ],
+    ),
+    (
+        # Secondary indexes for the sidebar, copilot and chapter lookups,
+        # which were all sequential scans over the document table.
+        # Note: the unique index fails if duplicate session_ids already exist.
+        "0002_secondary_btree_indexes",
+        [
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_document_chat_listing
+    ON public.document (google_sub, updated_at DESC)
+    WHERE chapter_id IS NULL
+"""
+            ),
+            text(
+                """
+CREATE UNIQUE INDEX IF NOT EXISTS ux_document_session_id
+    ON public.document (session_id)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_document_chapter_id
+    ON public.document (chapter_id)
+    WHERE chapter_id IS NOT NULL
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_chapter_deep_course_id
+    ON public.chapter (deep_course_id)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_deepcourse_google_sub
+    ON public.deepcourse (google_sub)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_users_email
+    ON public.users (email)
+"""
+            ),
+        ],
+    ),
+    (
+        # Diagram PNGs move out of document.contenu into a content-addressed
+        # bytea table; existing courses are rewritten to reference img_hash.
+        "0003_asset_table",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.asset (
+    hash TEXT PRIMARY KEY,
+    mime_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+            ),
+            text(
+                """
+INSERT INTO public.asset (hash, mime_type, size, data)
+SELECT DISTINCT ON (img.hash) img.hash, 'image/png', length(img.data), img.data
+FROM (
+    SELECT decode(p ->> 'img_base64', 'base64') AS data,
+           encode(sha256(decode(p ->> 'img_base64', 'base64')), 'hex') AS hash
+    FROM public.document d
+    CROSS JOIN LATERAL jsonb_array_elements(d.contenu -> 'parts') AS p
+    WHERE d.document_type = 'course'
+      AND p ->> 'img_base64' IS NOT NULL
+) AS img
+ON CONFLICT (hash) DO NOTHING
+"""
+            ),
+            text(
+                """
+UPDATE public.document d
+SET contenu = jsonb_set(
+    d.contenu,
+    '{parts}',
+    (
+        SELECT jsonb_agg(
+            CASE
+                WHEN p ->> 'img_base64' IS NOT NULL THEN
+                    p || jsonb_build_object(
+                        'img_base64', NULL,
+                        'img_hash', encode(sha256(decode(p ->> 'img_base64', 'base64')), 'hex')
+                    )
+                ELSE p
+            END
+            ORDER BY ord
+        )
+        FROM jsonb_array_elements(d.contenu -> 'parts') WITH ORDINALITY AS x(p, ord)
+    )
+)
+WHERE d.document_type = 'course'
+  AND EXISTS (
+      SELECT 1
+      FROM jsonb_array_elements(d.contenu -> 'parts') AS p
+      WHERE p ->> 'img_base64' IS NOT NULL
+  )
+"""
+            ),
+        ],
+    ),
+    (
+        # Chat uploads lived in a per-worker InMemoryArtifactService: RAM grew
+        # forever and other instances could not see them. They are now
+        # versioned rows pointing to content-addressed blobs, with a TTL.
+        "0004_artifact_tables",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.artifact_blob (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+            ),
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.artifact (
+    id SERIAL PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    hash TEXT NOT NULL REFERENCES public.artifact_blob (hash),
+    mime_type TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    UNIQUE (app_name, user_id, session_id, filename, version)
+)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_artifact_user_expires
+ON public.artifact (user_id, expires_at)
+"""
+            ),
+        ],
+    ),
+    (
+        # Chat turns re-sent every artifact inline; files are now uploaded once
+        # to the Gemini Files API and referenced by URI until they expire.
+        "0005_gemini_file_table",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.gemini_file (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    mime_type TEXT NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, filename)
+)
+"""
+            ),
+        ],
+    ),
+    (
+        # Persistent tier of the diagram render cache: identical sources are
+        # served from the asset table instead of being re-rendered by Kroki.
+        "0006_diagram_render_cache",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.diagram_render (
+    cache_key TEXT PRIMARY KEY,
+    diagram_type TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    asset_hash TEXT NOT NULL REFERENCES public.asset (hash),
+    created_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+            ),
+        ],
+    ),
+    (
+        # Persistent tier of the LLM response cache: identical generation
+        # calls (same model, prompt and schema) are answered without Gemini.
+        "0007_llm_response_cache",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.llm_response (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL
+)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_llm_response_expires
+ON public.llm_response (expires_at)
+"""
+            ),
+        ],
+    ),
+    (
+        # Deep courses were generated inside the /api/chat request and thrown
+        # away on the first failure. They now run as queued jobs whose steps
+        # (one per chapter artifact, one per chapter insert) are checkpointed.
+        "0008_generation_jobs",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.generation_job (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    google_sub TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    locked_by TEXT,
+    heartbeat_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_generation_job_claim
+ON public.generation_job (status, created_at)
+"""
+            ),
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.generation_job_step (
+    job_id TEXT NOT NULL REFERENCES public.generation_job (id) ON DELETE CASCADE,
+    step_key TEXT NOT NULL,
+    chapter_index INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result JSONB,
+    error TEXT,
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (job_id, step_key)
+)
+"""
+            ),
+        ],
+    ),
+    (
+        # Rendered course PDFs, reused while the document content is unchanged
+        "0009_document_pdf",
+        [
+            text(
+                """
+CREATE TABLE IF NOT EXISTS public.document_pdf (
+    document_id TEXT PRIMARY KEY REFERENCES public.document (id) ON DELETE CASCADE,
+    version TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+            ),
+        ],
+    ),
+    (
+        # Chapters had no order column: listings came back in heap order,
+        # which changes on any UPDATE. Existing chapters are numbered by the
+        # creation time of their documents, then by physical order.
+        "0010_chapter_position",
+        [
+            text(
+                """
+ALTER TABLE public.chapter ADD COLUMN IF NOT EXISTS position INTEGER
+"""
+            ),
+            text(
+                """
+UPDATE public.chapter c
+SET position = ordered.position
+FROM (
+    SELECT ch.id,
+           row_number() OVER (
+               PARTITION BY ch.deep_course_id
+               ORDER BY (
+                   SELECT min(d.created_at)
+                   FROM public.document d
+                   WHERE d.chapter_id = ch.id
+               ) NULLS LAST, ch.ctid
+           ) - 1 AS position
+    FROM public.chapter ch
+) AS ordered
+WHERE c.id = ordered.id
+  AND c.position IS NULL
+"""
+            ),
+            text(
+                """
+ALTER TABLE public.chapter ALTER COLUMN position SET NOT NULL
+"""
+            ),
+            text(
+                """
+CREATE INDEX IF NOT EXISTS ix_chapter_deep_course_position
+ON public.chapter (deep_course_id, position)
+"""
+            ),
+            text(
+                """
+DROP INDEX IF EXISTS public.ix_chapter_deep_course_id
+"""
+            ),
+        ],
+    ),
+    (
+        # The jsonb_path_ops GIN index on document.contenu served no query
+        # (none uses @> or jsonpath) but was rewritten on every exercise
+        # append and diagram patch. 0001 no longer creates it.
+        "0011_drop_document_contenu_gin",
+        [
+            text(
+                """
+DROP INDEX IF EXISTS public.ix_document_contenu_gin
+"""
+            ),
+        ],
+    ),
+]
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    from src.bdd import DBManager, dispose_engine
+
+    async def main():
+        db_manager = DBManager()
+        applied = await db_manager.apply_migrations()
+        print("📦 Applied migrations:", applied or "none (up to date)")
+        await dispose_engine()
+
+    asyncio.run(main())
@@ -54,7 +54,7 @@ SELECT
     session_id AS session_id,
     document_type AS document_type,
     COALESCE(
-        (contenu::jsonb->>'title'),
+        (contenu->>'title'),
         CASE
             WHEN document_type = 'exercise' THEN 'Exercice'
             WHEN document_type = 'course' THEN 'Cours'
@@ -70,6 +70,9 @@ ORDER BY updated_at DESC
 )
 
 
+# Document created_at / updated_at always come from the application clock
+# (DBManager passes datetime.now()): fetchexercise and fetchcourse compare
+# updated_at against it to detect abandoned generations.
 STORE_BASIC_DOCUMENT = text(
     """
 INSERT INTO public.document (id, google_sub, session_id, chapter_id, document_type, contenu, created_at, updated_at)
@@ -78,6 +81,51 @@ VALUES (:id, :google_sub, :session_id, :chapter_id, :document_type, :contenu, :c
 )
 
 
+APPEND_DOCUMENT_EXERCISE = text(
+    """
+UPDATE public.document
+SET contenu = jsonb_set(
+    contenu,
+    '{exercises}',
+    COALESCE(contenu -> 'exercises', '[]'::jsonb) || jsonb_build_array(CAST(:exercise AS jsonb))
+),
+    updated_at = :updated_at
+WHERE id = :id
+"""
+)
+
+SET_DOCUMENT_STATUS = text(
+    """
+UPDATE public.document
+SET contenu = contenu || jsonb_build_object('status', CAST(:status AS text)),
+    updated_at = :updated_at
+WHERE id = :id
+"""
+)
+
+PATCH_DOCUMENT_PART = text(
+    """
+UPDATE public.document d
+SET contenu = jsonb_set(
+    d.contenu,
+    '{parts}',
+    (
+        SELECT jsonb_agg(
+            CASE
+                WHEN p ->> 'id_part' = :id_part THEN p || CAST(:patch AS jsonb)
+                ELSE p
+            END
+            ORDER BY ord
+        )
+        FROM jsonb_array_elements(d.contenu -> 'parts') WITH ORDINALITY AS t(p, ord)
+    )
+),
+    updated_at = :updated_at
+WHERE d.id = :id
+"""
+)
+
+
 DELETE_DOCUMENTS = text(
     """
 DELETE FROM document
@@ -167,6 +215,14 @@ GROUP BY "chapter_id"
 """
 )
 
+FETCH_CHAPTER_DOCUMENT_CONTENTS = text(
+    """
+SELECT "document_type", "contenu"
+FROM "public"."document"
+WHERE "chapter_id" = :chapter_id
+"""
+)
+
 CHANGE_SETTINGS = text(
     """
 UPDATE users
@@ -236,7 +292,7 @@ rebuilt AS (
                              ELSE q
                            END
                          )
-                  FROM jsonb_array_elements((e->'questions')::jsonb) AS q
+                  FROM jsonb_array_elements(e->'questions') AS q
                 )
               )
         ELSE
@@ -244,11 +300,11 @@ rebuilt AS (
       END
     ) AS new_exercises
   FROM target t
-  CROSS JOIN LATERAL jsonb_array_elements((t."contenu"::jsonb -> 'exercises')) AS e
+  CROSS JOIN LATERAL jsonb_array_elements(t."contenu" -> 'exercises') AS e
   GROUP BY t."id"
 )
 UPDATE "document" d
-SET "contenu" = ((d."contenu")::jsonb || jsonb_build_object('exercises', r.new_exercises))::json
+SET "contenu" = d."contenu" || jsonb_build_object('exercises', r.new_exercises)
 FROM rebuilt r
 WHERE d."id" = r."id";
                      
@@ -280,7 +336,7 @@ rebuilt AS (
                              ELSE q
                            END
                          )
-                  FROM jsonb_array_elements((e->'questions')::jsonb) AS q
+                  FROM jsonb_array_elements(e->'questions') AS q
                 )
               )
         ELSE
@@ -288,11 +344,11 @@ rebuilt AS (
       END
     ) AS new_exercises
   FROM target t
-  CROSS JOIN LATERAL jsonb_array_elements((t."contenu"::jsonb -> 'exercises')) AS e
+  CROSS JOIN LATERAL jsonb_array_elements(t."contenu" -> 'exercises') AS e
   GROUP BY t."id"
 )
 UPDATE "document" d
-SET "contenu" = ((d."contenu")::jsonb || jsonb_build_object('exercises', r.new_exercises))::json
+SET "contenu" = d."contenu" || jsonb_build_object('exercises', r.new_exercises)
 FROM rebuilt r
 WHERE d."id" = r."id";                  
 """
@@ -308,8 +364,19 @@ VALUES (:id, :titre, :google_sub)
 
 CREATE_CHAPTER = text(
     """ 
-INSERT INTO public.chapter (id, deep_course_id, titre, is_complete)
-VALUES (:id, :deep_course_id, :titre, :is_complete)
+INSERT INTO public.chapter (id, deep_course_id, titre, is_complete, position)
+VALUES (
+    :id, :deep_course_id, :titre, :is_complete,
+    -- No position given: append after the last chapter
+    COALESCE(
+        :position,
+        (
+            SELECT COALESCE(MAX(position) + 1, 0)
+            FROM public.chapter
+            WHERE deep_course_id = :deep_course_id
+        )
+    )
+)
 """
 )
 
@@ -318,14 +385,15 @@ FETCH_ALL_CHAPTERS = text(
 SELECT id as chapter_id, titre as title, is_complete
 FROM public.chapter
 WHERE deep_course_id = :deep_course_id
+ORDER BY position
 """
 )
 
 UPDATE_DOCUMENT_CONTENT = text(
     """
 UPDATE public.document
-SET contenu = :contenu
-WHERE session_id = :session_id
+SET contenu = :contenu, updated_at = :updated_at
+WHERE id = :id
 """
 )
 
@@ -342,12 +410,12 @@ FETCH_DOCUMENT_CONTENT_BY_ID = text(
 SELECT
     d.id,
     d.document_type,
-    (d.contenu::jsonb) ->> 'title' AS title,
+    d.contenu ->> 'title' AS title,
 
     CASE
         WHEN d.document_type = 'exercise' THEN
             jsonb_build_object(
-                'title', (d.contenu::jsonb) ->> 'title',
+                'title', d.contenu ->> 'title',
                 'exercises',
                 (
                     SELECT jsonb_agg(
@@ -367,13 +435,13 @@ SELECT
                                 )
                         )
                     )
-                    FROM jsonb_array_elements((d.contenu::jsonb) -> 'exercises') e
+                    FROM jsonb_array_elements(d.contenu -> 'exercises') e
                 )
             )
 
         WHEN d.document_type = 'course' THEN
             jsonb_build_object(
-                'title', (d.contenu::jsonb) ->> 'title',
+                'title', d.contenu ->> 'title',
                 'parts',
                 (
                     SELECT jsonb_agg(
@@ -384,7 +452,7 @@ SELECT
                             'schema_description', p ->> 'schema_description'
                         )
                     )
-                    FROM jsonb_array_elements((d.contenu::jsonb) -> 'parts') p
+                    FROM jsonb_array_elements(d.contenu -> 'parts') p
                 )
             )
     END AS parsed_content
@@ -402,6 +470,7 @@ FROM chapter c
 LEFT JOIN deepcourse d 
 ON c.deep_course_id = d.id
 WHERE d.id = :deepcourse_id
+ORDER BY c.position
        """
 )
 FETCH_ALL_DEEPCOURSES = text(
@@ -421,3 +490,388 @@ GROUP BY "d"."id", "d"."titre"
 ORDER BY "d"."id";
 """
 )
+
+CREATE_SCHEMA_MIGRATIONS_TABLE = text(
+    """
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+    name TEXT PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+)
+
+FETCH_APPLIED_MIGRATIONS = text(
+    """
+SELECT name
+FROM public.schema_migrations
+"""
+)
+
+RECORD_MIGRATION = text(
+    """
+INSERT INTO public.schema_migrations (name)
+VALUES (:name)
+ON CONFLICT (name) DO NOTHING
+"""
+)
+
+STORE_ASSET = text(
+    """
+INSERT INTO public.asset (hash, mime_type, size, data)
+VALUES (:hash, :mime_type, :size, :data)
+ON CONFLICT (hash) DO NOTHING
+"""
+)
+
+FETCH_ASSET = text(
+    """
+SELECT hash, mime_type, data
+FROM public.asset
+WHERE hash = :hash
+"""
+)
+
+FETCH_ASSETS = text(
+    """
+SELECT hash, mime_type, data
+FROM public.asset
+WHERE hash = ANY(:hashes)
+"""
+)
+
+STORE_ARTIFACT_BLOB = text(
+    """
+INSERT INTO public.artifact_blob (hash, size, data)
+VALUES (:hash, :size, :data)
+ON CONFLICT (hash) DO NOTHING
+"""
+)
+
+FETCH_ARTIFACT_BLOB = text(
+    """
+SELECT data
+FROM public.artifact_blob
+WHERE hash = :hash
+"""
+)
+
+# Serializes a user's artifact saves until commit: the quota check and the
+# MAX(version) + 1 below would otherwise race between concurrent uploads.
+LOCK_ARTIFACT_USER = text(
+    """
+SELECT pg_advisory_xact_lock(hashtext('artifact:' || :user_id))
+"""
+)
+
+FETCH_ARTIFACT_USER_USAGE = text(
+    """
+SELECT COALESCE(SUM(b.size), 0) AS used
+FROM (
+    SELECT DISTINCT hash
+    FROM public.artifact
+    WHERE user_id = :user_id
+      AND expires_at > now()
+) AS a
+JOIN public.artifact_blob b ON b.hash = a.hash
+"""
+)
+
+STORE_ARTIFACT_VERSION = text(
+    """
+INSERT INTO public.artifact (app_name, user_id, session_id, filename, version, hash, mime_type, expires_at)
+SELECT :app_name, :user_id, :session_id, :filename, COALESCE(MAX(version) + 1, 0), :hash, :mime_type, :expires_at
+FROM public.artifact
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND filename = :filename
+RETURNING version
+"""
+)
+
+FETCH_ARTIFACT = text(
+    """
+SELECT hash, mime_type, version
+FROM public.artifact
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND filename = :filename
+  AND (CAST(:version AS INTEGER) IS NULL OR version = :version)
+  AND expires_at > now()
+ORDER BY version DESC
+LIMIT 1
+"""
+)
+
+LIST_ARTIFACT_KEYS = text(
+    """
+SELECT DISTINCT filename
+FROM public.artifact
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND expires_at > now()
+ORDER BY filename
+"""
+)
+
+LIST_ARTIFACT_VERSIONS = text(
+    """
+SELECT version
+FROM public.artifact
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND filename = :filename
+  AND expires_at > now()
+ORDER BY version
+"""
+)
+
+DELETE_ARTIFACT = text(
+    """
+DELETE FROM public.artifact
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND filename = :filename
+"""
+)
+
+PURGE_EXPIRED_ARTIFACTS = text(
+    """
+DELETE FROM public.artifact
+WHERE expires_at <= now()
+"""
+)
+
+PURGE_ORPHAN_ARTIFACT_BLOBS = text(
+    """
+DELETE FROM public.artifact_blob b
+WHERE NOT EXISTS (
+    SELECT 1 FROM public.artifact a WHERE a.hash = b.hash
+)
+"""
+)
+
+FETCH_GEMINI_FILE = text(
+    """
+SELECT uri, mime_type, expires_at
+FROM public.gemini_file
+WHERE app_name = :app_name
+  AND user_id = :user_id
+  AND session_id = :session_id
+  AND filename = :filename
+"""
+)
+
+UPSERT_GEMINI_FILE = text(
+    """
+INSERT INTO public.gemini_file (app_name, user_id, session_id, filename, uri, mime_type, expires_at)
+VALUES (:app_name, :user_id, :session_id, :filename, :uri, :mime_type, :expires_at)
+ON CONFLICT (app_name, user_id, session_id, filename)
+DO UPDATE SET uri = EXCLUDED.uri, mime_type = EXCLUDED.mime_type, expires_at = EXCLUDED.expires_at
+"""
+)
+
+FETCH_DIAGRAM_RENDER = text(
+    """
+SELECT a.hash, a.data
+FROM public.diagram_render r
+JOIN public.asset a ON a.hash = r.asset_hash
+WHERE r.cache_key = :cache_key
+"""
+)
+
+STORE_DIAGRAM_RENDER = text(
+    """
+INSERT INTO public.diagram_render (cache_key, diagram_type, output_format, asset_hash)
+VALUES (:cache_key, :diagram_type, :output_format, :asset_hash)
+ON CONFLICT (cache_key) DO NOTHING
+"""
+)
+
+FETCH_LLM_RESPONSE = text(
+    """
+SELECT response, expires_at
+FROM public.llm_response
+WHERE cache_key = :cache_key
+  AND expires_at > now()
+"""
+)
+
+STORE_LLM_RESPONSE = text(
+    """
+INSERT INTO public.llm_response (cache_key, model, response, expires_at)
+VALUES (:cache_key, :model, :response, :expires_at)
+ON CONFLICT (cache_key)
+DO UPDATE SET response = EXCLUDED.response, created_at = now(), expires_at = EXCLUDED.expires_at
+"""
+)
+
+PURGE_EXPIRED_LLM_RESPONSES = text(
+    """
+DELETE FROM public.llm_response
+WHERE expires_at <= now()
+"""
+)
+
+ENQUEUE_JOB = text(
+    """
+INSERT INTO public.generation_job (id, kind, google_sub, status, payload)
+VALUES (:id, :kind, :google_sub, 'queued', CAST(:payload AS jsonb))
+"""
+)
+
+INSERT_JOB_STEPS = text(
+    """
+INSERT INTO public.generation_job_step (job_id, step_key, chapter_index, kind, document_id, status)
+VALUES (:job_id, :step_key, :chapter_index, :kind, :document_id, 'pending')
+"""
+)
+
+# A job abandoned by as many workers as it may be claimed (out of memory,
+# renderer crash) would otherwise be reclaimed forever
+FAIL_EXHAUSTED_JOBS = text(
+    """
+UPDATE public.generation_job
+SET status = 'failed',
+    error = 'Worker lost ' || attempts || ' times, giving up',
+    locked_by = NULL,
+    updated_at = now()
+WHERE kind = ANY(:kinds)
+  AND status = 'running'
+  AND heartbeat_at < now() - make_interval(secs => :stale_seconds)
+  AND attempts >= :max_attempts
+"""
+)
+
+CLAIM_JOB = text(
+    """
+UPDATE public.generation_job j
+SET status = 'running',
+    locked_by = :worker_id,
+    heartbeat_at = now(),
+    attempts = j.attempts + 1,
+    updated_at = now()
+WHERE j.id = (
+    SELECT id
+    FROM public.generation_job
+    WHERE kind = ANY(:kinds)
+      AND (
+        status = 'queued'
+        OR (status = 'running' AND heartbeat_at < now() - make_interval(secs => :stale_seconds))
+      )
+      AND attempts < :max_attempts
+    ORDER BY created_at
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING j.id, j.kind, j.google_sub, j.payload, j.attempts
+"""
+)
+
+HEARTBEAT_JOB = text(
+    """
+UPDATE public.generation_job
+SET heartbeat_at = now()
+WHERE id = :id
+  AND locked_by = :worker_id
+"""
+)
+
+FINISH_JOB = text(
+    """
+UPDATE public.generation_job
+SET status = :status,
+    error = :error,
+    locked_by = NULL,
+    -- Handed back on shutdown: that claim does not count as an attempt
+    attempts = CASE WHEN :status = 'queued' THEN attempts - 1 ELSE attempts END,
+    updated_at = now()
+WHERE id = :id
+  AND locked_by = :worker_id
+"""
+)
+
+FETCH_JOB_STEPS = text(
+    """
+SELECT step_key, chapter_index, kind, document_id, status, attempts, result, error
+FROM public.generation_job_step
+WHERE job_id = :job_id
+ORDER BY chapter_index, step_key
+"""
+)
+
+UPDATE_JOB_STEP = text(
+    """
+UPDATE public.generation_job_step
+SET status = :status,
+    attempts = :attempts,
+    result = CAST(:result AS jsonb),
+    error = :error,
+    updated_at = now()
+WHERE job_id = :job_id
+  AND step_key = :step_key
+"""
+)
+
+FETCH_JOB_STATUS = text(
+    """
+SELECT j.id, j.kind, j.status, j.error, j.attempts, j.created_at, j.updated_at,
+       count(s.step_key) AS total_steps,
+       count(s.step_key) FILTER (WHERE s.status = 'done') AS done_steps,
+       count(s.step_key) FILTER (WHERE s.status = 'failed') AS failed_steps
+FROM public.generation_job j
+LEFT JOIN public.generation_job_step s ON s.job_id = j.id
+WHERE j.id = :id
+GROUP BY j.id
+"""
+)
+
+RESET_FAILED_JOB_STEPS = text(
+    """
+UPDATE public.generation_job_step
+SET status = 'pending', attempts = 0, error = NULL, updated_at = now()
+WHERE job_id = :job_id
+  AND status = 'failed'
+"""
+)
+
+REQUEUE_JOB = text(
+    """
+UPDATE public.generation_job
+SET status = 'queued', error = NULL, locked_by = NULL, attempts = 0, updated_at = now()
+WHERE id = :id
+  AND status IN ('completed', 'partial', 'failed')
+"""
+)
+
+FETCH_DOCUMENT_PDF = text(
+    """
+SELECT data
+FROM public.document_pdf
+WHERE document_id = :document_id
+  AND version = :version
+"""
+)
+
+STORE_DOCUMENT_PDF = text(
+    """
+INSERT INTO public.document_pdf (document_id, version, size, data)
+VALUES (:document_id, :version, :size, :data)
+ON CONFLICT (document_id) DO UPDATE
+SET version = EXCLUDED.version,
+    size = EXCLUDED.size,
+    data = EXCLUDED.data,
+    created_at = now()
+"""
+)
+
+DELETE_DOCUMENT_PDF = text(
+    """
+DELETE FROM public.document_pdf
+WHERE document_id = :document_id
+"""
+)
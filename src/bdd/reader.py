@@ -0,0 +1,118 @@
+"""Lean asyncpg read path for hot endpoints.
+
+Uses the asyncpg pool created at startup (`app.state.db_pool`) instead of
+SQLAlchemy for read-only sidebar and document fetches. Queries are reused
+from `src.bdd.query` and rewritten to asyncpg's positional parameters once at
+import time, so every connection prepares each statement once and serves
+later calls from its statement cache. Rows are decoded by asyncpg's binary
+protocol, with JSON columns turned into Python objects by the pool codecs.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from asyncpg import Pool
+from fastapi import Request
+from sqlalchemy.sql.elements import TextClause
+
+from src.bdd.dbmanager import DBManager
+from src.bdd.query import (
+    FETCH_ALL_CHAPTERS,
+    FETCH_ALL_CHATS,
+    FETCH_ALL_DEEPCOURSES,
+    FETCH_ASSET,
+    FETCH_ASSETS,
+    FETCH_CHAPTER_DOCUMENTS,
+    FETCH_DOCUMENT_BY_SESSION,
+)
+from src.utils.get_db_url import get_connection
+
+
+def _to_asyncpg(query: TextClause, *params: str) -> str:
+    """
+    Rewrite a SQLAlchemy text() query to asyncpg positional parameters.
+
+    Args:
+        query: SQLAlchemy text clause using `:name` parameters
+        *params: Parameter names, in the order they will be passed
+
+    Returns:
+        SQL string using `$1`, `$2`, ... placeholders
+    """
+    sql = query.text
+    for position, name in enumerate(params, 1):
+        sql = re.sub(rf"(?<!:):{name}\b", f"${position}", sql)
+    return sql
+
+
+SQL_FETCH_ALL_CHATS = _to_asyncpg(FETCH_ALL_CHATS, "user_id")
+SQL_FETCH_ALL_DEEPCOURSES = _to_asyncpg(FETCH_ALL_DEEPCOURSES, "user_id")
+SQL_FETCH_ALL_CHAPTERS = _to_asyncpg(FETCH_ALL_CHAPTERS, "deep_course_id")
+SQL_FETCH_CHAPTER_DOCUMENTS = _to_asyncpg(FETCH_CHAPTER_DOCUMENTS, "chapter_id")
+SQL_FETCH_DOCUMENT_BY_SESSION = _to_asyncpg(FETCH_DOCUMENT_BY_SESSION, "session_id")
+SQL_FETCH_ASSET = _to_asyncpg(FETCH_ASSET, "hash")
+SQL_FETCH_ASSETS = _to_asyncpg(FETCH_ASSETS, "hashes")
+
+
+class DBReader:
+    """
+    Read-only database access over the shared asyncpg pool.
+
+    Exposes the same read methods (and return shapes) as DBManager so routes
+    can use either one interchangeably.
+    """
+
+    def __init__(self, pool: Pool):
+        """Bind to an asyncpg pool created by create_db_pool()."""
+        self.pool = pool
+
+    async def _fetch(self, sql: str, *args: Any) -> List[Dict[str, Any]]:
+        async with get_connection(self.pool) as conn:
+            rows = await conn.fetch(sql, *args)
+        return [dict(row) for row in rows]
+
+    async def _fetchrow(self, sql: str, *args: Any) -> Optional[Dict[str, Any]]:
+        async with get_connection(self.pool) as conn:
+            row = await conn.fetchrow(sql, *args)
+        return dict(row) if row else None
+
+    async def fetch_all_chats(self, user_id: str):
+        """Fetch all chat sessions for a given user."""
+        return await self._fetch(SQL_FETCH_ALL_CHATS, user_id)
+
+    async def fetch_all_deepcourses(self, user_id: str):
+        """Fetch all deep courses for a given user."""
+        return await self._fetch(SQL_FETCH_ALL_DEEPCOURSES, user_id)
+
+    async def fetch_all_chapters(self, deepcourse_id: str):
+        """Fetch all chapters for a given deep course."""
+        return await self._fetch(SQL_FETCH_ALL_CHAPTERS, deepcourse_id)
+
+    async def fetch_chapter_documents(self, chapter_id: str):
+        """Fetch document sessions for a given chapter."""
+        return await self._fetchrow(SQL_FETCH_CHAPTER_DOCUMENTS, chapter_id)
+
+    async def get_document_by_session_id(self, session_id: str):
+        """Fetch document by session_id."""
+        return await self._fetchrow(SQL_FETCH_DOCUMENT_BY_SESSION, session_id)
+
+    async def fetch_asset(self, asset_hash: str):
+        """Fetch one asset (hash, mime_type, data) by its content hash."""
+        return await self._fetchrow(SQL_FETCH_ASSET, asset_hash)
+
+    async def fetch_assets(self, hashes: List[str]):
+        """Fetch several assets by content hash."""
+        return await self._fetch(SQL_FETCH_ASSETS, list(hashes))
+
+
+def get_db_reader(request: Request) -> Union[DBReader, DBManager]:
+    """
+    FastAPI dependency returning the fastest available read path.
+
+    Falls back to DBManager when the asyncpg pool could not be created at
+    startup (or SKIP_DB_INIT is set).
+    """
+    pool = getattr(request.app.state, "db_pool", None)
+    if pool is None:
+        return DBManager()
+    return DBReader(pool)
@@ -4,8 +4,10 @@ Defines the database schema using SQLAlchemy ORM models.
 """
 
 from sqlalchemy import (
-    Column, String, Text, Boolean, TIMESTAMP, JSON, ForeignKey, Enum, text
+    Column, String, Text, Boolean, TIMESTAMP, ForeignKey, Enum, Index, Integer,
+    LargeBinary, UniqueConstraint, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 import enum
 
@@ -45,6 +47,7 @@ class Chapter(Base):
     deep_course_id = Column(Text, ForeignKey("public.deepcourse.id", ondelete="CASCADE"))
     titre = Column(Text, nullable=False)
     is_complete = Column(Boolean, nullable=False, default=False)
+    position = Column(Integer, nullable=False)
 
     deep_course = relationship("DeepCourse")
 
@@ -57,10 +60,174 @@ class Document(Base):
     session_id = Column(String(128), nullable=False)
     chapter_id = Column(Text, ForeignKey("public.chapter.id", ondelete="CASCADE"), nullable=True)
     document_type = Column(Enum(DocumentType, name="document_type_enum"), nullable=False)
-    contenu = Column(JSON, nullable=False)
+    contenu = Column(JSONB, nullable=False)
     created_at = Column(TIMESTAMP, server_default=text("now()"))
     updated_at = Column(TIMESTAMP, server_default=text("now()"), onupdate=text("now()"))
 
     user = relationship("User", back_populates="documents")
     chapter = relationship("Chapter")
 
+class Asset(Base):
+    """Content-addressed binary asset (diagram PNG/SVG), keyed by SHA-256."""
+
+    __tablename__ = "asset"
+    __table_args__ = {"schema": "public"}
+
+    hash = Column(Text, primary_key=True)
+    mime_type = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class DiagramRender(Base):
+    """Render cache entry: (diagram type, format, normalized source hash) -> asset."""
+
+    __tablename__ = "diagram_render"
+    __table_args__ = {"schema": "public"}
+
+    cache_key = Column(Text, primary_key=True)
+    diagram_type = Column(Text, nullable=False)
+    output_format = Column(Text, nullable=False)
+    asset_hash = Column(Text, ForeignKey("public.asset.hash"), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class ArtifactBlob(Base):
+    """Content-addressed bytes of an uploaded chat artifact, keyed by SHA-256."""
+
+    __tablename__ = "artifact_blob"
+    __table_args__ = {"schema": "public"}
+
+    hash = Column(Text, primary_key=True)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class Artifact(Base):
+    """One version of a session artifact (uploaded file), pointing to its blob."""
+
+    __tablename__ = "artifact"
+    __table_args__ = (
+        UniqueConstraint("app_name", "user_id", "session_id", "filename", "version"),
+        {"schema": "public"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    app_name = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    session_id = Column(Text, nullable=False)
+    filename = Column(Text, nullable=False)
+    version = Column(Integer, nullable=False)
+    hash = Column(Text, ForeignKey("public.artifact_blob.hash"), nullable=False)
+    mime_type = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class GeminiFile(Base):
+    """Gemini Files API reference for a session artifact (uploaded once, reused by URI)."""
+
+    __tablename__ = "gemini_file"
+    __table_args__ = {"schema": "public"}
+
+    app_name = Column(Text, primary_key=True)
+    user_id = Column(Text, primary_key=True)
+    session_id = Column(Text, primary_key=True)
+    filename = Column(Text, primary_key=True)
+    uri = Column(Text, nullable=False)
+    mime_type = Column(Text, nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class LLMResponse(Base):
+    """LLM response cache entry: hash of (model, prompt, config) -> response text."""
+
+    __tablename__ = "llm_response"
+    __table_args__ = {"schema": "public"}
+
+    cache_key = Column(Text, primary_key=True)
+    model = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class GenerationJob(Base):
+    """Queued background generation (deep course), claimed by job workers."""
+
+    __tablename__ = "generation_job"
+    __table_args__ = {"schema": "public"}
+
+    id = Column(Text, primary_key=True)
+    kind = Column(Text, nullable=False)
+    google_sub = Column(Text, nullable=False)
+    status = Column(Text, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    error = Column(Text)
+    locked_by = Column(Text)
+    heartbeat_at = Column(TIMESTAMP(timezone=True))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class GenerationJobStep(Base):
+    """Checkpointed unit of a generation job (one chapter artifact or insert)."""
+
+    __tablename__ = "generation_job_step"
+    __table_args__ = {"schema": "public"}
+
+    job_id = Column(
+        Text, ForeignKey("public.generation_job.id", ondelete="CASCADE"), primary_key=True
+    )
+    step_key = Column(Text, primary_key=True)
+    chapter_index = Column(Integer, nullable=False)
+    kind = Column(Text, nullable=False)
+    document_id = Column(Text, nullable=False)
+    status = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    result = Column(JSONB)
+    error = Column(Text)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+class DocumentPDF(Base):
+    """Last rendered PDF of a document, valid for one content version."""
+
+    __tablename__ = "document_pdf"
+    __table_args__ = {"schema": "public"}
+
+    document_id = Column(
+        Text, ForeignKey("public.document.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+
+
+# JSONB index on document content (see migration 0001 in migrations.py)
+Index("ix_document_contenu_title", Document.contenu["title"].astext)
+
+
+# B-tree indexes for hot lookups (see migration 0002 in migrations.py)
+Index(
+    "ix_document_chat_listing",
+    Document.google_sub,
+    Document.updated_at.desc(),
+    postgresql_where=Document.chapter_id.is_(None),
+)
+Index("ux_document_session_id", Document.session_id, unique=True)
+Index(
+    "ix_document_chapter_id",
+    Document.chapter_id,
+    postgresql_where=Document.chapter_id.isnot(None),
+)
+Index("ix_chapter_deep_course_position", Chapter.deep_course_id, Chapter.position)
+Index("ix_deepcourse_google_sub", DeepCourse.google_sub)
+Index("ix_users_email", User.email)
+Index("ix_artifact_user_expires", Artifact.user_id, Artifact.expires_at)
+Index("ix_llm_response_expires", LLMResponse.expires_at)
+Index("ix_generation_job_claim", GenerationJob.status, GenerationJob.created_at)
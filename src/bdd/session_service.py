@@ -0,0 +1,62 @@
+"""Process-wide ADK DatabaseSessionService registry.
+
+DatabaseSessionService builds its own sync SQLAlchemy engine and reflects the
+ADK schema on construction. Building one per tool call meant several engines
+per agent turn, so a single instance is created at startup and shared by the
+chat routes and the generation tools.
+"""
+
+import logging
+from typing import Optional
+
+from google.adk.sessions import DatabaseSessionService
+
+from src.bdd.engine import DATABASE_URL_SYNC
+from src.config import database_settings
+
+logger = logging.getLogger(__name__)
+
+
+_session_service: Optional[DatabaseSessionService] = None
+
+
+def get_session_service() -> DatabaseSessionService:
+    """
+    Return the shared DatabaseSessionService, creating it on first call.
+
+    Also usable as a FastAPI dependency:
+        async def route(svc: DatabaseSessionService = Depends(get_session_service)): ...
+
+    Returns:
+        Process-wide DatabaseSessionService
+    """
+    global _session_service
+
+    if _session_service is None:
+        _session_service = DatabaseSessionService(
+            db_url=DATABASE_URL_SYNC,
+            pool_size=database_settings.ADK_DB_POOL_SIZE,
+            max_overflow=database_settings.ADK_DB_MAX_OVERFLOW,
+            pool_timeout=database_settings.DB_POOL_TIMEOUT,
+            pool_recycle=database_settings.DB_POOL_RECYCLE,
+            pool_pre_ping=database_settings.DB_POOL_PRE_PING,
+        )
+        logger.info(
+            f"⚙️  ADK session service initialized "
+            f"(pool_size={database_settings.ADK_DB_POOL_SIZE}, "
+            f"max_overflow={database_settings.ADK_DB_MAX_OVERFLOW})"
+        )
+
+    return _session_service
+
+
+def dispose_session_service() -> None:
+    """Close the ADK engine connections and forget the shared service."""
+    global _session_service
+
+    if _session_service is None:
+        return
+
+    _session_service.db_engine.dispose()
+    _session_service = None
+    logger.info("ADK session service disposed.")
@@ -4,6 +4,8 @@ Application configuration management.
 This module handles all configuration settings for the application.
 """
 
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from google import genai
 from urllib.parse import quote_plus
@@ -21,6 +23,22 @@ class AppSettings(BaseSettings):
         - HOST: Server host address
         - PORT: Server port number
         - DEBUG: Debug mode flag
+        - EXERCISES_PROGRESSIVE: Store exercises block by block as they are generated
+        - EXERCISES_STALE_SECONDS: Age of the last appended block after which a
+          "generating" exercise document is reported as failed
+        - COURSES_PROGRESSIVE: Store course text first, backfill diagrams in background
+        - COURSES_STALE_SECONDS: Age of the last diagram patch after which the
+          "pending" diagrams of a course are reported as failed
+        - BACKGROUND_DRAIN_TIMEOUT: Seconds to wait for background work on shutdown
+
+    Deep courses are generated by queued jobs (src.bdd.job_queue):
+        - DEEPCOURSE_JOBS: Enqueue deep courses instead of generating them inline
+        - JOB_WORKERS: Job worker coroutines per process
+        - JOB_POLL_SECONDS: Delay between polls of an empty queue
+        - JOB_STEP_TIMEOUT: Seconds allowed for one chapter artifact
+        - JOB_STEP_MAX_ATTEMPTS: Attempts per artifact before it is marked failed
+        - JOB_STALE_SECONDS: Heartbeat age after which a running job is reclaimed
+        - JOB_MAX_ATTEMPTS: Claims of a job before an abandoned run marks it failed
     """
 
     model_config = SettingsConfigDict(
@@ -36,6 +54,20 @@ class AppSettings(BaseSettings):
     PORT: int
     DEBUG: bool
 
+    EXERCISES_PROGRESSIVE: bool = True
+    EXERCISES_STALE_SECONDS: int = 600
+    COURSES_PROGRESSIVE: bool = True
+    COURSES_STALE_SECONDS: int = 600
+    BACKGROUND_DRAIN_TIMEOUT: float = 60.0
+
+    DEEPCOURSE_JOBS: bool = True
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 2.0
+    JOB_STEP_TIMEOUT: int = 180
+    JOB_STEP_MAX_ATTEMPTS: int = 3
+    JOB_STALE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 3
+
 
 class GeminiSettings(BaseSettings):
     """
@@ -43,6 +75,25 @@ class GeminiSettings(BaseSettings):
 
     Configures API keys and model identifiers for Google's AI services.
     Initializes the Genai client on instantiation.
+
+    Calls are scheduled per model by src.utils.llm_scheduler:
+        - LLM_MAX_CONCURRENCY: Requests in flight per model
+        - LLM_REQUESTS_PER_MINUTE: Request budget per model
+        - LLM_TOKENS_PER_MINUTE: Token budget per model
+        - LLM_MODEL_LIMITS: Per-model overrides, as JSON
+          ({"<model>": {"max_concurrency": 8, "rpm": 1000, "tpm": 1000000}})
+        - LLM_OUTPUT_TOKENS_ESTIMATE: Output tokens assumed before a call returns
+        - LLM_MAX_RETRIES: Retries on 429/503 responses
+
+    Generation responses are cached by src.utils.llm_cache:
+        - LLM_CACHE_ENABLED: Serve identical generation calls from the cache
+        - LLM_CACHE_TTL_HOURS: Lifetime of a cached response
+        - LLM_CACHE_MAX_MB: Size of the per-process LRU of responses
+        - LLM_CACHE_PERSISTENT: Also keep responses in Postgres (llm_response)
+
+    Chat uploads are referenced through the Files API (src.bdd.gemini_file_cache):
+        - GEMINI_FILES_BACKEND: "gemini" (Files API) or "fake" (pytest only)
+        - GEMINI_FILES_TTL_HOURS: Expiry assumed when the backend gives none
     """
 
     model_config = SettingsConfigDict(
@@ -58,6 +109,21 @@ class GeminiSettings(BaseSettings):
     GEMINI_MODEL_2_5_FLASH_LIVE: str
     GEMINI_MODEL_2_5_FLASH_IMAGE: str
 
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_REQUESTS_PER_MINUTE: int = 1000
+    LLM_TOKENS_PER_MINUTE: int = 1_000_000
+    LLM_MODEL_LIMITS: Dict[str, Dict[str, int]] = {}
+    LLM_OUTPUT_TOKENS_ESTIMATE: int = 2048
+    LLM_MAX_RETRIES: int = 3
+
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_HOURS: int = 168
+    LLM_CACHE_MAX_MB: int = 32
+    LLM_CACHE_PERSISTENT: bool = True
+
+    GEMINI_FILES_BACKEND: str = "gemini"
+    GEMINI_FILES_TTL_HOURS: int = 48
+
     def __init__(self, **data):
         super().__init__(**data)
         self.CLIENT = genai.Client(api_key=self.GOOGLE_API_KEY)
@@ -69,6 +135,22 @@ class DatabaseSettings(BaseSettings):
 
     Manages connection parameters for the PostgreSQL database and constructs
     the DSN (Data Source Name) string for asyncpg connections.
+
+    Pool settings apply to the process-wide SQLAlchemy async engine:
+        - DB_POOL_SIZE: Connections kept open in the pool
+        - DB_MAX_OVERFLOW: Extra connections allowed under burst load
+        - DB_POOL_TIMEOUT: Seconds to wait for a free connection
+        - DB_POOL_RECYCLE: Seconds before a connection is recycled
+        - DB_POOL_PRE_PING: Check connection liveness before checkout
+
+    The ADK DatabaseSessionService runs its own sync engine, sized separately:
+        - ADK_DB_POOL_SIZE: Connections kept open for ADK sessions/events
+        - ADK_DB_MAX_OVERFLOW: Extra ADK connections allowed under burst load
+
+    Chat uploads are stored by src.bdd.artifact_service:
+        - ARTIFACT_TTL_HOURS: Lifetime of an uploaded artifact
+        - ARTIFACT_USER_QUOTA_MB: Live artifact bytes allowed per user
+        - ARTIFACT_CACHE_MAX_MB: Size of the per-process LRU of artifact bytes
     """
 
     model_config = SettingsConfigDict(
@@ -84,6 +166,19 @@ class DatabaseSettings(BaseSettings):
     DB_HOST_SQL: str
     DB_PORT_SQL: int = 5432
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    ADK_DB_POOL_SIZE: int = 5
+    ADK_DB_MAX_OVERFLOW: int = 5
+
+    ARTIFACT_TTL_HOURS: int = 72
+    ARTIFACT_USER_QUOTA_MB: int = 200
+    ARTIFACT_CACHE_MAX_MB: int = 64
+
     @property
     def dsn(self) -> str:
         """
@@ -101,6 +196,84 @@ class DatabaseSettings(BaseSettings):
         return dsn
 
 
+class DiagramSettings(BaseSettings):
+    """
+    Diagram rendering configuration.
+
+    Settings for the async Kroki client (src.utils.kroki_client):
+        - KROKI_URL: Kroki base URL (public service or a local container)
+        - KROKI_HTTP2: Use HTTP/2 when the server supports it
+        - KROKI_MAX_CONCURRENCY: Renders in flight per Kroki host
+        - KROKI_TIMEOUT: Seconds before a render request is abandoned
+        - KROKI_MAX_RETRIES: Retries on network errors, 429 and 5xx
+
+    Render cache (src.utils.diagram_cache):
+        - DIAGRAM_CACHE_MAX_MB: Size of the in-process LRU of rendered images
+        - DIAGRAM_CACHE_PERSISTENT: Also keep renders in Postgres (asset table)
+
+    Renderer selection (src.utils.diagram_renderers):
+        - DIAGRAM_RENDERERS: Per-type ordered backend list overriding the
+          defaults, e.g. {"graphviz": ["graphviz", "kroki"]}
+
+    Stored format (src.utils.cours_utils_quad_llm):
+        - DIAGRAM_OUTPUT_FORMAT: "png" or "svg"
+        - DIAGRAM_SVG_GZIP: Store SVG diagrams gzip-compressed ("svgz")
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+    )
+
+    KROKI_URL: str = "https://kroki.io"
+    KROKI_HTTP2: bool = True
+    KROKI_MAX_CONCURRENCY: int = 16
+    KROKI_TIMEOUT: float = 30.0
+    KROKI_MAX_RETRIES: int = 2
+
+    DIAGRAM_CACHE_MAX_MB: int = 32
+    DIAGRAM_CACHE_PERSISTENT: bool = True
+
+    DIAGRAM_RENDERERS: Dict[str, List[str]] = {}
+
+    DIAGRAM_OUTPUT_FORMAT: str = "png"
+    DIAGRAM_SVG_GZIP: bool = True
+
+
+class ExportSettings(BaseSettings):
+    """
+    Document export (PDF) configuration.
+
+    PDF rendering runs in a process pool (src.utils.pdf_pool):
+        - PDF_WORKERS: Worker processes rendering PDFs
+        - PDF_MAX_QUEUE: Renders allowed to wait for a worker before requests
+          are answered 503
+        - PDF_RENDER_TIMEOUT: Seconds before a render is abandoned
+        - PDF_RETRY_AFTER: Retry-After (seconds) sent with 503 responses
+
+    Rendered PDFs are cached per document version (src.utils.pdf_cache):
+        - PDF_CACHE_MAX_MB: Size of the per-process LRU of PDFs
+        - PDF_CACHE_PERSISTENT: Also keep PDFs in Postgres (document_pdf)
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+    )
+
+    PDF_WORKERS: int = 2
+    PDF_MAX_QUEUE: int = 8
+    PDF_RENDER_TIMEOUT: float = 60.0
+    PDF_RETRY_AFTER: int = 5
+
+    PDF_CACHE_MAX_MB: int = 64
+    PDF_CACHE_PERSISTENT: bool = True
+
+
 class OAuthSettings(BaseSettings):
     """
     OAuth and JWT authentication configuration.
@@ -137,5 +310,7 @@ class OAuthSettings(BaseSettings):
 app_settings = AppSettings()  # type: ignore
 gemini_settings = GeminiSettings()
 database_settings = DatabaseSettings()  # type: ignore
+diagram_settings = DiagramSettings()
+export_settings = ExportSettings()
 oauth_settings = OAuthSettings()  # type: ignore
 
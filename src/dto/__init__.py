@@ -4,7 +4,7 @@ This package provides Pydantic models for type-safe API contracts.
 DTOs ensure strong typing and automatic validation of all API inputs/outputs.
 """
 
-from .chat import ChatResponse, AgentAnswer
+from .chat import ChatResponse, ChatStreamEvent, AgentAnswer
 from .correctplainquestion import (
     CorrectMultipleQuestionsRequest,
     CorrectPlainQuestionResponse,
@@ -28,6 +28,7 @@ from .signup import SignupRequest, SignupResponse
 
 __all__ = [
     "ChatResponse",
+    "ChatStreamEvent",
     "AgentAnswer",
     "CorrectMultipleQuestionsRequest",
     "CorrectPlainQuestionResponse",
@@ -19,3 +19,25 @@ class ChatResponse(BaseModel):
     answer: str
     agent: Optional[str] = None
     redirect_id: Optional[str] = None
+
+
+class ChatStreamEvent(BaseModel):
+    """Event pushed to the frontend by the streaming chat endpoint.
+
+    Types:
+        - session: session resolved, sent right away
+        - text: partial answer text (append to the current message)
+        - tool_start / tool_end: a tool (generate_courses, ...) started / finished
+        - retry: the run restarted on a fresh session, discard partial text
+        - done: final answer, same fields as ChatResponse
+        - error: the run failed
+    """
+
+    type: Literal["session", "text", "tool_start", "tool_end", "retry", "done", "error"]
+    session_id: Optional[str] = None
+    text: Optional[str] = None
+    tool: Optional[str] = None
+    answer: Optional[str] = None
+    agent: Optional[str] = None
+    redirect_id: Optional[str] = None
+    detail: Optional[str] = None
@@ -1,6 +1,6 @@
 """Question correction DTOs."""
 
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -17,9 +17,16 @@ class CorrectQuestionRequest(BaseModel):
     question: str
     user_answer: str
     expected_answer: str
+    id_question: Optional[str] = None
 
 
 class CorrectMultipleQuestionsRequest(BaseModel):
-    """Request to correct multiple questions."""
+    """Request to correct multiple questions.
+
+    With `doc_id`, results of questions carrying an `id_question` are saved
+    in that exercise document.
+    """
 
     questions: List[CorrectQuestionRequest]
+    doc_id: Optional[str] = None
+    mode: Literal["concurrent", "single_call"] = "concurrent"
@@ -5,10 +5,12 @@ agents (exercise, course, deep course) and tool results.
 """
 
 from .cours_models import (
+    CourseDraft,
     CoursePlan,
     CourseOutput,
     CourseSynthesis,
     Part,
+    PartDraft,
     PartPlanItem,
     PartSchema,
 )
@@ -33,6 +35,7 @@ __all__ = [
     "Chapter",
     "ChapterSynthesis",
     "ClassifiedPlan",
+    "CourseDraft",
     "CourseOutput",
     "CoursePlan",
     "CourseSynthesis",
@@ -45,6 +48,7 @@ __all__ = [
     "GenerativeToolOutput",
     "Open",
     "Part",
+    "PartDraft",
     "PartPlanItem",
     "PartSchema",
     "QCM",
@@ -55,7 +55,7 @@ class CoursePlan(BaseModel):
 
 
 class Part(BaseModel):
-    """Course section with markdown content, diagram, and PNG schema."""
+    """Course section with markdown content, diagram, and rendered schema."""
 
     id_part: Optional[str] = Field(None, description="Identifiant unique de la partie")
     id_schema: Optional[str] = Field(
@@ -75,7 +75,23 @@ class Part(BaseModel):
         None, description="Code du diagramme généré (Mermaid, GraphViz, etc.)"
     )
     img_base64: Optional[str] = Field(
-        None, description="PNG du schéma encodé en base64 (généré par Kroki)"
+        None,
+        description="Image du schéma encodée en base64, au format indiqué par img_format",
+    )
+    img_format: Literal["png", "svg", "svgz"] = Field(
+        "png",
+        description="Format de l'image du schéma: png, svg ou svgz (SVG compressé gzip)",
+    )
+    diagram_status: Literal["pending", "done", "failed"] = Field(
+        "done",
+        description="État du schéma: 'pending' tant qu'il est généré en arrière-plan",
+    )
+    img_svg: Optional[str] = Field(
+        None, description="Code SVG du schéma, inclus par /api/fetchcourse sur demande"
+    )
+    img_hash: Optional[str] = Field(
+        None,
+        description="Hash SHA-256 de l'image stockée dans la table asset (servie par /api/asset/{hash})",
     )
 
 
@@ -83,6 +99,33 @@ class Part(BaseModel):
 PartSchema = Part
 
 
+###############################################
+### Pydantic Models for LLM Course Drafts #####
+###############################################
+
+
+class PartDraft(BaseModel):
+    """Course part as written by the LLM, before ids and diagram rendering."""
+
+    title: str = Field(..., description="Titre de la partie.")
+    content: str = Field(..., description="Contenu détaillé de la partie en markdown.")
+    schema_description: Optional[str] = Field(
+        None,
+        description="Description précise du contenu du schéma associé à la partie.",
+    )
+    diagram_type: str = Field(
+        "mermaid",
+        description="Type de diagramme sélectionné: mermaid, plantuml, graphviz, vegalite",
+    )
+
+
+class CourseDraft(BaseModel):
+    """Course generation response schema (storage fields of Part left out)."""
+
+    title: str = Field(..., description="Titre du cours généré.")
+    parts: List[PartDraft] = Field(..., description="Liste des parties générées.")
+
+
 ###############################################
 ### Pydantic Models for Course Output   #######
 ###############################################
@@ -154,6 +154,13 @@ class ExerciseOutput(BaseModel):
     )
     title: str = Field(..., description="Titre de l'exercice généré.")
     exercises: List[Annotated[Union[QCM, Open], Field(discriminator="type")]] = Field(
-        ..., min_length=1, description="Liste des exercices générés."
+        ..., description="Liste des exercices générés."
+    )
+    status: Literal["generating", "completed", "failed"] = Field(
+        "completed",
+        description="État de la génération: les blocs sont ajoutés un à un tant que 'generating'.",
+    )
+    expected_exercises: Optional[int] = Field(
+        None, description="Nombre de blocs d'exercices prévus par le plan."
     )
 
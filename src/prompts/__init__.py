@@ -37,6 +37,7 @@ from .orchestrator_prompt import AGENT_PROMPT_ORCHESTRATOR
 from .utils_prompt import (
     GENERATE_TITLE_PROMPT,
     SYSTEM_PROMPT_CORRECT_PLAIN_QUESTION,
+    SYSTEM_PROMPT_CORRECT_PLAIN_QUESTIONS_BATCH,
 )
 
 __all__ = [
@@ -49,6 +50,7 @@ __all__ = [
     "AGENT_PROMPT_CopiloteNewChapitreAgent_base",
     "GENERATE_TITLE_PROMPT",
     "SYSTEM_PROMPT_CORRECT_PLAIN_QUESTION",
+    "SYSTEM_PROMPT_CORRECT_PLAIN_QUESTIONS_BATCH",
     "SYSTEM_PROMPT_GENERATE_PART",
     "SYSTEM_PROMPT_GENERATE_MERMAID_CODE",
     "SYSTEM_PROMPT_PLANNER_COURS",
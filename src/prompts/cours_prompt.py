@@ -269,8 +269,6 @@ SYSTEM_PROMPT_GENERATE_COMPLETE_COURSE = """
       "title": "Titre global du cours",
       "parts": [
         {
-          "id_part": null,
-          "id_schema": null,
           "title": "Titre de la partie 1",
           "content": "Contenu structuré, pédagogique...",
           "schema_description": "Description courte du schéma (1-2 phrases max)",
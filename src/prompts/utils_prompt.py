@@ -41,3 +41,17 @@ SYSTEM_PROMPT_CORRECT_PLAIN_QUESTION = """
         - true si la réponse est correcte
         - false sinon
     """
+
+
+SYSTEM_PROMPT_CORRECT_PLAIN_QUESTIONS_BATCH = """
+    Vous êtes un assistant qui corrige les réponses aux questions posées aux utilisateurs.
+    Vous recevez une liste numérotée de questions. Pour chacune : la question, la réponse attendue et la réponse de l'utilisateur.
+    Pour chaque question, déterminez si la réponse de l'utilisateur est correcte par rapport à la réponse attendue.
+    Ne prends pas en considération les explications si elles sont demandées.
+    Ne sois pas trop dur dans ta réponse si l'utilisateur n'inclut pas d'explications, même si cela est demandé dans la réponse attendue.
+    Chaque question est indépendante : ne laissez pas une réponse influencer la correction d'une autre.
+
+    Répondez uniquement par une liste contenant exactement un élément par question, dans le même ordre :
+        - is_correct: true si la réponse est correcte
+        - is_correct: false sinon
+    """
@@ -1,25 +1,70 @@
 """Course generation tool with dual-LLM pipeline.
 
 Generates complete courses with dual-LLM architecture for content and diagrams.
+
+In progressive mode (COURSES_PROGRESSIVE, agent calls only), the course is
+stored as soon as LLM #1 has written the text; diagrams are generated in the
+background and patched into each part, whose `diagram_status` goes from
+"pending" to "done" or "failed". Each patch refreshes the document's
+updated_at, which /api/fetchcourse uses to report diagrams abandoned by a
+crash as failed.
 """
 
+import asyncio
 import json
 import logging
 from typing import Union
 from uuid import uuid4
 
-from google.adk.sessions.database_session_service import DatabaseSessionService
-
-from src.bdd import DBManager
-from src.config import app_settings, database_settings
-from src.models import CourseOutput, CourseSynthesis, GenerativeToolOutput
+from src.bdd import DBManager, get_session_service
+from src.config import app_settings
+from src.models import CourseOutput, CourseSynthesis, GenerativeToolOutput, Part
 from src.utils import get_user_id
+from src.utils.background import spawn_background
+from src.utils.cours_utils_quad_llm import (
+    backfill_course_diagrams,
+    generate_course_text,
+)
 from src.utils.cours_utils_quad_llm_integration import generate_courses_quad_llm
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def _backfill_stored_course(bdd_manager: DBManager, course: CourseOutput) -> None:
+    """Render the course diagrams and patch each part of the stored document."""
+    patched = set()
+
+    async def patch(part: Part) -> None:
+        await bdd_manager.patch_course_part(course.id, part)
+        patched.add(part.id_part)
+
+    try:
+        await backfill_course_diagrams(course, patch)
+    except (Exception, asyncio.CancelledError) as e:
+        cancelled = isinstance(e, asyncio.CancelledError)
+        if cancelled:
+            logger.warning(f"[GENERATE_COURSES] Diagram backfill cancelled for {course.id}")
+        else:
+            logger.error(f"[GENERATE_COURSES] Diagram backfill failed: {e}", exc_info=True)
+        # Do not leave the frontend polling on parts that will never be rendered:
+        # every part not patched yet is still "pending" in the stored document
+        for part in course.parts:
+            if part.id_part in patched:
+                continue
+            if part.diagram_status == "pending":
+                part.diagram_status = "failed"
+            try:
+                await bdd_manager.patch_course_part(course.id, part)
+            except Exception as patch_error:
+                logger.error(
+                    f"[GENERATE_COURSES] Could not patch part {part.id_part}: "
+                    f"{patch_error}"
+                )
+        if cancelled:
+            raise
+
+
 async def generate_courses(
     is_called_by_agent: bool, course_synthesis: CourseSynthesis
 ) -> Union[GenerativeToolOutput, CourseOutput]:
@@ -32,6 +77,8 @@ async def generate_courses(
        - LLM #1: Contenu markdown + sélection type diagramme (4 types)
        - LLM #2 (spécialisé): Code diagramme selon le type (max 3 retries)
        - Kroki: Conversion en PNG base64
+       (en mode progressif : le cours est stocké dès la fin du LLM #1, les
+       diagrammes sont générés ensuite en arrière-plan)
     4. Retour du CourseOutput avec contenu markdown + diagrammes
 
     Args:
@@ -44,15 +91,43 @@ async def generate_courses(
     if isinstance(course_synthesis, dict):
         course_synthesis = CourseSynthesis.model_validate(course_synthesis)
 
-    db_session_service = DatabaseSessionService(
-        db_url=database_settings.dsn,
-    )
+    db_session_service = get_session_service()
     bdd_manager = DBManager()
 
     agent = None
     redirect_id = None
     completed = False
 
+    # Progressive mode: store the text now, backfill diagrams in the background
+    if is_called_by_agent and app_settings.COURSES_PROGRESSIVE:
+        user_id = get_user_id()
+        course = await generate_course_text(course_synthesis)
+        if user_id and course is not None:
+            copilote_session_id = str(uuid4())
+            await db_session_service.create_session(
+                session_id=copilote_session_id,
+                app_name=app_settings.APP_NAME,
+                user_id=user_id,
+            )
+            await bdd_manager.store_basic_document(
+                content=course,
+                session_id=copilote_session_id,
+                sub=user_id,
+            )
+            spawn_background(
+                _backfill_stored_course(bdd_manager, course),
+                name=f"course-diagrams-{course.id}",
+            )
+            agent = "course"
+            redirect_id = copilote_session_id
+            completed = True
+
+        return GenerativeToolOutput(
+            agent=agent,
+            redirect_id=redirect_id,
+            completed=completed
+        )
+
     result = await generate_courses_quad_llm(course_synthesis)
 
     logger.info("[GENERATE_COURSES] Course generated successfully")
@@ -0,0 +1,323 @@
+"""Deep course generation as a resumable background job.
+
+`enqueue_deepcourse_job` creates the deepcourse row and a queued job with
+one step per chapter artifact (exercise, course, evaluation) plus one step
+per chapter insert, and returns at once. A job worker then runs
+`run_deepcourse_job`:
+
+- every pending artifact is generated with its own timeout and up to
+  JOB_STEP_MAX_ATTEMPTS attempts, and its result is checkpointed as soon as
+  it is produced, so a restarted job only regenerates what is missing;
+- a chapter is stored as soon as its 3 artifacts are settled, at its plan
+  position in the deep course;
+  an artifact that kept failing is stored as an empty document with
+  status "failed" instead of discarding the whole deep course;
+- retrying a job (POST /api/deepcoursejob/{id}/retry) only regenerates the
+  failed artifacts and overwrites their placeholder documents.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Union
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+
+from src.bdd import DBManager, get_session_service
+from src.bdd.job_queue import Job, JobStep, get_job_queue
+from src.bdd.query import CREATE_DEEPCOURSE
+from src.config import app_settings
+from src.models import (
+    ChapterSynthesis,
+    CourseOutput,
+    DeepCourseSynthesis,
+    ExerciseOutput,
+)
+from src.tools.cours_tools import generate_courses
+from src.tools.exercises_tools import generate_exercises
+from src.utils import LLMPriority, llm_priority
+from src.utils.timing import Timer
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "deepcourse"
+
+# Artifact steps of a chapter, in the order of the chapter's documents
+ARTIFACT_KINDS = ("exercise", "course", "evaluation")
+
+Artifact = Union[ExerciseOutput, CourseOutput]
+
+
+def _step_key(chapter_index: int, kind: str) -> str:
+    return f"{chapter_index:02d}-{kind}"
+
+
+async def _gather_settled(*aws) -> list:
+    """Like asyncio.gather, but only raises (the first error) once all are done.
+
+    With a plain gather, the job would be finished (and retryable) while
+    sibling chapters were still generating and writing.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        if len(errors) > 1:
+            logger.error(f"[DEEPCOURSE-JOB] {len(errors)} tasks failed: {errors}")
+        raise errors[0]
+    return results
+
+
+async def enqueue_deepcourse_job(user_id: str, synthesis: DeepCourseSynthesis) -> str:
+    """
+    Create the deep course and queue its generation.
+
+    The deepcourse row is created in the same transaction as the job, so it
+    shows up in the user's list right away and its chapters appear as they
+    are generated.
+
+    Args:
+        user_id: Owner (google_sub)
+        synthesis: Validated deep course plan
+
+    Returns:
+        Deep course id (also the job id)
+    """
+    deepcourse_id = str(uuid4())
+    steps: List[JobStep] = []
+    for idx in range(len(synthesis.synthesis_chapters)):
+        for kind in ARTIFACT_KINDS:
+            steps.append(
+                JobStep(
+                    step_key=_step_key(idx, kind),
+                    chapter_index=idx,
+                    kind=kind,
+                    document_id=str(uuid4()),
+                )
+            )
+        steps.append(
+            JobStep(
+                step_key=_step_key(idx, "chapter"),
+                chapter_index=idx,
+                kind="chapter",
+                document_id=str(uuid4()),
+            )
+        )
+
+    await get_job_queue().enqueue(
+        job_id=deepcourse_id,
+        kind=JOB_KIND,
+        google_sub=user_id,
+        payload={"synthesis": synthesis.model_dump()},
+        steps=steps,
+        statements=[
+            (
+                CREATE_DEEPCOURSE,
+                {"id": deepcourse_id, "titre": synthesis.title, "google_sub": user_id},
+            )
+        ],
+    )
+    logger.info(
+        f"[DEEPCOURSE-JOB] {deepcourse_id} queued "
+        f"({len(synthesis.synthesis_chapters)} chapters, {len(steps)} steps)"
+    )
+    return deepcourse_id
+
+
+async def _generate_artifact(step: JobStep, chapter: ChapterSynthesis) -> Artifact:
+    """Generate one chapter artifact and give it its pre-assigned document id."""
+    if step.kind == "course":
+        result = await generate_courses(
+            is_called_by_agent=False, course_synthesis=chapter.synthesis_course
+        )
+        artifact = (
+            CourseOutput.model_validate(result) if isinstance(result, dict) else result
+        )
+    else:
+        synthesis = (
+            chapter.synthesis_exercise
+            if step.kind == "exercise"
+            else chapter.synthesis_evaluation
+        )
+        result = await generate_exercises(is_called_by_agent=False, synthesis=synthesis)
+        artifact = (
+            ExerciseOutput.model_validate(result) if isinstance(result, dict) else result
+        )
+    artifact.id = step.document_id
+    return artifact
+
+
+async def _run_artifact_step(
+    job_id: str, step: JobStep, chapter: ChapterSynthesis
+) -> Optional[Artifact]:
+    """
+    Run an artifact step until it succeeds or runs out of attempts.
+
+    Returns:
+        The artifact, or None if the step failed
+    """
+    queue = get_job_queue()
+    while step.attempts < app_settings.JOB_STEP_MAX_ATTEMPTS:
+        step.attempts += 1
+        try:
+            with Timer(f"[DEEPCOURSE-JOB] {job_id} {step.step_key}"):
+                artifact = await asyncio.wait_for(
+                    _generate_artifact(step, chapter),
+                    timeout=app_settings.JOB_STEP_TIMEOUT,
+                )
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.warning(
+                f"[DEEPCOURSE-JOB] {job_id} {step.step_key} attempt "
+                f"{step.attempts}/{app_settings.JOB_STEP_MAX_ATTEMPTS} failed: {error}"
+            )
+            step.error = error
+            continue
+
+        step.status = "done"
+        step.error = None
+        await queue.checkpoint(job_id, step, artifact)
+        return artifact
+
+    step.status = "failed"
+    await queue.checkpoint(job_id, step)
+    return None
+
+
+def _checkpointed_artifact(step: JobStep) -> Optional[Artifact]:
+    """Artifact saved by an earlier run of the job."""
+    if step.status != "done" or step.result is None:
+        return None
+    if step.kind == "course":
+        return CourseOutput.model_validate(step.result)
+    return ExerciseOutput.model_validate(step.result)
+
+
+def _placeholder(step: JobStep, chapter: ChapterSynthesis) -> Artifact:
+    """Empty document stored in place of an artifact that failed."""
+    if step.kind == "course":
+        return CourseOutput(id=step.document_id, title=chapter.chapter_title, parts=[])
+    synthesis = (
+        chapter.synthesis_exercise
+        if step.kind == "exercise"
+        else chapter.synthesis_evaluation
+    )
+    return ExerciseOutput(
+        id=step.document_id, title=synthesis.title, exercises=[], status="failed"
+    )
+
+
+async def _store_chapter(
+    job: Job,
+    chapter_step: JobStep,
+    chapter: ChapterSynthesis,
+    artifacts: Dict[str, Artifact],
+) -> None:
+    """Insert the chapter and its 3 documents, then checkpoint the chapter step."""
+    session_service = get_session_service()
+    sessions = {}
+    for kind in ARTIFACT_KINDS:
+        session = await session_service.create_session(
+            app_name=app_settings.APP_NAME, user_id=job.google_sub
+        )
+        sessions[kind] = session.id
+
+    try:
+        await DBManager().store_chapter(
+            title=chapter.chapter_title,
+            user_id=job.google_sub,
+            deepcourse_id=job.id,
+            chapter_id=chapter_step.document_id,
+            session_exercise=sessions["exercise"],
+            session_course=sessions["course"],
+            session_evaluation=sessions["evaluation"],
+            exercice=artifacts["exercise"],
+            course=artifacts["course"],
+            evaluation=artifacts["evaluation"],
+            position=chapter_step.chapter_index,
+        )
+    except IntegrityError:
+        # Stored by a run that died before its checkpoint
+        logger.info(
+            f"[DEEPCOURSE-JOB] {job.id} chapter {chapter_step.chapter_index + 1} "
+            "already stored"
+        )
+
+    chapter_step.status = "done"
+    chapter_step.attempts += 1
+    await get_job_queue().checkpoint(job.id, chapter_step)
+
+
+async def _run_chapter(
+    job: Job,
+    chapter: ChapterSynthesis,
+    steps: Dict[str, JobStep],
+) -> None:
+    """Generate the missing artifacts of a chapter, then store or update it."""
+    pending = [
+        steps[kind] for kind in ARTIFACT_KINDS if steps[kind].status == "pending"
+    ]
+    generated = await _gather_settled(
+        *(_run_artifact_step(job.id, step, chapter) for step in pending)
+    )
+    fresh = {
+        step.kind: artifact
+        for step, artifact in zip(pending, generated)
+        if artifact is not None
+    }
+
+    chapter_step = steps["chapter"]
+    if chapter_step.status == "done":
+        # Retry of a stored chapter: overwrite the failed placeholders
+        db_manager = DBManager()
+        for artifact in fresh.values():
+            await db_manager.update_document(artifact.id, artifact)
+        return
+
+    artifacts = {}
+    for kind in ARTIFACT_KINDS:
+        artifacts[kind] = (
+            fresh.get(kind)
+            or _checkpointed_artifact(steps[kind])
+            or _placeholder(steps[kind], chapter)
+        )
+
+    # Stored as soon as ready: its position keeps the plan order
+    await _store_chapter(job, chapter_step, chapter, artifacts)
+
+
+async def run_deepcourse_job(job: Job) -> str:
+    """
+    Run (or resume) a deep course job.
+
+    Args:
+        job: Claimed job whose payload holds the DeepCourseSynthesis
+
+    Returns:
+        "completed", or "partial" if some artifacts failed
+    """
+    synthesis = DeepCourseSynthesis.model_validate(job.payload["synthesis"])
+    all_steps = await get_job_queue().fetch_steps(job.id)
+
+    by_chapter: Dict[int, Dict[str, JobStep]] = {}
+    for step in all_steps:
+        by_chapter.setdefault(step.chapter_index, {})[step.kind] = step
+
+    logger.info(
+        f"[DEEPCOURSE-JOB] {job.id} attempt {job.attempts}: "
+        f"{sum(step.status == 'pending' for step in all_steps)} pending step(s)"
+    )
+
+    # Gemini calls made by jobs queue behind interactive ones
+    with llm_priority(LLMPriority.BATCH):
+        await _gather_settled(
+            *(
+                _run_chapter(job, chapter, by_chapter[idx])
+                for idx, chapter in enumerate(synthesis.synthesis_chapters)
+            )
+        )
+
+    failed = [step.step_key for step in all_steps if step.status == "failed"]
+    if failed:
+        logger.warning(f"[DEEPCOURSE-JOB] {job.id} finished with failed steps: {failed}")
+        return "partial"
+    return "completed"
@@ -2,6 +2,10 @@
 
 Generates complete deepcourses with all chapters, exercises, and evaluations
 using parallel execution and database persistence.
+
+With DEEPCOURSE_JOBS (agent calls with a user), the deep course is queued as
+a background job (see deepcourse_job) and the tool returns its id at once;
+progress is exposed by GET /api/deepcoursejob/{id}.
 """
 
 import asyncio
@@ -10,10 +14,8 @@ import time
 from typing import Dict, List
 from uuid import uuid4
 
-from google.adk.sessions.database_session_service import DatabaseSessionService
-
-from src.bdd import DBManager
-from src.config import app_settings, database_settings
+from src.bdd import DBManager, get_session_service
+from src.config import app_settings
 from src.models import (
     Chapter,
     CourseOutput,
@@ -24,9 +26,11 @@ from src.models import (
 )
 from src.tools.cours_tools import generate_courses
 from src.tools.exercises_tools import generate_exercises
-from src.utils import get_user_id
+from src.utils import LLMPriority, get_user_id, llm_priority
 from src.utils.timing import Timer
 
+from .deepcourse_job import enqueue_deepcourse_job
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,9 +60,14 @@ async def generate_deepcourse(synthesis: dict) -> GenerativeToolOutput:
         logger.info(f"Title: {synthesis.title}") # type: ignore
         logger.info(f"Chapters: {len(synthesis.synthesis_chapters)}") # type: ignore
 
-    db_session_service = DatabaseSessionService(
-        db_url=database_settings.dsn,
-    )
+    user_id = get_user_id()
+    if app_settings.DEEPCOURSE_JOBS and user_id:
+        deepcourse_id = await enqueue_deepcourse_job(user_id, synthesis)  # type: ignore
+        return GenerativeToolOutput(
+            agent="deep-course", completed=True, redirect_id=deepcourse_id
+        )
+
+    db_session_service = get_session_service()
     bdd_manager = DBManager()
 
     agent = "deep-course"
@@ -116,10 +125,12 @@ async def generate_deepcourse(synthesis: dict) -> GenerativeToolOutput:
         total_timeout = timeout_per_task * num_chapters + 60  # +60s buffer
         logger.info(f"Global timeout: {total_timeout}s for {num_chapters} chapter(s)")
 
-        all_results = await asyncio.wait_for(
-            asyncio.gather(*all_tasks, return_exceptions=False),
-            timeout=total_timeout,
-        )
+        # Gemini calls made by these tasks queue behind interactive ones
+        with llm_priority(LLMPriority.BATCH):
+            all_results = await asyncio.wait_for(
+                asyncio.gather(*all_tasks, return_exceptions=False),
+                timeout=total_timeout,
+            )
         logger.info("All tasks completed successfully")
     except asyncio.TimeoutError as te:
         logger.error(f"TIMEOUT during parallel execution after {total_timeout}s")
@@ -214,7 +225,7 @@ async def generate_deepcourse(synthesis: dict) -> GenerativeToolOutput:
 
     # Storage
 
-    if user_id := get_user_id():
+    if user_id:
         try:
             # Create sessions and map IDs for each chapter
             dict_session: List[Dict[str, str]] = []
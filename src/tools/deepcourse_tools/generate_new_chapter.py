@@ -9,10 +9,8 @@ import logging
 from typing import Any, Dict, List, cast
 from uuid import uuid4
 
-from google.adk.sessions.database_session_service import DatabaseSessionService
-
-from src.bdd import DBManager
-from src.config import app_settings, database_settings, gemini_settings
+from src.bdd import DBManager, get_session_service
+from src.config import app_settings, gemini_settings
 from src.models import (
     Chapter,
     ChapterSynthesis,
@@ -21,7 +19,7 @@ from src.models import (
     GenerativeToolOutput,
 )
 from src.prompts import SYSTEM_PROMPT_GENERATE_NEW_CHAPTER
-from src.utils import get_deep_course_id, get_user_id
+from src.utils import get_deep_course_id, get_llm_scheduler, get_user_id
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +43,7 @@ async def generate_new_chapter(description_user: str) -> GenerativeToolOutput:
     deepcourse_id = get_deep_course_id()
     user_id = get_user_id()
 
-    db_session_service = DatabaseSessionService(
-        db_url=database_settings.dsn,
-    )
+    db_session_service = get_session_service()
 
     db_manager = DBManager()
 
@@ -88,7 +84,7 @@ async def generate_new_chapter(description_user: str) -> GenerativeToolOutput:
 
     # Call Gemini to generate chapter synthesis
     try:
-        response = await gemini_settings.CLIENT.aio.models.generate_content(
+        response = await get_llm_scheduler().generate_content(
             model=gemini_settings.GEMINI_MODEL_2_5_FLASH,
             contents=f"{SYSTEM_PROMPT_GENERATE_NEW_CHAPTER}\n{context_text}\nDescription de la demande utilisateur : {description_user}",
             config={
@@ -2,17 +2,22 @@
 
 Generates exercises using a planning phase followed by parallel generation
 with comprehensive error handling and retry logic.
+
+In progressive mode (EXERCISES_PROGRESSIVE, agent calls only), the document
+is stored right after planning and each exercise block is appended as soon
+as it is generated, so /api/fetchexercise shows the first questions while
+the others are still being written. Each append refreshes the document's
+updated_at, which /api/fetchexercise uses to report a generation abandoned
+by a crash as failed.
 """
 
 import asyncio
 import logging
-from typing import Union
+from typing import Any, Dict, Optional, Union
 from uuid import uuid4
 
-from google.adk.sessions.database_session_service import DatabaseSessionService
-
-from src.bdd import DBManager
-from src.config import app_settings, database_settings
+from src.bdd import DBManager, get_session_service
+from src.config import app_settings
 from src.models import (
     ExerciseOutput,
     ExercisePlan,
@@ -20,12 +25,61 @@ from src.models import (
     GenerativeToolOutput,
 )
 from src.utils import generate_for_topic, get_user_id, planner_exercises_async
+from src.utils.background import spawn_background
 from src.utils.timing import Timer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _exercise_block(result: Any) -> Optional[Dict[str, Any]]:
+    """Return a generated exercise block as a dict, or None if unusable."""
+    if result is None:
+        return None
+    # Ignore empty dictionaries
+    if isinstance(result, dict):
+        if not result or "type" not in result:
+            return None
+        return result
+    if hasattr(result, "model_dump"):
+        return result.model_dump()
+    return result
+
+
+async def _append_exercises_progressively(
+    bdd_manager: DBManager, document_id: str, plan: ExercisePlan, difficulty: str
+) -> None:
+    """Generate the planned exercises and append each block as it completes."""
+    tasks = [
+        asyncio.create_task(generate_for_topic(ex, difficulty))
+        for ex in plan.exercises
+    ]
+    generated = 0
+    finished = False
+
+    try:
+        with Timer(f"├─ Progressive generation ({len(tasks)} exercises)"):
+            for next_done in asyncio.as_completed(tasks):
+                exercise = _exercise_block(await next_done)
+                if exercise is None:
+                    logger.warning("Exercise block unusable, skipped")
+                    continue
+                await bdd_manager.append_exercise(document_id, exercise)
+                generated += 1
+        finished = True
+    finally:
+        # On cancellation (or a failed append) the other generations are orphans
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Stopped early (error, cancellation): exercises are missing
+        status = "completed" if finished and generated else "failed"
+        logger.info(
+            f"{generated}/{len(tasks)} exercises appended to {document_id} ({status})"
+        )
+        await bdd_manager.set_document_status(document_id, status)
+
+
 async def generate_exercises(
     is_called_by_agent: bool, synthesis: ExerciseSynthesis
 ) -> Union[GenerativeToolOutput, ExerciseOutput]:
@@ -35,6 +89,8 @@ async def generate_exercises(
     1. Valider l'ExerciseSynthesis
     2. Appeler le planificateur d'exercices avec une logique de nouvelle tentative (max 3 tentatives avec un backoff exponentiel)
     3. Générer tous les exercices en parallèle en utilisant generate_for_topic
+       (en mode progressif : stocker le document vide puis ajouter chaque bloc
+       dès qu'il est prêt, en arrière-plan)
     4. Filtrer et valider les résultats
     5. Stocker dans la base de données si appelé par l'agent
     6. Retourner ExerciseOutput avec tous les exercices générés
@@ -47,9 +103,7 @@ async def generate_exercises(
         ExerciseOutput avec tous les exercices si non appelé par l'agent,
         GenerativeToolOutput si appelé par l'agent
     """
-    db_session_service = DatabaseSessionService(
-        db_url=database_settings.dsn,
-    )
+    db_session_service = get_session_service()
     bdd_manager = DBManager()
 
     agent = "exercise"
@@ -125,6 +179,42 @@ async def generate_exercises(
                 agent=agent, redirect_id=redirect_id, completed=completed
             )
 
+        # Progressive mode: store the empty document now, fill it in the background
+        if is_called_by_agent and app_settings.EXERCISES_PROGRESSIVE:
+            user_id = get_user_id()
+            if not user_id:
+                return GenerativeToolOutput(
+                    agent=agent, redirect_id=redirect_id, completed=completed
+                )
+
+            copilote_session_id = str(uuid4())
+            await db_session_service.create_session(
+                session_id=copilote_session_id,
+                app_name=app_settings.APP_NAME,
+                user_id=user_id,
+            )
+            exercise_output = ExerciseOutput(
+                id=str(uuid4()),
+                exercises=[],
+                title=synthesis.title,
+                status="generating",
+                expected_exercises=len(plan.exercises),
+            )
+            await bdd_manager.store_basic_document(
+                content=exercise_output,
+                session_id=copilote_session_id,
+                sub=user_id,
+            )
+            spawn_background(
+                _append_exercises_progressively(
+                    bdd_manager, exercise_output.id, plan, synthesis.difficulty
+                ),
+                name=f"exercises-{exercise_output.id}",
+            )
+            return GenerativeToolOutput(
+                agent=agent, redirect_id=copilote_session_id, completed=True
+            )
+
         # Create tasks for all exercises in plan
         tasks = [
             generate_for_topic(ex, synthesis.difficulty) for ex in plan.exercises
@@ -137,24 +227,13 @@ async def generate_exercises(
         # Filter and convert valid results
         generated_exercises = []
         for idx, r in enumerate(results):
-            if r is None:
+            exercise = _exercise_block(r)
+            if exercise is None:
                 logger.warning(
-                    f"Exercise {idx + 1}/{len(results)} is None, skipped"
+                    f"Exercise {idx + 1}/{len(results)} is None, empty or missing 'type', skipped"
                 )
                 continue
-
-            # Ignore empty dictionaries
-            if isinstance(r, dict):
-                if not r or "type" not in r:
-                    logger.warning(
-                        f"Exercise {idx + 1}/{len(results)} is empty dict or missing 'type', skipped"
-                    )
-                    continue
-                generated_exercises.append(r)
-            elif hasattr(r, "model_dump"):
-                generated_exercises.append(r.model_dump())
-            else:
-                generated_exercises.append(r)
+            generated_exercises.append(exercise)
 
         # Verify at least one valid exercise remains
         if not generated_exercises:
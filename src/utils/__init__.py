@@ -8,11 +8,13 @@ This package provides core utilities for:
 """
 
 from .context_builder import final_context_builder
-from .correct_plain_question import agent_correct_plain_question
+from .correct_plain_question import (
+    agent_correct_plain_question,
+    correct_plain_questions,
+)
 from .cours_utils_quad_llm_integration import generate_courses_quad_llm
 from .cours_utils_v2 import (
     generate_all_schemas,
-    generate_complete_course,
     generate_schema_mermaid,
 )
 from .exercises_utils import (
@@ -22,6 +24,8 @@ from .exercises_utils import (
     planner_exercises_async,
 )
 from .get_db_url import create_db_pool, get_connection
+from .llm_cache import get_llm_cache
+from .llm_scheduler import LLMPriority, get_llm_scheduler, llm_priority
 from .mermaid_validator import MermaidValidator
 from .request_context import (
     get_deep_course_id,
@@ -34,10 +38,10 @@ from .save_files import save_course_as_pdf
 
 __all__ = [
     "agent_correct_plain_question",
+    "correct_plain_questions",
     "create_db_pool",
     "final_context_builder",
     "generate_all_schemas",
-    "generate_complete_course",
     "generate_courses_quad_llm",
     "generate_for_topic",
     "generate_plain",
@@ -45,9 +49,13 @@ __all__ = [
     "generate_schema_mermaid",
     "get_connection",
     "get_deep_course_id",
+    "get_llm_cache",
+    "get_llm_scheduler",
     "get_document_id",
     "get_session_id",
     "get_user_id",
+    "LLMPriority",
+    "llm_priority",
     "MermaidValidator",
     "planner_exercises_async",
     "save_course_as_pdf",
@@ -0,0 +1,63 @@
+"""
+Fire-and-forget tasks that outlive the request that started them.
+
+The event loop only keeps weak references to tasks, so a task created with
+`asyncio.create_task` and not stored may be garbage-collected mid-run.
+`spawn_background` keeps a strong reference until the task finishes and logs
+its failure; `drain_background_tasks` lets the lifespan wait for running work
+on shutdown.
+"""
+
+import asyncio
+import logging
+from typing import Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+_tasks: Set[asyncio.Task] = set()
+
+
+def _on_done(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if task.cancelled():
+        logger.warning(f"[BACKGROUND] {task.get_name()} cancelled")
+    elif task.exception() is not None:
+        logger.error(
+            f"[BACKGROUND] {task.get_name()} failed",
+            exc_info=task.exception(),
+        )
+
+
+def spawn_background(coro: Coroutine, name: str) -> asyncio.Task:
+    """
+    Run a coroutine in the background (it inherits the current context).
+
+    Args:
+        coro: Coroutine to run
+        name: Task name used in logs
+
+    Returns:
+        The created task
+    """
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+async def drain_background_tasks(timeout: float) -> None:
+    """
+    Wait for running background tasks, cancelling those still running after `timeout`.
+
+    Args:
+        timeout: Seconds to wait before cancelling
+    """
+    if not _tasks:
+        return
+
+    logger.info(f"Waiting for {len(_tasks)} background task(s)...")
+    _, pending = await asyncio.wait(set(_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -2,23 +2,35 @@
 Plain text question correction agent.
 
 Uses Gemini API to evaluate user responses against expected answers
-for open-ended questions.
+for open-ended questions, one at a time or as a batch.
 """
 
+import asyncio
 import logging
+from typing import List, Literal, Sequence, Tuple
+
 from pydantic import BaseModel
 from src.config import gemini_settings
-from src.prompts import SYSTEM_PROMPT_CORRECT_PLAIN_QUESTION
+from src.prompts import (
+    SYSTEM_PROMPT_CORRECT_PLAIN_QUESTION,
+    SYSTEM_PROMPT_CORRECT_PLAIN_QUESTIONS_BATCH,
+)
+from src.utils.llm_cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Gradings of one batch in flight at once (the LLM scheduler caps the total)
+BATCH_GRADING_CONCURRENCY = 8
+
+GradingMode = Literal["concurrent", "single_call"]
+
 class IsCorrectResponse(BaseModel):
     """Response model for answer correctness validation."""
     is_correct: bool
 
 
 async def agent_correct_plain_question(
-    answer: str, question: str, response: str
+    answer: str, question: str, response: str, use_cache: bool = True
 ) -> bool:
     """
     Evaluate if user answer is correct for an open-ended question.
@@ -30,6 +42,7 @@ async def agent_correct_plain_question(
         answer: User's submitted answer
         question: Original question text
         response: Expected/correct answer
+        use_cache: Serve identical gradings from the LLM response cache
 
     Returns:
         True if answer is correct, False otherwise
@@ -41,7 +54,7 @@ async def agent_correct_plain_question(
     )
 
     try:
-        api_response = await gemini_settings.CLIENT.aio.models.generate_content(
+        api_response = await get_llm_cache().generate_content(
             model=gemini_settings.GEMINI_MODEL_2_5_FLASH_LITE,
             contents=prompt,
             config={
@@ -49,6 +62,7 @@ async def agent_correct_plain_question(
                 "response_mime_type": "application/json",
                 "response_schema": IsCorrectResponse,
             },
+            use_cache=use_cache,
         )
 
         parsed = api_response.parsed
@@ -61,3 +75,89 @@ async def agent_correct_plain_question(
     except Exception as err:
         logger.error(f"Parse error: {err}")
         return False
+
+
+async def _correct_concurrently(
+    questions: Sequence[Tuple[str, str, str]], use_cache: bool
+) -> List[bool]:
+    """Grade each question with its own call, BATCH_GRADING_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(BATCH_GRADING_CONCURRENCY)
+
+    async def correct(question: str, expected: str, answer: str) -> bool:
+        async with semaphore:
+            return await agent_correct_plain_question(
+                answer=answer, question=question, response=expected, use_cache=use_cache
+            )
+
+    return list(await asyncio.gather(*(correct(*q) for q in questions)))
+
+
+async def _correct_in_one_call(
+    questions: Sequence[Tuple[str, str, str]], use_cache: bool
+) -> List[bool]:
+    """
+    Grade every question with a single structured call.
+
+    Raises:
+        ValueError: If the response does not hold one result per question
+    """
+    prompt = "\n\n".join(
+        f"### Question {i}\n"
+        f"Question: {question}\n"
+        f"Expected answer: {expected}\n"
+        f"User answer: {answer}"
+        for i, (question, expected, answer) in enumerate(questions, 1)
+    )
+
+    api_response = await get_llm_cache().generate_content(
+        model=gemini_settings.GEMINI_MODEL_2_5_FLASH_LITE,
+        contents=prompt,
+        config={
+            "system_instruction": SYSTEM_PROMPT_CORRECT_PLAIN_QUESTIONS_BATCH,
+            "response_mime_type": "application/json",
+            "response_schema": list[IsCorrectResponse],
+        },
+        use_cache=use_cache,
+        validate=lambda parsed: isinstance(parsed, list) and len(parsed) == len(questions),
+    )
+
+    parsed = api_response.parsed
+    if not isinstance(parsed, list) or len(parsed) != len(questions):
+        raise ValueError(
+            f"Expected {len(questions)} results, got "
+            f"{len(parsed) if isinstance(parsed, list) else type(parsed).__name__}"
+        )
+    return [item.is_correct for item in parsed]
+
+
+async def correct_plain_questions(
+    questions: Sequence[Tuple[str, str, str]],
+    mode: GradingMode = "concurrent",
+    use_cache: bool = True,
+) -> List[bool]:
+    """
+    Evaluate several open-ended answers at once.
+
+    Args:
+        questions: (question, expected answer, user answer) triples
+        mode: "concurrent" runs one call per question under a bound,
+            "single_call" grades all questions in one structured call
+        use_cache: Serve identical gradings from the LLM response cache
+
+    Returns:
+        Correctness of each answer, in input order
+
+    Note:
+        If the single call fails or returns the wrong number of results,
+        the batch is graded concurrently instead.
+    """
+    if not questions:
+        return []
+
+    if mode == "single_call":
+        try:
+            return await _correct_in_one_call(questions, use_cache)
+        except Exception as err:
+            logger.warning(f"Batch grading failed, grading one by one: {err}")
+
+    return await _correct_concurrently(questions, use_cache)
@@ -3,26 +3,32 @@
 Workflow:
 1. LLM #1: Generate course content + select diagram type
 2. LLM #2 (specialized): Generate diagram code - no retry
-3. Kroki: Convert to PNG - no prior test
+3. Kroki: Convert to PNG or SVG (DIAGRAM_OUTPUT_FORMAT) - no prior test
 4. If error: continue without diagram for that part
 5. Async: Full parallelization of all parts
+
+Two-phase variant: generate_course_text returns the course after LLM #1 and
+backfill_course_diagrams runs steps 2-3 afterwards, part by part.
 """
 
 import asyncio
 import base64
+import gzip
 import logging
-import subprocess
 import sys
-from typing import Any, Dict, Optional, Union, cast
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union, cast
 from uuid import uuid4
 
-from src.config import gemini_settings
-from src.models.cours_models import CourseOutput, CourseSynthesis, Part
+from src.config import diagram_settings, gemini_settings
+from src.models.cours_models import CourseDraft, CourseOutput, CourseSynthesis, Part
 from src.prompts import SYSTEM_PROMPT_GENERATE_COMPLETE_COURSE
 from src.prompts.diagram_agents_prompts import (
     SPECIALIZED_PROMPTS,
     SYSTEM_PROMPTS,
 )
+from src.utils.diagram_cache import get_diagram_cache
+from src.utils.diagram_renderers import render_diagram
+from src.utils.llm_cache import get_llm_cache
 from src.utils.timing import Timer
 
 # Setup logging
@@ -33,19 +39,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+KROKI_DIAGRAM_TYPES = ("mermaid", "plantuml", "graphviz", "vegalite")
+OUTPUT_FORMATS = ("png", "svg")
+
 
 async def generate_course_with_diagram_types_async(
     synthesis: CourseSynthesis,
-) -> Optional[Union[CourseOutput, Dict[str, Any]]]:
+    use_cache: bool = True,
+) -> Optional[Union[CourseDraft, Dict[str, Any]]]:
     """Generate complete course asynchronously with content + recommended diagram type per part.
 
-    Uses Google's async client without blocking thread.
+    Uses Google's async client (through the LLM cache and scheduler) without blocking thread.
 
     Returns:
         Dict with structure: { title, parts: [{ title, content, diagram_type }, ...] }
     """
 
-    response = await gemini_settings.CLIENT.aio.models.generate_content(
+    response = await get_llm_cache().generate_content(
         model=gemini_settings.GEMINI_MODEL_2_5_FLASH,
         contents=f"""Description: {synthesis.description}
 Difficulty: {synthesis.difficulty}
@@ -53,11 +63,12 @@ Detail level: {synthesis.level_detail}""",
         config={
             "system_instruction": SYSTEM_PROMPT_GENERATE_COMPLETE_COURSE,
             "response_mime_type": "application/json",
-            "response_schema": CourseOutput,
+            "response_schema": CourseDraft,
         },
+        use_cache=use_cache,
     )
     try:
-        data = cast(Union[CourseOutput, Dict[str, Any]], response.parsed)
+        data = cast(Union[CourseDraft, Dict[str, Any]], response.parsed)
         if not data:
             logger.error("[LLM #1] response.parsed is None")
             return None
@@ -72,11 +83,13 @@ Detail level: {synthesis.level_detail}""",
 # ============================================================================
 
 
-async def generate_diagram_code(diagram_type: str, content: str) -> Optional[str]:
+async def generate_diagram_code(
+    diagram_type: str, content: str, use_cache: bool = True
+) -> Optional[str]:
     """Generate diagram code - single attempt, no retry.
 
     If fails, continue without diagram for this part.
-    Async version - uses CLIENT.aio without blocking.
+    Async version - goes through the shared LLM cache and scheduler without blocking.
     """
     with Timer(f"Generate {diagram_type} code"):
         try:
@@ -88,13 +101,14 @@ async def generate_diagram_code(diagram_type: str, content: str) -> Optional[str
             base_prompt = SPECIALIZED_PROMPTS[diagram_type]
             full_prompt = base_prompt.replace("%%CONTENT_PLACEHOLDER%%", content[:800])
 
-            # LLM #2: Specialized call with CLIENT.aio (async)
-            response = await gemini_settings.CLIENT.aio.models.generate_content(
+            # LLM #2: Specialized call through the LLM cache (async)
+            response = await get_llm_cache().generate_content(
                 model=gemini_settings.GEMINI_MODEL_2_5_FLASH,
                 contents=full_prompt,
                 config={
                     "system_instruction": SYSTEM_PROMPTS.get(diagram_type, ""),
                 },
+                use_cache=use_cache,
             )
 
             code = (response.text or "").strip()
@@ -120,113 +134,134 @@ async def generate_diagram_code(diagram_type: str, content: str) -> Optional[str
 
 
 # ============================================================================
-# STEP 3: Kroki - Convert to PNG
+# STEP 3: Render to PNG or SVG (local backend or Kroki)
 # ============================================================================
 
 
-def generate_schema_png(diagram_code: str, diagram_type: str) -> Optional[str]:
-    """Send diagram code to Kroki, return PNG as base64."""
-    with Timer(f"Kroki PNG {diagram_type}"):
+async def generate_schema_image(
+    diagram_code: str, diagram_type: str, output_format: str = "png"
+) -> Optional[bytes]:
+    """Render diagram code to PNG or SVG (see src.utils.diagram_renderers)."""
+    with Timer(f"Kroki {output_format.upper()} {diagram_type}"):
         try:
             if not diagram_code or len(diagram_code.strip()) < 5:
                 logger.error(f"[KROKI] Empty or too short code")
                 return None
 
-            kroki_endpoints = {
-                "mermaid": "https://kroki.io/mermaid/png",
-                "plantuml": "https://kroki.io/plantuml/png",
-                "graphviz": "https://kroki.io/graphviz/png",
-                "vegalite": "https://kroki.io/vegalite/png",
-            }
-
-            url = kroki_endpoints.get(diagram_type, "https://kroki.io/mermaid/png")
-
-            cmd = [
-                "curl",
-                "-sS",
-                "-f",
-                "-X",
-                "POST",
-                "-H",
-                "Content-Type: text/plain",
-                url,
-                "--data-binary",
-                "@-",
-            ]
+            if diagram_type not in KROKI_DIAGRAM_TYPES:
+                diagram_type = "mermaid"
 
-            proc = subprocess.run(
-                cmd,
-                input=diagram_code.encode("utf-8"),
-                capture_output=True,
-                check=False,
-                timeout=30,
+            return await get_diagram_cache().get_or_render(
+                diagram_type,
+                diagram_code,
+                output_format,
+                lambda: render_diagram(diagram_type, diagram_code, output_format),
             )
 
-            if proc.returncode != 0:
-                err = proc.stderr.decode("utf-8", errors="ignore")
-                out = proc.stdout.decode("utf-8", errors="ignore")[:200]
-                logger.error(f"[KROKI-ERROR] Exit code {proc.returncode}")
-                logger.error(f"[KROKI-ERROR] stderr: {err or '(empty)'}")
-                logger.error(f"[KROKI-ERROR] stdout: {out or '(empty)'}")
-                return None
-
-            # Success
-            image_b64 = base64.b64encode(proc.stdout).decode("ascii")
-            return image_b64
-
-        except subprocess.TimeoutExpired:
-            logger.error(f"[KROKI-TIMEOUT] Timeout (15s) for {diagram_type}")
-            return None
         except Exception as e:
             logger.error(f"[KROKI-EXCEPTION] Error: {e}")
             return None
 
 
+async def generate_schema_png(diagram_code: str, diagram_type: str) -> Optional[str]:
+    """Render diagram code to PNG, return base64."""
+    png = await generate_schema_image(diagram_code, diagram_type, "png")
+    if png is None:
+        return None
+    return base64.b64encode(png).decode("ascii")
+
+
+def encode_schema_image(
+    image: bytes, output_format: str, gzip_svg: bool
+) -> Tuple[str, str]:
+    """Encode a rendered image for `Part`: returns (img_base64, img_format).
+
+    SVG is optionally gzip-compressed and stored as "svgz".
+    """
+    if output_format == "svg" and gzip_svg:
+        image = gzip.compress(image, compresslevel=9, mtime=0)
+        output_format = "svgz"
+    return base64.b64encode(image).decode("ascii"), output_format
+
+
 # ============================================================================
 # STEP 4: Complete pipeline for one part (async)
 # ============================================================================
 
 
-async def process_course_part(part_data: Dict[str, Any], index: int) -> Optional[Part]:
-    """Process one course part:
-    
-    1. Get diagram type
-    2. Generate diagram code (LLM #2 specialized - single attempt)
-    3. Convert to PNG (Kroki)
-    4. Return complete Part object
-    """
-    try:
-        title = part_data.get("title", f"Part {index}")
-        content = part_data.get("content", "")
-
+def _new_part(part_data: Dict[str, Any], index: int) -> Part:
+    """Build a Part from LLM #1 output, diagram still pending."""
+    return Part(
+        id_part=str(uuid4()),
+        id_schema=str(uuid4()),
+        title=part_data.get("title", f"Part {index}"),
+        content=part_data.get("content", ""),
+        schema_description=part_data.get("schema_description", ""),
         # Step 1: Select type (4 types)
-        diagram_type = part_data.get("diagram_type", "mermaid")
+        diagram_type=part_data.get("diagram_type", "mermaid"),
+        diagram_status="pending",
+    )
 
-        # Step 2: Generate code (specialized) - single attempt async
-        diagram_code = await generate_diagram_code(diagram_type, content)
 
-        if not diagram_code:
-            logger.warning(f"[PART-{index}] Diagram code not generated, PNG skipped")
-            img_base64 = None
+async def render_part_diagram(
+    part: Part,
+    output_format: Optional[str] = None,
+    gzip_svg: Optional[bool] = None,
+) -> Part:
+    """Generate and render the diagram of a part, updating it in place.
+
+    Fills diagram_code, img_base64 and img_format, and sets diagram_status to
+    "done" or "failed". output_format and gzip_svg default to
+    DIAGRAM_OUTPUT_FORMAT and DIAGRAM_SVG_GZIP.
+    """
+    output_format = output_format or diagram_settings.DIAGRAM_OUTPUT_FORMAT
+    if output_format not in OUTPUT_FORMATS:
+        logger.warning(f"[PART] Unknown output format {output_format}, using png")
+        output_format = "png"
+    if gzip_svg is None:
+        gzip_svg = diagram_settings.DIAGRAM_SVG_GZIP
+
+    # Status is only set once rendering is over: "pending" until then
+    status = "failed"
+    try:
+        # Step 2: Generate code (specialized) - single attempt async
+        part.diagram_code = await generate_diagram_code(part.diagram_type, part.content)
+        if not part.diagram_code:
+            logger.warning(f"[PART] {part.title}: diagram code not generated, image skipped")
         else:
-            # Step 3: Generate PNG
-            img_base64 = await asyncio.to_thread(
-                generate_schema_png, diagram_code, diagram_type
+            # Step 3: Generate PNG / SVG
+            image = await generate_schema_image(
+                part.diagram_code, part.diagram_type, output_format
             )
+            if image is not None:
+                part.img_base64, part.img_format = encode_schema_image(
+                    image, output_format, gzip_svg
+                )
+                status = "done"
 
-        # Create Part object with all fields (content + diagram_type + code + PNG)
-        part = Part(
-            id_part=str(uuid4()),
-            id_schema=str(uuid4()),
-            title=title,
-            content=content,
-            schema_description=part_data.get("schema_description", ""),
-            diagram_type=diagram_type,
-            diagram_code=diagram_code,
-            img_base64=img_base64,
-        )
+    except Exception as e:
+        logger.error(f"[PART] {part.title}: diagram error: {e}", exc_info=True)
+
+    part.diagram_status = status
+    return part
 
-        return part
+
+async def process_course_part(
+    part_data: Dict[str, Any],
+    index: int,
+    output_format: Optional[str] = None,
+    gzip_svg: Optional[bool] = None,
+) -> Optional[Part]:
+    """Process one course part:
+
+    1. Get diagram type
+    2. Generate diagram code (LLM #2 specialized - single attempt)
+    3. Convert to PNG or SVG (Kroki), SVG optionally gzip-compressed
+    4. Return complete Part object
+    """
+    try:
+        part = _new_part(part_data, index)
+        return await render_part_diagram(part, output_format, gzip_svg)
 
     except Exception as e:
         logger.error(f"[PART-{index}] Error: {e}", exc_info=True)
@@ -240,16 +275,17 @@ async def process_course_part(part_data: Dict[str, Any], index: int) -> Optional
 
 async def generate_course_complete(
     synthesis: CourseSynthesis,
+    output_format: Optional[str] = None,
 ) -> Optional[CourseOutput]:
     """Complete DUAL LLM v2 pipeline - single attempt:
 
     1. LLM #1: Generate content + diagram type
     2. In PARALLEL for each part:
        a. LLM #2 (specialized): Diagram code - single attempt
-       b. Kroki: Convert to PNG
+       b. Kroki: Convert to PNG or SVG (output_format, default DIAGRAM_OUTPUT_FORMAT)
     3. Return complete CourseOutput
 
-    Result: { title, id, parts: [{ title, id, content, img_base64 }] }
+    Result: { title, id, parts: [{ title, id, content, img_base64, img_format }] }
     """
     with Timer("TOTAL Complete course"):
         try:
@@ -260,14 +296,14 @@ async def generate_course_complete(
                 logger.error("[PIPELINE] LLM #1 failed")
                 return None
 
-            if isinstance(course_data, CourseOutput):
+            if isinstance(course_data, CourseDraft):
                 parts_data = [p.model_dump() for p in course_data.parts]
             else:
                 parts_data = course_data.get("parts", [])
 
             # Create async tasks for ALL parts IN PARALLEL
             tasks = [
-                process_course_part(part_data, i)
+                process_course_part(part_data, i, output_format)
                 for i, part_data in enumerate(parts_data, 1)
             ]
 
@@ -285,7 +321,7 @@ async def generate_course_complete(
                 id=str(uuid4()),
                 title=(
                     course_data.title
-                    if isinstance(course_data, CourseOutput)
+                    if isinstance(course_data, CourseDraft)
                     else course_data.get("title", "Cours")
                 ),
                 parts=parts,
@@ -296,3 +332,70 @@ async def generate_course_complete(
         except Exception as e:
             logger.error(f"[PIPELINE] Fatal error: {e}", exc_info=True)
             return None
+
+
+# ============================================================================
+# TWO-PHASE PIPELINE - Text first, diagrams backfilled
+# ============================================================================
+
+
+async def generate_course_text(synthesis: CourseSynthesis) -> Optional[CourseOutput]:
+    """Phase 1: LLM #1 only.
+
+    Returns the course with every part's diagram_status "pending", ready to be
+    stored and shown while backfill_course_diagrams renders the diagrams.
+    """
+    with Timer("Course text (LLM #1)"):
+        try:
+            course_data = await generate_course_with_diagram_types_async(synthesis)
+
+            if not course_data:
+                logger.error("[PIPELINE] LLM #1 failed")
+                return None
+
+            if isinstance(course_data, CourseDraft):
+                title = course_data.title
+                parts_data = [p.model_dump() for p in course_data.parts]
+            else:
+                title = course_data.get("title", "Cours")
+                parts_data = course_data.get("parts", [])
+
+            if not parts_data:
+                logger.error("[PIPELINE] No parts generated")
+                return None
+
+            return CourseOutput(
+                id=str(uuid4()),
+                title=title,
+                parts=[_new_part(p, i) for i, p in enumerate(parts_data, 1)],
+            )
+
+        except Exception as e:
+            logger.error(f"[PIPELINE] Fatal error: {e}", exc_info=True)
+            return None
+
+
+async def backfill_course_diagrams(
+    course: CourseOutput,
+    on_part: Callable[[Part], Awaitable[None]],
+    output_format: Optional[str] = None,
+) -> None:
+    """Phase 2: render the pending diagrams of a course in parallel.
+
+    `on_part` is awaited with each part as soon as its diagram is done (or
+    failed), in completion order, e.g. to patch the stored document. If it
+    raises, the renders still running are cancelled before re-raising.
+    """
+    pending = [p for p in course.parts if p.diagram_status == "pending"]
+
+    with Timer(f"Course diagrams backfill ({len(pending)} parts)"):
+        tasks = [
+            asyncio.create_task(render_part_diagram(p, output_format)) for p in pending
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                await on_part(await next_done)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
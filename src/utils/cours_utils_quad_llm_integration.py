@@ -7,7 +7,7 @@ Pipeline architecture:
 1. LLM #1: Generates markdown content + selects diagram type (4 types)
    for ALL course parts at once
 2. LLM #2 (specialized) IN PARALLEL: Generates diagram code with up to 3 retries
-3. Kroki IN PARALLEL: Converts code to PNG base64
+3. Kroki IN PARALLEL: Converts code to PNG or SVG (base64, SVG optionally gzipped)
 4. CourseOutput: Returns complete course with content, diagram_type, diagram_code, img_base64
 """
 
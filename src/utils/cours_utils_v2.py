@@ -1,38 +1,30 @@
 """
-Course generation utilities with integrated Mermaid diagrams.
+Mermaid diagram utilities for courses.
 
-Optimized architecture: single LLM call generates complete course content
-with Mermaid schemas in one pass, then generates diagrams asynchronously.
+Renders the Mermaid schemas of an existing course in parallel. Course text
+is generated by `cours_utils_quad_llm`, through the LLM scheduler.
 """
 
 import asyncio
 import base64
-import hashlib
 import logging
-import os
-import subprocess
 import sys
 from typing import Any, Dict, Optional
-from uuid import uuid4
-
-from src.config import gemini_settings
-from src.models.cours_models import (
-    CourseOutput,
-    CourseSynthesis,
-    Part,
-)
-from src.prompts import SYSTEM_PROMPT_GENERATE_COMPLETE_COURSE
+
+from src.models.cours_models import CourseOutput, Part
+from src.utils.diagram_cache import get_diagram_cache
+from src.utils.diagram_renderers import render_diagram
 from src.utils.mermaid_validator import MermaidValidator
 
 logger = logging.getLogger(__name__)
 
 
-def generate_schema_mermaid(mermaid_code: str) -> Optional[str]:
+async def generate_schema_mermaid(mermaid_code: str) -> Optional[str]:
     """
     Send Mermaid code to Kroki API, retrieve PNG and return as base64.
 
-    Validates Mermaid syntax before sending, sanitizes code, and handles
-    temporary file cleanup automatically.
+    Validates Mermaid syntax before sending and sanitizes code. The PNG is
+    encoded straight from the response body, without a temporary file.
 
     Args:
         mermaid_code: Validated Mermaid code
@@ -51,133 +43,31 @@ def generate_schema_mermaid(mermaid_code: str) -> Optional[str]:
             return None
 
         mermaid_code = MermaidValidator.sanitize(mermaid_code)
-        digest = hashlib.sha256(mermaid_code.encode("utf-8")).hexdigest()[:16]
-        out_path = os.path.join(".", f"mermaid_{digest}.png")
-
-        cmd = [
-            "curl",
-            "-sS",
-            "-f",
-            "-X",
-            "POST",
-            "-H",
-            "Content-Type: text/plain",
-            "https://kroki.io/mermaid/png",
-            "--data-binary",
-            "@-",
-        ]
-
-        proc = subprocess.run(
-            cmd,
-            input=mermaid_code.encode("utf-8"),
-            capture_output=True,
-            check=False,
-            timeout=10,
-        )
 
-        logger.debug(f"[KROKI-RESPONSE] Return code: {proc.returncode}")
-
-        if proc.returncode != 0:
-            err = proc.stderr.decode("utf-8", errors="ignore")
-            logger.error(f"[KROKI-ERROR] Kroki error (exit {proc.returncode}): {err or 'unknown'}")
+        png = await get_diagram_cache().get_or_render(
+            "mermaid",
+            mermaid_code,
+            "png",
+            lambda: render_diagram("mermaid", mermaid_code, "png"),
+        )
+        if png is None:
             return None
 
-        try:
-            with open(out_path, "wb") as f:
-                f.write(proc.stdout)
+        return base64.b64encode(png).decode("ascii")
 
-            with open(out_path, "rb") as f:
-                image_b64 = base64.b64encode(f.read()).decode("ascii")
-
-            return image_b64
-
-        finally:
-            try:
-                os.remove(out_path)
-            except Exception as e:
-                logger.warning(f"[KROKI-CLEANUP] Could not remove {out_path}: {e}")
-
-    except subprocess.TimeoutExpired:
-        logger.error("[KROKI-TIMEOUT] Timeout (10s) on Kroki call")
-        return None
     except Exception as e:
         logger.error(f"[KROKI-EXCEPTION] Error: {e}", exc_info=True)
         return None
 
 
-def generate_complete_course(
-    synthesis: CourseSynthesis,
-) -> Optional[CourseOutput]:
-    """
-    Generate complete course with content and Mermaid diagrams in single LLM call.
-
-    Calls Gemini once to generate all course parts with diagram specifications,
-    then generates diagrams asynchronously.
-
-    Args:
-        synthesis: CourseSynthesis with description, difficulty, detail level
-
-    Returns:
-        Generated CourseOutput with all parts and Mermaid schemas, or None on failure
-    """
-    try:
-        if isinstance(synthesis, dict):
-            synthesis = CourseSynthesis.model_validate(synthesis)
-
-        try:
-            response = gemini_settings.CLIENT.models.generate_content(
-                model=gemini_settings.GEMINI_MODEL_2_5_FLASH,
-                contents=f"""
-                        Description: {synthesis.description}
-                        Difficulté: {synthesis.difficulty}
-                        Niveau de détail: {synthesis.level_detail}
-                    """,
-                config={
-                    "system_instruction": SYSTEM_PROMPT_GENERATE_COMPLETE_COURSE,
-                    "response_mime_type": "application/json",
-                    "response_schema": CourseOutput,
-                },
-            )
-        except Exception as gemini_err:
-            logger.error(f"[LLM-GEMINI-ERROR] Gemini API error: {gemini_err}", exc_info=True)
-            raise
-
-        course_output = (
-            response.parsed if hasattr(response, "parsed") else response.text
-        )
-
-        if isinstance(course_output, str):
-            course_output = CourseOutput.model_validate_json(course_output)
-        elif isinstance(course_output, dict):
-            course_output = CourseOutput.model_validate(course_output)
-
-        if not isinstance(course_output, CourseOutput):
-            raise ValueError(f"Invalid response type: {type(course_output)}")
-
-        if not course_output.id:
-            course_output.id = str(uuid4())
-
-        for part in course_output.parts:
-            if not part.id_part:
-                part.id_part = str(uuid4())
-            if not part.id_schema:
-                part.id_schema = str(uuid4())
-
-        return course_output
-
-    except Exception as e:
-        logger.error(f"[LLM-ERROR] Fatal error: {e}", exc_info=True)
-        return None
-
-
 async def generate_all_schemas(
     course_output: CourseOutput,
 ) -> CourseOutput:
     """
     Generate all Mermaid diagrams in parallel.
 
-    Asynchronously generates diagrams for all course parts using thread pool
-    to avoid blocking the event loop.
+    Asynchronously generates diagrams for all course parts through the shared
+    Kroki client.
 
     Args:
         course_output: Course with Mermaid code (text) to generate from
@@ -191,7 +81,7 @@ async def generate_all_schemas(
         for i, part in enumerate(course_output.parts):
             if hasattr(part, 'content') and part.content:
                 logger.debug(f"[ASYNC-TASK-{i}] Creating task for: {part.title[:30]}")
-                task = asyncio.to_thread(generate_schema_mermaid, part.content)
+                task = generate_schema_mermaid(part.content)
                 tasks.append((i, part, task))
 
         if tasks:
@@ -220,7 +110,7 @@ async def generate_all_schemas(
 
 def generate_part(title: str, content: str, difficulty: str) -> Dict[str, Any]:
     """
-    DEPRECATED: Use generate_complete_course() instead.
+    DEPRECATED: Use cours_utils_quad_llm.generate_course_complete() instead.
 
     Legacy function kept for backward compatibility.
 
@@ -232,13 +122,13 @@ def generate_part(title: str, content: str, difficulty: str) -> Dict[str, Any]:
     Returns:
         Empty dict (deprecated)
     """
-    logger.warning("generate_part() is deprecated. Use generate_complete_course() instead.")
+    logger.warning("generate_part() is deprecated. Use cours_utils_quad_llm.generate_course_complete() instead.")
     return {}
 
 
 def generate_mermaid_schema_description(course_part: Any) -> Optional[Dict[str, Any]]:
     """
-    DEPRECATED: Use generate_complete_course() instead.
+    DEPRECATED: Use cours_utils_quad_llm.generate_course_complete() instead.
 
     Legacy function kept for backward compatibility.
 
@@ -249,7 +139,7 @@ def generate_mermaid_schema_description(course_part: Any) -> Optional[Dict[str,
         None (deprecated)
     """
     logger.warning(
-        "generate_mermaid_schema_description() is deprecated. Use generate_complete_course() instead."
+        "generate_mermaid_schema_description() is deprecated. Use cours_utils_quad_llm.generate_course_complete() instead."
     )
     return None
 
@@ -0,0 +1,222 @@
+"""
+Whole deep course export, streamed to the client.
+
+Each chapter (course, exercises, evaluation) is rendered to its own PDF
+file by the PDF pool, its diagrams passed as files. At most PDF_WORKERS
+chapters are loaded and rendered at a time, so memory is bounded per
+chapter, not per deep course, and files are sent in chunks from disk:
+
+- "zip": one PDF per chapter, streamed as soon as each chapter is ready
+  (chapters in plan order, while later ones are still rendering),
+- "pdf": a single document, chapter PDFs concatenated in a worker process,
+  then streamed.
+
+Usage:
+    chunks = stream_deepcourse_export(chapters, db_manager, "zip")
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Protocol, Tuple
+
+from src.bdd.assets import write_course_assets
+from src.config import export_settings
+from src.models import CourseOutput, ExerciseOutput
+from src.utils.pdf_pool import PDFRenderBusy, get_pdf_pool
+from src.utils.save_files import chapter_pdf_file, merge_pdf_files, sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {"zip": "application/zip", "pdf": "application/pdf"}
+
+
+class ChapterSource(Protocol):
+    """What the export needs from DBManager."""
+
+    async def fetch_chapter_contents(self, chapter_id: str) -> Dict[str, Any]: ...
+
+    async def fetch_assets(self, hashes: List[str]) -> List[Dict[str, Any]]: ...
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file object collecting what zipfile writes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _load(contenu: Any) -> Any:
+    return json.loads(contenu) if isinstance(contenu, str) else contenu
+
+
+async def _run_in_pool(fn, *args):
+    """Run in the PDF pool, waiting instead of failing when its queue is full."""
+    while True:
+        try:
+            return await get_pdf_pool().run(fn, *args)
+        except PDFRenderBusy as e:
+            await asyncio.sleep(e.retry_after)
+
+
+async def _render_chapter(
+    chapter: Dict[str, Any], source: ChapterSource, output_pdf_path: str
+) -> str:
+    """Load one chapter's documents and render them to `output_pdf_path`."""
+    contents = await source.fetch_chapter_contents(chapter["chapter_id"])
+
+    course = (
+        CourseOutput.model_validate(_load(contents["course"]))
+        if "course" in contents
+        else None
+    )
+    exercise = (
+        ExerciseOutput.model_validate(_load(contents["exercise"]))
+        if "exercise" in contents
+        else None
+    )
+    evaluation = (
+        ExerciseOutput.model_validate(_load(contents["eval"]))
+        if "eval" in contents
+        else None
+    )
+
+    # Diagrams go to the renderer as files, not base64 in the course
+    with tempfile.TemporaryDirectory(
+        prefix="assets_", dir=os.path.dirname(output_pdf_path)
+    ) as assets_dir:
+        image_files = (
+            await write_course_assets(course, source, assets_dir) if course else {}
+        )
+        return await _run_in_pool(
+            chapter_pdf_file,
+            chapter["title"],
+            course,
+            exercise,
+            evaluation,
+            output_pdf_path,
+            image_files,
+        )
+
+
+async def _rendered_chapters(
+    chapters: List[Dict[str, Any]], source: ChapterSource, workdir: str
+) -> AsyncIterator[Tuple[int, Dict[str, Any], Optional[str], Optional[str]]]:
+    """
+    Render chapters with a bounded look-ahead, yielding them in order.
+
+    Yields:
+        (index, chapter, pdf_path or None, error or None)
+    """
+    window = max(export_settings.PDF_WORKERS, 1)
+    pending: Deque[Tuple[int, Dict[str, Any], asyncio.Task]] = deque()
+    upcoming = iter(enumerate(chapters, 1))
+
+    def schedule() -> None:
+        for idx, chapter in upcoming:
+            path = os.path.join(workdir, f"{idx:03d}.pdf")
+            task = asyncio.create_task(_render_chapter(chapter, source, path))
+            pending.append((idx, chapter, task))
+            if len(pending) >= window:
+                return
+
+    schedule()
+    try:
+        while pending:
+            idx, chapter, task = pending.popleft()
+            try:
+                path, error = await task, None
+            except Exception as e:
+                logger.error(f"[EXPORT] Chapter {idx} ({chapter['title']}) failed: {e}")
+                path, error = None, str(e) or type(e).__name__
+            schedule()
+            yield idx, chapter, path, error
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+
+
+def _read_chunks(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def _stream_zip(
+    chapters: List[Dict[str, Any]], source: ChapterSource, workdir: str
+) -> AsyncIterator[bytes]:
+    sink = _ChunkSink()
+    # PDFs are already compressed
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)
+    async for idx, chapter, path, error in _rendered_chapters(chapters, source, workdir):
+        name = f"{idx:02d} - {sanitize_filename(chapter['title'])}"
+        if path is None:
+            archive.writestr(f"{name}.error.txt", f"Export failed: {error}\n")
+        else:
+            with archive.open(f"{name}.pdf", "w", force_zip64=True) as entry:
+                for chunk in _read_chunks(path):
+                    entry.write(chunk)
+                    yield sink.drain()
+            os.unlink(path)
+        yield sink.drain()
+    archive.close()
+    yield sink.drain()
+
+
+async def _stream_pdf(
+    chapters: List[Dict[str, Any]], source: ChapterSource, workdir: str
+) -> AsyncIterator[bytes]:
+    paths = []
+    async for _, _, path, _ in _rendered_chapters(chapters, source, workdir):
+        if path is not None:
+            paths.append(path)
+    if not paths:
+        raise RuntimeError("No chapter could be exported")
+
+    merged = await _run_in_pool(
+        merge_pdf_files, paths, os.path.join(workdir, "deepcourse.pdf")
+    )
+    for path in paths:
+        os.unlink(path)
+    for chunk in _read_chunks(merged):
+        yield chunk
+
+
+async def stream_deepcourse_export(
+    chapters: List[Dict[str, Any]], source: ChapterSource, export_format: str = "zip"
+) -> AsyncIterator[bytes]:
+    """
+    Stream a deep course export.
+
+    Args:
+        chapters: Chapters ({chapter_id, title}) in export order
+        source: DBManager (chapter documents and diagram assets)
+        export_format: "zip" (one PDF per chapter) or "pdf" (single document)
+
+    Yields:
+        Chunks of the ZIP archive or PDF document
+    """
+    stream = _stream_zip if export_format == "zip" else _stream_pdf
+    with tempfile.TemporaryDirectory(prefix="deepcourse_export_") as workdir:
+        async for chunk in stream(chapters, source, workdir):
+            if chunk:
+                yield chunk
@@ -0,0 +1,160 @@
+"""
+Two-tier render cache for diagrams.
+
+Identical Mermaid/PlantUML/Graphviz/Vega-Lite sources used to be re-rendered
+by Kroki every time (regenerated deep courses, added chapters). Renders are
+now keyed on (diagram type, output format, hash of the normalized source):
+
+1. an in-process LRU bounded to DIAGRAM_CACHE_MAX_MB,
+2. a persistent tier in Postgres: the image is stored in the content-addressed
+   `asset` table and `diagram_render` maps the cache key to it.
+
+Concurrent requests for the same key share one render. Hit/miss counters are
+exposed by `stats()` (see `/api/health/metrics`).
+"""
+
+import hashlib
+import logging
+from typing import Awaitable, Callable, Optional
+
+from src.bdd.engine import get_engine
+from src.bdd.query import FETCH_DIAGRAM_RENDER, STORE_ASSET, STORE_DIAGRAM_RENDER
+from src.config import diagram_settings
+from src.utils.two_tier_cache import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def normalize_diagram_code(code: str) -> str:
+    """Normalize line endings, trailing whitespace and blank lines."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines if line.strip())
+
+
+def diagram_cache_key(diagram_type: str, code: str, output_format: str = "png") -> str:
+    """Cache key of a render: SHA-256 over type, format and normalized source."""
+    normalized = normalize_diagram_code(code)
+    return hashlib.sha256(
+        f"{diagram_type}\n{output_format}\n{normalized}".encode("utf-8")
+    ).hexdigest()
+
+
+class DiagramRenderCache(TwoTierCache):
+    """In-process LRU in front of a Postgres-backed render store."""
+
+    async def _load(self, key: str) -> Optional[bytes]:
+        async with get_engine().connect() as conn:
+            result = await conn.execute(FETCH_DIAGRAM_RENDER, {"cache_key": key})
+            row = result.fetchone()
+        return bytes(row.data) if row else None
+
+    async def _store(
+        self, key: str, diagram_type: str, output_format: str, data: bytes
+    ) -> None:
+        asset_hash = hashlib.sha256(data).hexdigest()
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                STORE_ASSET,
+                {
+                    "hash": asset_hash,
+                    "mime_type": MIME_TYPES.get(output_format, "application/octet-stream"),
+                    "size": len(data),
+                    "data": data,
+                },
+            )
+            await conn.execute(
+                STORE_DIAGRAM_RENDER,
+                {
+                    "cache_key": key,
+                    "diagram_type": diagram_type,
+                    "output_format": output_format,
+                    "asset_hash": asset_hash,
+                },
+            )
+
+    async def get_or_render(
+        self,
+        diagram_type: str,
+        code: str,
+        output_format: str,
+        render: Callable[[], Awaitable[Optional[bytes]]],
+    ) -> Optional[bytes]:
+        """
+        Return the cached image for this source, rendering it on a miss.
+
+        Args:
+            diagram_type: Diagram language (mermaid, plantuml, ...)
+            code: Diagram source
+            output_format: Image format (png, svg)
+            render: Coroutine factory producing the image on a miss
+
+        Returns:
+            Image bytes, or None if rendering failed (failures are not cached)
+        """
+        key = diagram_cache_key(diagram_type, code, output_format)
+
+        data = self._memory.get(key)
+        if data is not None:
+            self._stats["memory_hits"] += 1
+            return data
+
+        data, _ = await self._single_flight(
+            key, lambda: self._lookup_or_render(key, diagram_type, output_format, render)
+        )
+        return data
+
+    async def _lookup_or_render(
+        self,
+        key: str,
+        diagram_type: str,
+        output_format: str,
+        render: Callable[[], Awaitable[Optional[bytes]]],
+    ) -> Optional[bytes]:
+        if self.persistent:
+            try:
+                data = await self._load(key)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[DIAGRAM-CACHE] Persistent lookup failed: {e}")
+                data = None
+            if data is not None:
+                self._stats["persistent_hits"] += 1
+                self._memory.put(key, data)
+                return data
+
+        self._stats["misses"] += 1
+        data = await render()
+        if data is None:
+            return None
+
+        self._memory.put(key, data)
+        if self.persistent:
+            try:
+                await self._store(key, diagram_type, output_format, data)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[DIAGRAM-CACHE] Persistent store failed: {e}")
+        return data
+
+
+_diagram_cache: Optional[DiagramRenderCache] = None
+
+
+def get_diagram_cache() -> DiagramRenderCache:
+    """
+    Return the shared DiagramRenderCache, creating it on first call.
+
+    Returns:
+        Process-wide render cache configured from DiagramSettings
+    """
+    global _diagram_cache
+
+    if _diagram_cache is None:
+        _diagram_cache = DiagramRenderCache(
+            max_bytes=diagram_settings.DIAGRAM_CACHE_MAX_MB * 1024 * 1024,
+            persistent=diagram_settings.DIAGRAM_CACHE_PERSISTENT,
+        )
+
+    return _diagram_cache
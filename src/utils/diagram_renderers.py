@@ -0,0 +1,235 @@
+"""
+Pluggable diagram renderers.
+
+`render_diagram()` turns diagram source into image bytes through an ordered
+chain of backends chosen by diagram type. Local backends avoid the network
+round-trip to Kroki (0.5-3 s per part, and flaky behind egress limits); Kroki
+stays the fallback for every type.
+
+Backends:
+- kroki: remote/local Kroki service, all types (src.utils.kroki_client)
+- graphviz: the `dot` binary, run as an async subprocess
+- plantuml: the `plantuml` binary in `-pipe` mode
+- vegalite: `vl-convert-python`, an in-process Vega-Lite compiler
+  (optional: `uv sync --extra render`)
+
+Diagram source comes from the LLM, so local binaries run sandboxed: PlantUML
+with its SANDBOX security profile (no !include, !includeurl, %load_json),
+Graphviz with file loading disabled (no image=, shapefile=). SVG output of
+every backend goes through `sanitize_svg` (no script, handlers or external
+links) before it is cached, stored or served.
+
+Backends whose binary or library is missing are skipped, and a backend that
+fails or raises hands over to the next one. Chains can be overridden per type
+with DIAGRAM_RENDERERS, e.g. {"graphviz": ["kroki"]}.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Protocol
+
+from src.config import diagram_settings
+from src.utils.kroki_client import get_kroki_client
+from src.utils.svg_sanitizer import sanitize_svg
+
+try:
+    import vl_convert
+except ImportError:  # optional dependency
+    vl_convert = None
+
+logger = logging.getLogger(__name__)
+
+LOCAL_RENDER_TIMEOUT = 30
+
+
+class DiagramRenderer(Protocol):
+    """A backend able to render some diagram types to image bytes."""
+
+    name: str
+
+    def available(self) -> bool: ...
+
+    def supports(self, diagram_type: str, output_format: str) -> bool: ...
+
+    async def render(
+        self, diagram_type: str, code: str, output_format: str
+    ) -> Optional[bytes]: ...
+
+
+class KrokiRenderer:
+    """Kroki service (public or local container), every diagram type."""
+
+    name = "kroki"
+
+    def available(self) -> bool:
+        return True
+
+    def supports(self, diagram_type: str, output_format: str) -> bool:
+        return output_format in ("png", "svg")
+
+    async def render(
+        self, diagram_type: str, code: str, output_format: str
+    ) -> Optional[bytes]:
+        return await get_kroki_client().render(diagram_type, code, output_format)
+
+
+class _PipeRenderer(ABC):
+    """Renders by piping the source through a local binary (stdin -> stdout)."""
+
+    name = ""
+    binary = ""
+    diagram_type = ""
+    # Added to the subprocess environment to restrict what the source can reach
+    sandbox_env: Dict[str, str] = {}
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def supports(self, diagram_type: str, output_format: str) -> bool:
+        return diagram_type == self.diagram_type and output_format in ("png", "svg")
+
+    @abstractmethod
+    def command(self, output_format: str) -> List[str]: ...
+
+    async def render(
+        self, diagram_type: str, code: str, output_format: str
+    ) -> Optional[bytes]:
+        proc = await asyncio.create_subprocess_exec(
+            *self.command(output_format),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, **self.sandbox_env},
+        )
+        try:
+            out, err = await asyncio.wait_for(
+                proc.communicate(code.encode("utf-8")), timeout=LOCAL_RENDER_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.error(f"[RENDER-{self.name.upper()}] Timeout ({LOCAL_RENDER_TIMEOUT}s)")
+            return None
+
+        if proc.returncode != 0 or not out:
+            logger.error(
+                f"[RENDER-{self.name.upper()}] Exit code {proc.returncode}: "
+                f"{err.decode('utf-8', errors='ignore')[:200] or '(empty)'}"
+            )
+            return None
+        return out
+
+
+class GraphvizRenderer(_PipeRenderer):
+    """Graphviz through the local `dot` binary."""
+
+    name = "graphviz"
+    binary = "dot"
+    diagram_type = "graphviz"
+    # With SERVER_NAME set, files load only from GV_FILE_PATH: empty, none
+    sandbox_env = {"SERVER_NAME": "diagram-renderer", "GV_FILE_PATH": ""}
+
+    def command(self, output_format: str) -> List[str]:
+        return [self.binary, f"-T{output_format}"]
+
+
+class PlantUMLRenderer(_PipeRenderer):
+    """PlantUML through the local `plantuml` launcher."""
+
+    name = "plantuml"
+    binary = "plantuml"
+    diagram_type = "plantuml"
+    # Read by PlantUML from the environment (or the JVM property of that name)
+    sandbox_env = {"PLANTUML_SECURITY_PROFILE": "SANDBOX"}
+
+    def command(self, output_format: str) -> List[str]:
+        return [self.binary, f"-t{output_format}", "-pipe"]
+
+
+class VegaLiteRenderer:
+    """Vega-Lite compiled in-process by vl-convert (no Node, no network)."""
+
+    name = "vegalite"
+
+    def available(self) -> bool:
+        return vl_convert is not None
+
+    def supports(self, diagram_type: str, output_format: str) -> bool:
+        return diagram_type == "vegalite" and output_format in ("png", "svg")
+
+    async def render(
+        self, diagram_type: str, code: str, output_format: str
+    ) -> Optional[bytes]:
+        try:
+            if output_format == "svg":
+                svg = await asyncio.to_thread(vl_convert.vegalite_to_svg, code)
+                return svg.encode("utf-8")
+            return await asyncio.to_thread(vl_convert.vegalite_to_png, code)
+        except Exception as e:
+            logger.error(f"[RENDER-VEGALITE] Error: {e}")
+            return None
+
+
+RENDERERS: Dict[str, DiagramRenderer] = {
+    renderer.name: renderer
+    for renderer in (
+        KrokiRenderer(),
+        GraphvizRenderer(),
+        PlantUMLRenderer(),
+        VegaLiteRenderer(),
+    )
+}
+
+# Local backend first when installed, Kroki as fallback
+DEFAULT_CHAINS: Dict[str, List[str]] = {
+    "graphviz": ["graphviz", "kroki"],
+    "plantuml": ["plantuml", "kroki"],
+    "vegalite": ["vegalite", "kroki"],
+}
+
+
+def renderer_chain(diagram_type: str, output_format: str = "png") -> List[DiagramRenderer]:
+    """Available renderers for a diagram type, in the order they are tried."""
+    names = diagram_settings.DIAGRAM_RENDERERS.get(
+        diagram_type, DEFAULT_CHAINS.get(diagram_type, ["kroki"])
+    )
+    chain = []
+    for name in names:
+        renderer = RENDERERS.get(name)
+        if renderer is None:
+            logger.warning(f"[RENDER] Unknown renderer '{name}' for {diagram_type}")
+            continue
+        if renderer.available() and renderer.supports(diagram_type, output_format):
+            chain.append(renderer)
+    return chain
+
+
+async def render_diagram(
+    diagram_type: str, code: str, output_format: str = "png"
+) -> Optional[bytes]:
+    """
+    Render diagram source with the first backend of its chain that succeeds.
+
+    Args:
+        diagram_type: mermaid, plantuml, graphviz, vegalite, ...
+        code: Diagram source
+        output_format: png or svg
+
+    Returns:
+        Image bytes, or None if every backend failed
+    """
+    for renderer in renderer_chain(diagram_type, output_format):
+        try:
+            data = await renderer.render(diagram_type, code, output_format)
+        except Exception as e:
+            logger.error(f"[RENDER] {renderer.name} raised for {diagram_type}: {e}")
+            data = None
+        if data is not None and output_format == "svg":
+            data = sanitize_svg(data)
+        if data is not None:
+            return data
+        logger.warning(f"[RENDER] {renderer.name} failed for {diagram_type}, trying next")
+    return None
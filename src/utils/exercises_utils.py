@@ -24,6 +24,7 @@ from src.prompts import (
     SYSTEM_PROMPT_QCM,
     SYSTEM_PROMPT_PLANNER_EXERCISES,
 )
+from src.utils.llm_cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,9 @@ def _truncate_json_explanations(json_text: str, max_length: int = 1500) -> str:
         return json_text
 
 
-async def generate_plain(prompt: str, difficulty: str) -> Union[Open, dict, Any]:
+async def generate_plain(
+    prompt: str, difficulty: str, use_cache: bool = True
+) -> Union[Open, dict, Any]:
     """
     Generate open-ended exercise questions.
 
@@ -69,6 +72,7 @@ async def generate_plain(prompt: str, difficulty: str) -> Union[Open, dict, Any]
     Args:
         prompt: Detailed description of exercise topic
         difficulty: Difficulty level
+        use_cache: Serve identical requests from the LLM response cache
 
     Returns:
         Open model instance or dict representing generated questions
@@ -76,7 +80,7 @@ async def generate_plain(prompt: str, difficulty: str) -> Union[Open, dict, Any]
     prompt = f"Description: {prompt}\nDifficulty: {difficulty}"
 
     try:
-        response = await gemini_settings.CLIENT.aio.models.generate_content(
+        response = await get_llm_cache().generate_content(
             model=gemini_settings.GEMINI_MODEL_2_5_FLASH_LITE,
             contents=prompt,
             config={
@@ -84,6 +88,7 @@ async def generate_plain(prompt: str, difficulty: str) -> Union[Open, dict, Any]
                 "response_mime_type": "application/json",
                 "response_schema": Open,
             },
+            use_cache=use_cache,
         )
 
         if not response:
@@ -117,7 +122,9 @@ async def generate_plain(prompt: str, difficulty: str) -> Union[Open, dict, Any]
         return None
 
 
-async def generate_qcm(prompt: str, difficulty: str) -> Union[QCM, dict, Any]:
+async def generate_qcm(
+    prompt: str, difficulty: str, use_cache: bool = True
+) -> Union[QCM, dict, Any]:
     """
     Generate multiple-choice question (MCQ) exercises.
 
@@ -126,7 +133,8 @@ async def generate_qcm(prompt: str, difficulty: str) -> Union[QCM, dict, Any]:
 
     Args:
         prompt: Detailed description of exercise topic
-        difficulty: Difficulty level 
+        difficulty: Difficulty level
+        use_cache: Serve identical requests from the LLM response cache
 
     Returns:
         QCM model instance or dict representing generated questions
@@ -134,7 +142,7 @@ async def generate_qcm(prompt: str, difficulty: str) -> Union[QCM, dict, Any]:
     prompt = f"Description: {prompt}\nDifficulty: {difficulty}"
 
     try:
-        response = await gemini_settings.CLIENT.aio.models.generate_content(
+        response = await get_llm_cache().generate_content(
             model=gemini_settings.GEMINI_MODEL_2_5_FLASH_LITE,
             contents=prompt,
             config={
@@ -142,6 +150,7 @@ async def generate_qcm(prompt: str, difficulty: str) -> Union[QCM, dict, Any]:
                 "response_mime_type": "application/json",
                 "response_schema": QCM,
             },
+            use_cache=use_cache,
         )
 
         if not response:
@@ -177,6 +186,7 @@ async def generate_qcm(prompt: str, difficulty: str) -> Union[QCM, dict, Any]:
 
 async def planner_exercises_async(
     synthesis: ExerciseSynthesis,
+    use_cache: bool = True,
 ) -> Union[ExercisePlan, dict, Any]:
     """
     Generate exercise plan asynchronously using Gemini API.
@@ -186,6 +196,7 @@ async def planner_exercises_async(
     Args:
         synthesis: ExerciseSynthesis containing title, description,
                    difficulty, number of exercises, and exercise type
+        use_cache: Serve identical requests from the LLM response cache
 
     Returns:
         ExercisePlan model instance with structured exercise plan
@@ -199,7 +210,7 @@ async def planner_exercises_async(
     )
 
     try:
-        response = await gemini_settings.CLIENT.aio.models.generate_content(
+        response = await get_llm_cache().generate_content(
             model=gemini_settings.GEMINI_MODEL_2_5_FLASH,
             contents=f"Description: {synthesis.description}\nDifficulté: {synthesis.difficulty}\nNombre d'exercices: {synthesis.number_of_exercises}\nType d'exercice: {synthesis.exercise_type}",
             config={
@@ -207,6 +218,7 @@ async def planner_exercises_async(
                 "response_mime_type": "application/json",
                 "response_schema": ExercisePlan,
             },
+            use_cache=use_cache,
         )
     except Exception as err:
         logger.error(f"[Planner] Gemini API call failed: {err}")
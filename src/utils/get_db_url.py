@@ -5,6 +5,7 @@ Handles creation and lifecycle of async PostgreSQL connection pools
 using asyncpg and configuration from DatabaseSettings.
 """
 
+import json
 import logging
 from contextlib import asynccontextmanager
 
@@ -16,6 +17,22 @@ from src.config import database_settings
 logger = logging.getLogger(__name__)
 
 
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Register JSON codecs on each new pool connection.
+
+    Lets asyncpg return `json`/`jsonb` columns as Python objects so read
+    routes do not have to parse strings themselves.
+    """
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+
+
 async def create_db_pool(min_size: int = 1, max_size: int = 10) -> Pool:
     """
     Create async PostgreSQL connection pool.
@@ -39,6 +56,8 @@ async def create_db_pool(min_size: int = 1, max_size: int = 10) -> Pool:
             min_size=min_size,
             max_size=max_size,
             command_timeout=60,
+            statement_cache_size=256,
+            init=_init_connection,
         )
         logger.info(f"✅ Database pool created: {min_size}-{max_size} connections")
         return pool
@@ -0,0 +1,143 @@
+"""
+Worker coroutines draining the generation job queue.
+
+Each worker claims one job at a time from `generation_job`, runs the
+handler registered for its kind while a heartbeat keeps the claim alive,
+and records the status the handler returns ("completed" or "partial"), or
+"failed" if it raised. On shutdown, running jobs are cancelled and handed
+back to the queue ("queued"); their checkpointed steps are not redone.
+
+Usage:
+    pool = JobWorkerPool({"deepcourse": run_deepcourse_job}, workers=2)
+    pool.start()
+    ...
+    await pool.stop()
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.bdd.job_queue import Job, get_job_queue
+from src.config import app_settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], Awaitable[str]]
+
+
+class JobWorkerPool:
+    """Fixed set of worker coroutines polling the job queue."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        workers: int,
+        poll_seconds: float = 2.0,
+        stale_seconds: int = 300,
+        max_attempts: int = 3,
+    ):
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self._tasks: List[asyncio.Task] = []
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        """Start the worker coroutines."""
+        for index in range(self.workers):
+            worker_id = f"{self._prefix}:{index}"
+            self._tasks.append(
+                asyncio.create_task(self._work(worker_id), name=f"job-worker-{index}")
+            )
+        logger.info(f"[JOBS] {self.workers} worker(s) started")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _work(self, worker_id: str) -> None:
+        queue = get_job_queue()
+        kinds = list(self.handlers)
+        while True:
+            try:
+                job = await queue.claim(
+                    worker_id, kinds, self.stale_seconds, self.max_attempts
+                )
+            except Exception as e:
+                logger.error(f"[JOBS] {worker_id} claim failed: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            try:
+                await self._run(worker_id, job)
+            except Exception as e:
+                # e.g. finish() while the DB is down: the job keeps its stale
+                # claim and is picked up again once its heartbeat expires
+                logger.error(f"[JOBS] {worker_id} lost job {job.id}: {e}", exc_info=True)
+
+    async def _run(self, worker_id: str, job: Job) -> None:
+        queue = get_job_queue()
+        heartbeat = asyncio.create_task(self._heartbeat(worker_id, job.id))
+        logger.info(f"[JOBS] {worker_id} running {job.kind} job {job.id}")
+        try:
+            status = await self.handlers[job.kind](job)
+        except asyncio.CancelledError:
+            await asyncio.shield(queue.finish(job.id, worker_id, "queued"))
+            raise
+        except Exception as e:
+            logger.error(f"[JOBS] {job.kind} job {job.id} failed: {e}", exc_info=True)
+            await queue.finish(job.id, worker_id, "failed", error=str(e))
+        else:
+            logger.info(f"[JOBS] {job.kind} job {job.id} {status}")
+            await queue.finish(job.id, worker_id, status)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, worker_id: str, job_id: str) -> None:
+        interval = max(self.stale_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await get_job_queue().heartbeat(job_id, worker_id)
+            except Exception as e:
+                logger.warning(f"[JOBS] Heartbeat of job {job_id} failed: {e}")
+
+
+_job_worker_pool: Optional[JobWorkerPool] = None
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    """
+    Return the shared JobWorkerPool, creating it on first call.
+
+    Returns:
+        Process-wide worker pool configured from AppSettings
+    """
+    global _job_worker_pool
+
+    if _job_worker_pool is None:
+        # Imported here: the deep course tools import src.utils
+        from src.tools.deepcourse_tools.deepcourse_job import (
+            JOB_KIND as DEEPCOURSE_JOB,
+            run_deepcourse_job,
+        )
+
+        _job_worker_pool = JobWorkerPool(
+            {DEEPCOURSE_JOB: run_deepcourse_job},
+            workers=app_settings.JOB_WORKERS,
+            poll_seconds=app_settings.JOB_POLL_SECONDS,
+            stale_seconds=app_settings.JOB_STALE_SECONDS,
+            max_attempts=app_settings.JOB_MAX_ATTEMPTS,
+        )
+
+    return _job_worker_pool
@@ -0,0 +1,149 @@
+"""
+Async Kroki rendering client.
+
+Replaces the per-diagram `curl` subprocess (fork/exec, fresh TLS handshake and
+a thread-pool slot per render) with one shared `httpx.AsyncClient`:
+
+- keep-alive connection pool, HTTP/2 when the server offers it,
+- a concurrency cap per Kroki host,
+- connect/read timeouts,
+- retries with exponential backoff and full jitter on network errors,
+  429 and 5xx. Other 4xx (invalid diagram source) fail immediately.
+
+KROKI_URL can point to the public service or to a local container
+(`docker run -p 8000:8000 yuzutech/kroki`).
+"""
+
+import asyncio
+import logging
+import random
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config import diagram_settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class KrokiClient:
+    """Shared async client rendering diagram source through Kroki."""
+
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int,
+        timeout: float,
+        max_retries: int,
+        http2: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10.0)),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            headers={"Content-Type": "text/plain"},
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._host_limits[host]
+
+    async def render(
+        self, diagram_type: str, code: str, output_format: str = "png"
+    ) -> Optional[bytes]:
+        """
+        Render diagram source to an image.
+
+        Args:
+            diagram_type: Kroki diagram type (mermaid, plantuml, graphviz, vegalite, ...)
+            code: Diagram source
+            output_format: Kroki output format (png, svg)
+
+        Returns:
+            Image bytes, or None if Kroki rejected the source or kept failing
+        """
+        url = f"{self.base_url}/{diagram_type}/{output_format}"
+        payload = code.encode("utf-8")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._host_limit(url):
+                    response = await self._client.post(url, content=payload)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code == 200:
+                    return response.content
+                if response.status_code not in RETRYABLE_STATUS:
+                    logger.error(
+                        f"[KROKI-ERROR] {diagram_type}/{output_format} "
+                        f"HTTP {response.status_code}: {response.text[:200]}"
+                    )
+                    return None
+                reason = f"HTTP {response.status_code}"
+
+            if attempt == self.max_retries:
+                logger.error(
+                    f"[KROKI-ERROR] {diagram_type}/{output_format} failed after "
+                    f"{attempt + 1} attempt(s): {reason}"
+                )
+                return None
+
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, 0.5 * 2**attempt)
+            logger.warning(f"[KROKI-RETRY] {reason}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        return None
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+
+_kroki_client: Optional[KrokiClient] = None
+
+
+def get_kroki_client() -> KrokiClient:
+    """
+    Return the shared KrokiClient, creating it on first call.
+
+    Returns:
+        Process-wide KrokiClient configured from DiagramSettings
+    """
+    global _kroki_client
+
+    if _kroki_client is None:
+        _kroki_client = KrokiClient(
+            base_url=diagram_settings.KROKI_URL,
+            max_concurrency=diagram_settings.KROKI_MAX_CONCURRENCY,
+            timeout=diagram_settings.KROKI_TIMEOUT,
+            max_retries=diagram_settings.KROKI_MAX_RETRIES,
+            http2=diagram_settings.KROKI_HTTP2,
+        )
+        logger.info(f"⚙️  Kroki client initialized ({diagram_settings.KROKI_URL})")
+
+    return _kroki_client
+
+
+async def close_kroki_client() -> None:
+    """Close the shared client's connections and forget it."""
+    global _kroki_client
+
+    if _kroki_client is None:
+        return
+
+    await _kroki_client.aclose()
+    _kroki_client = None
@@ -0,0 +1,268 @@
+"""
+Two-tier response cache for generation calls.
+
+Exercise plans, exercises, course outlines, diagram code and open-question
+grading are pure functions of (model, system instruction, contents, response
+schema), and many students ask for the same topic at the same difficulty.
+Responses are keyed on a canonical SHA-256 of those inputs and kept:
+
+1. in an in-process LRU bounded to LLM_CACHE_MAX_MB,
+2. in Postgres (`llm_response`), shared by every worker.
+
+Entries expire after LLM_CACHE_TTL_HOURS. Concurrent identical calls share
+one Gemini request, and failed, empty or rejected (`validate`) responses
+are not cached. Each call can opt out with `use_cache=False`. Hit/miss
+counters are exposed by `stats()` (see `/api/health/metrics`).
+
+Usage:
+    response = await get_llm_cache().generate_content(
+        model=..., contents=..., config=..., use_cache=True
+    )
+"""
+
+import hashlib
+import json
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.bdd.engine import get_engine
+from src.bdd.query import (
+    FETCH_LLM_RESPONSE,
+    PURGE_EXPIRED_LLM_RESPONSES,
+    STORE_LLM_RESPONSE,
+)
+from src.config import gemini_settings
+from src.utils.llm_scheduler import LLMPriority, get_llm_scheduler
+from src.utils.two_tier_cache import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 3600
+
+# Memory entries are the expiry timestamp followed by the UTF-8 response text
+_EXPIRY = struct.Struct("!d")
+
+
+@dataclass
+class CachedResponse:
+    """Stand-in for a Gemini response rebuilt from its cached text."""
+
+    text: str
+    parsed: Any = None
+    usage_metadata: Any = None
+
+
+def _schema_fingerprint(schema: Any) -> Any:
+    """JSON-serializable description of a response schema."""
+    if schema is None or isinstance(schema, dict):
+        return schema
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema.model_json_schema()
+    try:
+        return TypeAdapter(schema).json_schema()
+    except Exception:
+        return repr(schema)
+
+
+def llm_cache_key(model: str, contents: Any, config: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key of a call: SHA-256 over model, contents and canonical config."""
+    config = dict(config or {})
+    config["response_schema"] = _schema_fingerprint(config.get("response_schema"))
+    canonical = json.dumps(
+        {"model": model, "contents": contents, "config": config},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _parse(text: str, schema: Any) -> Any:
+    """Rebuild `response.parsed` from cached text."""
+    if schema is None:
+        return None
+    if isinstance(schema, dict):
+        return json.loads(text)
+    return TypeAdapter(schema).validate_json(text)
+
+
+class LLMResponseCache(TwoTierCache):
+    """In-process LRU in front of a Postgres-backed response store."""
+
+    def __init__(self, max_bytes: int, ttl: timedelta, persistent: bool = True):
+        super().__init__(max_bytes, persistent, counters=("bypassed",))
+        self.ttl = ttl
+        self._last_purge = 0.0
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        (expires_at,) = _EXPIRY.unpack_from(entry)
+        if expires_at <= time.time():
+            self._memory.discard(key)
+            return None
+        return entry[_EXPIRY.size :].decode("utf-8")
+
+    def _memory_put(self, key: str, text: str, expires_at: datetime) -> None:
+        self._memory.put(key, _EXPIRY.pack(expires_at.timestamp()) + text.encode("utf-8"))
+
+    async def _load(self, key: str) -> Optional[Any]:
+        async with get_engine().connect() as conn:
+            result = await conn.execute(FETCH_LLM_RESPONSE, {"cache_key": key})
+            return result.fetchone()
+
+    async def _store(self, key: str, model: str, text: str, expires_at: datetime) -> None:
+        await self._maybe_purge()
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                STORE_LLM_RESPONSE,
+                {
+                    "cache_key": key,
+                    "model": model,
+                    "response": text,
+                    "expires_at": expires_at,
+                },
+            )
+
+    async def _maybe_purge(self) -> None:
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = time.monotonic()
+        try:
+            async with get_engine().begin() as conn:
+                result = await conn.execute(PURGE_EXPIRED_LLM_RESPONSES)
+        except Exception as e:
+            logger.warning(f"[LLM-CACHE] Purge failed: {e}")
+            return
+        if result.rowcount:
+            logger.info(f"🧹 LLM responses purged: {result.rowcount}")
+
+    async def generate_content(
+        self,
+        *,
+        model: str,
+        contents: Any,
+        config: Optional[Dict[str, Any]] = None,
+        priority: Optional[LLMPriority] = None,
+        use_cache: bool = True,
+        validate: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Cached equivalent of `LLMScheduler.generate_content`.
+
+        Args:
+            model: Gemini model name
+            contents: Prompt contents
+            config: Generation config (system_instruction, response_schema, ...)
+            priority: Priority class passed to the scheduler on a miss
+            use_cache: False to always call Gemini (and not cache the answer)
+            validate: Check of `response.parsed`; responses it rejects are not cached
+
+        Returns:
+            The Gemini response, or a CachedResponse exposing `text` and `parsed`
+        """
+        if not use_cache or not gemini_settings.LLM_CACHE_ENABLED:
+            self._stats["bypassed"] += 1
+            return await get_llm_scheduler().generate_content(
+                model=model, contents=contents, config=config, priority=priority
+            )
+
+        schema = (config or {}).get("response_schema")
+        key = llm_cache_key(model, contents, config)
+
+        text = self._memory_get(key)
+        if text is not None:
+            self._stats["memory_hits"] += 1
+            return CachedResponse(text=text, parsed=_parse(text, schema))
+
+        response, shared = await self._single_flight(
+            key,
+            lambda: self._lookup_or_generate(
+                key, model, contents, config, priority, schema, validate
+            ),
+        )
+        text = getattr(response, "text", None)
+        if not shared or not text:
+            return response
+        # Own copy of `parsed`: callers may mutate it (ids, corrections)
+        return CachedResponse(text=text, parsed=_parse(text, schema))
+
+    async def _lookup_or_generate(
+        self,
+        key: str,
+        model: str,
+        contents: Any,
+        config: Optional[Dict[str, Any]],
+        priority: Optional[LLMPriority],
+        schema: Any,
+        validate: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        if self.persistent:
+            try:
+                row = await self._load(key)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[LLM-CACHE] Persistent lookup failed: {e}")
+                row = None
+            if row is not None:
+                try:
+                    parsed = _parse(row.response, schema)
+                except ValueError as e:
+                    # Schema changed since the entry was written
+                    logger.warning(f"[LLM-CACHE] Stale entry {key[:12]}: {e}")
+                else:
+                    self._stats["persistent_hits"] += 1
+                    self._memory_put(key, row.response, row.expires_at)
+                    return CachedResponse(text=row.response, parsed=parsed)
+
+        self._stats["misses"] += 1
+        response = await get_llm_scheduler().generate_content(
+            model=model, contents=contents, config=config, priority=priority
+        )
+
+        text = getattr(response, "text", None)
+        parsed = getattr(response, "parsed", None)
+        if not text or (schema is not None and parsed is None):
+            return response
+        if validate is not None and not validate(parsed):
+            return response
+
+        expires_at = datetime.now(timezone.utc) + self.ttl
+        self._memory_put(key, text, expires_at)
+        if self.persistent:
+            try:
+                await self._store(key, model, text, expires_at)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[LLM-CACHE] Persistent store failed: {e}")
+        return response
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Return the shared LLMResponseCache, creating it on first call.
+
+    Returns:
+        Process-wide response cache configured from GeminiSettings
+    """
+    global _llm_cache
+
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(
+            max_bytes=gemini_settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+            ttl=timedelta(hours=gemini_settings.LLM_CACHE_TTL_HOURS),
+            persistent=gemini_settings.LLM_CACHE_PERSISTENT,
+        )
+
+    return _llm_cache
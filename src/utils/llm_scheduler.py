@@ -0,0 +1,297 @@
+"""
+Central scheduler for Gemini calls.
+
+Every `generate_content` call made by the generation utilities goes through
+one process-wide LLMScheduler instead of hitting `gemini_settings.CLIENT`
+directly. For each model the scheduler enforces:
+
+- a concurrency cap (number of requests in flight),
+- a requests-per-minute and a tokens-per-minute token bucket,
+- priority classes: waiting INTERACTIVE calls are always granted before
+  BATCH ones, so a user chatting is not stuck behind a 16-chapter deep course.
+
+Calls rejected with 429/503 are retried with exponential backoff and jitter.
+
+Usage:
+    scheduler = get_llm_scheduler()
+    response = await scheduler.generate_content(model=..., contents=..., config=...)
+
+    with llm_priority(LLMPriority.BATCH):
+        await asyncio.gather(*tasks)  # tasks inherit the BATCH class
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from google.genai import errors as genai_errors
+
+from src.config import gemini_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    """Priority classes, lower value is served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_llm_priority_context: ContextVar[LLMPriority] = ContextVar(
+    "llm_priority", default=LLMPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority):
+    """
+    Run the enclosed block (and tasks created inside it) at a given priority.
+
+    Args:
+        priority: Priority class applied to scheduler calls without an explicit one
+    """
+    token = _llm_priority_context.set(priority)
+    try:
+        yield
+    finally:
+        _llm_priority_context.reset(token)
+
+
+def estimate_tokens(contents: Any, config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Roughly estimate the tokens a call will consume (~4 characters per token).
+
+    The estimate covers the prompt and system instruction plus the configured
+    output allowance; it is reconciled with `usage_metadata` after the call.
+    """
+    prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+    system = str((config or {}).get("system_instruction") or "")
+    return (len(prompt) + len(system)) // 4 + gemini_settings.LLM_OUTPUT_TOKENS_ESTIMATE
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` units per minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds to wait before `amount` units are available (0 if now)."""
+        self._refill()
+        # Requests larger than the whole bucket only wait for a full bucket
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate else 0.0
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` units; the balance may go negative (debt)."""
+        self._refill()
+        self.tokens -= amount
+
+
+@dataclass
+class ModelLimits:
+    """Limits applied to one model."""
+
+    max_concurrency: int
+    rpm: int
+    tpm: int
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _ModelLane:
+    """Concurrency slots and rate buckets for a single model."""
+
+    def __init__(self, model: str, limits: ModelLimits):
+        self.model = model
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm)
+        self.tokens = TokenBucket(limits.tpm)
+        self.in_flight = 0
+        self.waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, priority: LLMPriority, tokens: int) -> None:
+        """Wait until the call may be sent."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, _Waiter(priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted right before cancellation: give the slot back
+                self.release(estimated=tokens, used=0)
+            raise
+
+    def release(self, estimated: int, used: Optional[int]) -> None:
+        """Free a slot and charge the difference between used and estimated tokens."""
+        self.in_flight -= 1
+        if used is not None:
+            self.tokens.consume(used - estimated)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant waiting calls, highest priority first, while limits allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self.waiters and self.in_flight < self.limits.max_concurrency:
+            waiter = self.waiters[0]
+            if waiter.future.done():  # cancelled while queued
+                heapq.heappop(self.waiters)
+                continue
+
+            delay = max(self.requests.delay_for(1), self.tokens.delay_for(waiter.tokens))
+            if delay > 0:
+                # Head-of-line waits so lower priorities cannot overtake it
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self.waiters)
+            self.requests.consume(1)
+            self.tokens.consume(waiter.tokens)
+            self.in_flight += 1
+            waiter.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the lane state."""
+        queued: Dict[str, int] = {}
+        for waiter in self.waiters:
+            if not waiter.future.done():
+                name = LLMPriority(waiter.priority).name.lower()
+                queued[name] = queued.get(name, 0) + 1
+        return {"in_flight": self.in_flight, "queued": queued}
+
+
+class LLMScheduler:
+    """
+    Process-wide gate in front of the Gemini client.
+
+    Lanes are created lazily per model, using LLM_MODEL_LIMITS overrides when
+    present and the global LLM_* defaults otherwise.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._lanes: Dict[str, _ModelLane] = {}
+
+    def _limits_for(self, model: str) -> ModelLimits:
+        override = gemini_settings.LLM_MODEL_LIMITS.get(model, {})
+        return ModelLimits(
+            max_concurrency=override.get(
+                "max_concurrency", gemini_settings.LLM_MAX_CONCURRENCY
+            ),
+            rpm=override.get("rpm", gemini_settings.LLM_REQUESTS_PER_MINUTE),
+            tpm=override.get("tpm", gemini_settings.LLM_TOKENS_PER_MINUTE),
+        )
+
+    def _lane(self, model: str) -> _ModelLane:
+        if model not in self._lanes:
+            self._lanes[model] = _ModelLane(model, self._limits_for(model))
+        return self._lanes[model]
+
+    async def generate_content(
+        self,
+        *,
+        model: str,
+        contents: Any,
+        config: Optional[Dict[str, Any]] = None,
+        priority: Optional[LLMPriority] = None,
+    ) -> Any:
+        """
+        Scheduled equivalent of `CLIENT.aio.models.generate_content`.
+
+        Args:
+            model: Gemini model name
+            contents: Prompt contents
+            config: Generation config (system_instruction, response_schema, ...)
+            priority: Priority class (default: the one set by llm_priority())
+
+        Returns:
+            The Gemini response
+
+        Raises:
+            genai_errors.APIError: When the call fails, or still gets 429/503
+                after LLM_MAX_RETRIES retries
+        """
+        priority = _llm_priority_context.get() if priority is None else priority
+        lane = self._lane(model)
+        estimated = estimate_tokens(contents, config)
+
+        for attempt in range(gemini_settings.LLM_MAX_RETRIES + 1):
+            await lane.acquire(priority, estimated)
+            used: Optional[int] = None
+            try:
+                response = await self.client.aio.models.generate_content(
+                    model=model, contents=contents, config=config
+                )
+                usage = getattr(response, "usage_metadata", None)
+                used = getattr(usage, "total_token_count", None)
+                return response
+            except genai_errors.APIError as err:
+                if err.code not in (429, 503) or attempt == gemini_settings.LLM_MAX_RETRIES:
+                    raise
+                backoff = min(30.0, 2**attempt) * (0.5 + random.random())
+                logger.warning(
+                    f"[LLM-SCHEDULER] {model} returned {err.code}, "
+                    f"retry {attempt + 1}/{gemini_settings.LLM_MAX_RETRIES} in {backoff:.1f}s"
+                )
+            finally:
+                lane.release(estimated, used)
+            await asyncio.sleep(backoff)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """In-flight and queued calls per model."""
+        return {model: lane.stats() for model, lane in self._lanes.items()}
+
+
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """
+    Return the shared LLMScheduler, creating it on first call.
+
+    Returns:
+        Process-wide LLMScheduler wrapping gemini_settings.CLIENT
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = LLMScheduler(gemini_settings.CLIENT)
+        logger.info(
+            f"⚙️  LLM scheduler initialized "
+            f"(max_concurrency={gemini_settings.LLM_MAX_CONCURRENCY}, "
+            f"rpm={gemini_settings.LLM_REQUESTS_PER_MINUTE}, "
+            f"tpm={gemini_settings.LLM_TOKENS_PER_MINUTE})"
+        )
+
+    return _scheduler
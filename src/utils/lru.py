@@ -0,0 +1,45 @@
+"""
+Size-bounded LRU for immutable byte payloads.
+
+Used as the in-process tier of content-addressed stores (chat artifacts,
+rendered diagrams): keys are content hashes, so entries never go stale and
+only need evicting when the byte budget is exceeded.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+
+class BytesLRU:
+    """LRU of bytes keyed by hash, bounded by total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes and mark them most recently used."""
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Cache bytes, evicting least recently used entries over budget."""
+        if len(data) > self.max_bytes or key in self._items:
+            return
+        self._items[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+    def discard(self, key: str) -> None:
+        """Drop an entry if present."""
+        data = self._items.pop(key, None)
+        if data is not None:
+            self.size -= len(data)
@@ -0,0 +1,145 @@
+"""
+Two-tier cache of rendered course PDFs.
+
+/api/downloadcourse used to rebuild Markdown, HTML and the PDF on every
+click. A PDF is now cached per document, keyed on its version: a SHA-256 of
+the stored content (which references diagrams by content hash) and of
+PDF_TEMPLATE_VERSION. Any change to the course (edit, diagram backfill)
+yields a new version, so stale PDFs are never served; `update_document`
+also deletes the stored PDF.
+
+1. an in-process LRU bounded to PDF_CACHE_MAX_MB,
+2. Postgres (`document_pdf`, one row per document), shared by every worker.
+
+The version doubles as the download's ETag. Concurrent downloads of the
+same version share one render. Hit/miss counters are exposed by `stats()`
+(see `/api/health/metrics`).
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from src.bdd.engine import get_engine
+from src.bdd.query import FETCH_DOCUMENT_PDF, STORE_DOCUMENT_PDF
+from src.config import export_settings
+from src.utils.save_files import PDF_TEMPLATE_VERSION
+from src.utils.two_tier_cache import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_version(contenu: Any) -> str:
+    """Version of a document's PDF: SHA-256 over template version and content."""
+    canonical = json.dumps(
+        contenu, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(
+        f"{PDF_TEMPLATE_VERSION}\n{canonical}".encode("utf-8")
+    ).hexdigest()
+
+
+class DocumentPDFCache(TwoTierCache):
+    """In-process LRU in front of a Postgres-backed PDF store."""
+
+    async def _load(self, document_id: str, version: str) -> Optional[bytes]:
+        async with get_engine().connect() as conn:
+            result = await conn.execute(
+                FETCH_DOCUMENT_PDF, {"document_id": document_id, "version": version}
+            )
+            row = result.fetchone()
+        return bytes(row.data) if row else None
+
+    async def _store(self, document_id: str, version: str, data: bytes) -> None:
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                STORE_DOCUMENT_PDF,
+                {
+                    "document_id": document_id,
+                    "version": version,
+                    "size": len(data),
+                    "data": data,
+                },
+            )
+
+    async def get_or_render(
+        self,
+        document_id: str,
+        version: str,
+        render: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """
+        Return the cached PDF of this document version, rendering it on a miss.
+
+        Args:
+            document_id: Document id
+            version: Content version (see `pdf_version`)
+            render: Coroutine factory producing the PDF on a miss
+
+        Returns:
+            PDF bytes
+        """
+        key = f"{document_id}:{version}"
+
+        data = self._memory.get(key)
+        if data is not None:
+            self._stats["memory_hits"] += 1
+            return data
+
+        data, _ = await self._single_flight(
+            key, lambda: self._lookup_or_render(key, document_id, version, render)
+        )
+        return data
+
+    async def _lookup_or_render(
+        self,
+        key: str,
+        document_id: str,
+        version: str,
+        render: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        if self.persistent:
+            try:
+                data = await self._load(document_id, version)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[PDF-CACHE] Persistent lookup failed: {e}")
+                data = None
+            if data is not None:
+                self._stats["persistent_hits"] += 1
+                self._memory.put(key, data)
+                return data
+
+        self._stats["misses"] += 1
+        data = await render()
+
+        self._memory.put(key, data)
+        if self.persistent:
+            try:
+                await self._store(document_id, version, data)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[PDF-CACHE] Persistent store failed: {e}")
+        return data
+
+
+_pdf_cache: Optional[DocumentPDFCache] = None
+
+
+def get_pdf_cache() -> DocumentPDFCache:
+    """
+    Return the shared DocumentPDFCache, creating it on first call.
+
+    Returns:
+        Process-wide PDF cache configured from ExportSettings
+    """
+    global _pdf_cache
+
+    if _pdf_cache is None:
+        _pdf_cache = DocumentPDFCache(
+            max_bytes=export_settings.PDF_CACHE_MAX_MB * 1024 * 1024,
+            persistent=export_settings.PDF_CACHE_PERSISTENT,
+        )
+
+    return _pdf_cache
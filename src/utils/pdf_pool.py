@@ -0,0 +1,213 @@
+"""
+Process pool for PDF rendering.
+
+xhtml2pdf is pure-Python CPU work: a diagram-heavy course takes seconds,
+and run on the event loop it froze every other request of the worker
+(health checks included). Renders now run in PDF_WORKERS single-process
+executors ("slots", spawned so they do not inherit the server's threads):
+
+- at most PDF_MAX_QUEUE renders wait for a free slot; beyond that `run`
+  raises PDFRenderBusy, which endpoints answer with 503 + Retry-After,
+- a render still running after PDF_RENDER_TIMEOUT raises PDFRenderTimeout;
+  its process is killed and the slot restarted, other renders are untouched,
+- a cancelled caller (client gone) leaves the slot out of the queue until
+  its process has finished the render.
+
+Counters are exposed by `stats()` (see `/api/health/metrics`).
+
+Usage:
+    pdf_bytes = await get_pdf_pool().run(course_pdf_bytes, course)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from src.config import export_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PDFRenderBusy(Exception):
+    """Too many renders queued; the client should retry later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"PDF render queue full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PDFRenderTimeout(Exception):
+    """A render exceeded PDF_RENDER_TIMEOUT and was killed."""
+
+
+def _new_slot() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _kill_slot(slot: ProcessPoolExecutor) -> None:
+    """Terminate the slot's process (shutdown alone waits for the stuck render)."""
+    for process in list(getattr(slot, "_processes", {}).values()):
+        process.terminate()
+    slot.shutdown(wait=False, cancel_futures=True)
+
+
+def _release_threadsafe(
+    loop: asyncio.AbstractEventLoop, slots: asyncio.Queue, slot: ProcessPoolExecutor
+) -> None:
+    """Put a slot back from the executor's callback thread."""
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(slots.put_nowait, slot)
+
+
+class PDFRenderPool:
+    """Bounded set of worker processes with a bounded wait queue."""
+
+    def __init__(self, workers: int, max_queue: int, timeout: float, retry_after: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots: Optional[asyncio.Queue] = None
+        self._all_slots: List[ProcessPoolExecutor] = []
+        self._waiting = 0
+        self._stats = {
+            "rendered": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "render_ms_total": 0.0,
+        }
+
+    def _queue(self) -> asyncio.Queue:
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            for _ in range(self.workers):
+                slot = _new_slot()
+                self._all_slots.append(slot)
+                self._slots.put_nowait(slot)
+        return self._slots
+
+    def _replace(self, slot: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        _kill_slot(slot)
+        self._all_slots.remove(slot)
+        fresh = _new_slot()
+        self._all_slots.append(fresh)
+        return fresh
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run `fn(*args)` in a worker process.
+
+        Args:
+            fn: Picklable (module-level) function
+            args: Picklable arguments
+
+        Returns:
+            The function's return value
+
+        Raises:
+            PDFRenderBusy: PDF_MAX_QUEUE renders are already waiting
+            PDFRenderTimeout: The render exceeded PDF_RENDER_TIMEOUT
+        """
+        slots = self._queue()
+        if slots.empty() and self._waiting >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise PDFRenderBusy(self.retry_after)
+
+        self._waiting += 1
+        try:
+            slot = await slots.get()
+        finally:
+            self._waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        release = True
+        start = time.perf_counter()
+        try:
+            job = slot.submit(fn, *args)
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # The process keeps rendering: hand the slot back once it is free
+            release = False
+            job.add_done_callback(lambda _: _release_threadsafe(loop, slots, slot))
+            raise
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.error(f"[PDF] Render exceeded {self.timeout}s, restarting its worker")
+            slot = self._replace(slot)
+            raise PDFRenderTimeout(f"PDF render exceeded {self.timeout}s")
+        except BrokenProcessPool:
+            self._stats["errors"] += 1
+            slot = self._replace(slot)
+            raise
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            if release:
+                slots.put_nowait(slot)
+
+        self._stats["rendered"] += 1
+        self._stats["render_ms_total"] += (time.perf_counter() - start) * 1000
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """Render counters, mean render time and current queue depth."""
+        rendered = self._stats["rendered"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "render_ms_total"},
+            "mean_render_ms": (
+                round(self._stats["render_ms_total"] / rendered, 1) if rendered else 0.0
+            ),
+            "waiting": self._waiting,
+            "idle_workers": self._slots.qsize() if self._slots is not None else self.workers,
+        }
+
+    def close(self) -> None:
+        """Stop every worker process."""
+        for slot in self._all_slots:
+            slot.shutdown(wait=False, cancel_futures=True)
+        self._all_slots.clear()
+        self._slots = None
+
+
+_pdf_pool: Optional[PDFRenderPool] = None
+
+
+def get_pdf_pool() -> PDFRenderPool:
+    """
+    Return the shared PDFRenderPool, creating it on first call.
+
+    Returns:
+        Process-wide render pool configured from ExportSettings
+    """
+    global _pdf_pool
+
+    if _pdf_pool is None:
+        _pdf_pool = PDFRenderPool(
+            workers=export_settings.PDF_WORKERS,
+            max_queue=export_settings.PDF_MAX_QUEUE,
+            timeout=export_settings.PDF_RENDER_TIMEOUT,
+            retry_after=export_settings.PDF_RETRY_AFTER,
+        )
+
+    return _pdf_pool
+
+
+def close_pdf_pool() -> None:
+    """Stop the shared pool's processes and forget it."""
+    global _pdf_pool
+
+    if _pdf_pool is None:
+        return
+
+    _pdf_pool.close()
+    _pdf_pool = None
@@ -0,0 +1,323 @@
+"""
+HTML/CSS template pipeline for PDF exports.
+
+`_build_html_template` used to rebuild an f-string holding the whole
+stylesheet, create a new Markdown converter with 4 extensions and re-encode
+the logo from disk on every export. Here:
+
+- the document head (CSS) and the logo header are built once at import,
+- each process/thread reuses one `markdown.Markdown` instance (`reset()`
+  between documents),
+- courses are converted part by part and the HTML of a part's Markdown is
+  memoized, so re-exporting a course only converts the parts that changed;
+  diagrams are inserted as `<img>` tags, never parsed as Markdown (PDF
+  exports reference image files instead of embedding base64).
+
+Usage:
+    html = course_html(course)
+    html = html_document(markdown_to_html(text))
+"""
+
+import base64
+import gzip
+import threading
+from datetime import datetime
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import markdown
+
+from src.models.cours_models import CourseOutput, Part
+
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+LOGO_PATH = ASSETS_DIR / "logo.png"
+LOGO_SIZE = 140  # Logo width in pixels
+
+MARKDOWN_EXTENSIONS = ["extra", "tables", "fenced_code", "nl2br"]
+
+# Memoized part conversions (keyed by the part's Markdown)
+PART_CACHE_SIZE = 1024
+
+# Starts a new PDF page between sections of an export
+PAGE_BREAK_HTML = '<div style="page-break-before: always"></div>'
+
+PAGE_CSS = """
+@page {
+    size: A4;
+    margin: 2.5cm 2cm 2cm 2cm;
+
+    @frame header {
+        -pdf-frame-content: header_content;
+        top: 0.5cm;
+        margin-left: 2cm;
+        margin-right: 2cm;
+        height: 2cm;
+    }
+}
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    font-size: 11pt;
+}
+
+h1 {
+    color: #2c3e50;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 10px;
+    font-size: 24pt;
+    font-weight: 700;
+    margin-top: 20px;
+    page-break-after: avoid;
+}
+
+h2 {
+    color: #34495e;
+    margin-top: 30px;
+    font-size: 18pt;
+    font-weight: 600;
+    page-break-after: avoid;
+}
+
+h3 {
+    color: #7f8c8d;
+    font-size: 14pt;
+    font-weight: 600;
+    page-break-after: avoid;
+}
+
+code {
+    background-color: #f4f4f4;
+    padding: 2px 6px;
+    border-radius: 3px;
+    font-family: 'Courier New', monospace;
+    font-size: 9pt;
+}
+
+pre {
+    background-color: #f8f8f8;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    padding: 15px;
+    overflow-x: auto;
+    page-break-inside: avoid;
+}
+
+pre code {
+    background-color: transparent;
+    padding: 0;
+}
+
+img {
+    max-width: 100%;
+    height: auto;
+    display: block;
+    margin: 20px auto;
+    page-break-inside: avoid;
+}
+
+hr {
+    border: none;
+    border-top: 2px solid #ecf0f1;
+    margin: 30px 0;
+}
+
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 20px 0;
+    page-break-inside: avoid;
+}
+
+th, td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+}
+
+th {
+    background-color: #3498db;
+    color: white;
+    font-weight: 600;
+}
+
+blockquote {
+    border-left: 4px solid #3498db;
+    padding-left: 20px;
+    margin-left: 0;
+    color: #555;
+    font-style: italic;
+}
+
+p {
+    margin: 10px 0;
+    text-align: justify;
+}
+
+ul, ol {
+    margin: 10px 0;
+    padding-left: 30px;
+}
+
+li {
+    margin: 5px 0;
+}
+"""
+
+
+def _read_logo() -> str:
+    if not LOGO_PATH.exists():
+        return ""
+    return base64.b64encode(LOGO_PATH.read_bytes()).decode("utf-8")
+
+
+LOGO_BASE64 = _read_logo()
+
+_HEAD = (
+    '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+    f"<style>{PAGE_CSS}</style>\n</head>\n<body>\n"
+)
+
+_LOGO_HEADER = (
+    '<div id="header_content" style="position: absolute; top: 0; right: 0; '
+    'width: 100%; text-align: right; padding: 10px 20px;">'
+    f'<img src="data:image/png;base64,{LOGO_BASE64}" alt="Pixia" '
+    f'style="width: {LOGO_SIZE}px; height: auto; opacity: 0.7;" /></div>\n'
+    if LOGO_BASE64
+    else ""
+)
+
+_GENERATION_INFO = (
+    '<div class="generation-info" style="text-align: center; margin-bottom: 30px;">'
+    '<p style="color: #7f8c8d; font-size: 9pt; font-style: italic; margin: 0;">'
+    "Generated on {date}</p></div>\n"
+)
+
+_TAIL = "\n</body>\n</html>\n"
+
+_local = threading.local()
+
+
+def _converter() -> markdown.Markdown:
+    """Markdown converter of the current thread, created on first use."""
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        _local.converter = converter
+    return converter
+
+
+def markdown_to_html(text: str) -> str:
+    """Convert Markdown to an HTML fragment with the shared converter."""
+    converter = _converter()
+    converter.reset()
+    return converter.convert(text)
+
+
+@lru_cache(maxsize=PART_CACHE_SIZE)
+def _part_content_html(content: str) -> str:
+    return markdown_to_html(content)
+
+
+def diagram_data_uri(part: Part) -> str:
+    """
+    Build the data URI of a part's diagram (PNG, SVG or gzip-compressed SVG).
+
+    Args:
+        part: Part carrying `img_base64` in the format given by `img_format`
+
+    Returns:
+        data: URI usable as an image source
+    """
+    if part.img_format == "png":
+        return f"data:image/png;base64,{part.img_base64}"
+
+    svg_base64 = part.img_base64
+    if part.img_format == "svgz":
+        svg = gzip.decompress(base64.b64decode(part.img_base64))
+        svg_base64 = base64.b64encode(svg).decode("ascii")
+    return f"data:image/svg+xml;base64,{svg_base64}"
+
+
+ImageSource = Callable[[int, Part], Optional[str]]
+
+
+def _inline_image_src(idx: int, part: Part) -> Optional[str]:
+    return diagram_data_uri(part) if part.img_base64 else None
+
+
+def course_body_html(
+    course: CourseOutput, image_src: Optional[ImageSource] = None
+) -> str:
+    """
+    HTML fragment of a course: title, parts and their diagrams.
+
+    Args:
+        course: CourseOutput with title and parts
+        image_src: Returns the `src` of a part's diagram (1-based index,
+            part), or None for no diagram. Defaults to a data URI of
+            `img_base64`; PDF exports pass references resolved by the
+            engine's link callback instead.
+
+    Returns:
+        HTML fragment (same structure as the course's Markdown export)
+    """
+    image_src = image_src or _inline_image_src
+    html: List[str] = [f"<h1>{escape(course.title)}</h1>\n"]
+
+    for idx, part in enumerate(course.parts, 1):
+        html.append(f"<h2>{idx}. {escape(part.title)}</h2>\n")
+        html.append(_part_content_html(part.content))
+        html.append("\n")
+
+        src = image_src(idx, part)
+        if src:
+            html.append(f"<h3>Diagram - {escape(part.title)}</h3>\n")
+            if part.schema_description:
+                html.append(f"<p><em>{escape(part.schema_description)}</em></p>\n")
+            html.append(f'<p><img alt="Diagram {idx}" src="{src}" /></p>\n')
+
+        if idx < len(course.parts):
+            html.append("<hr />\n")
+
+    return "".join(html)
+
+
+def html_document(body_html: str, add_logo: bool = True) -> str:
+    """
+    Wrap an HTML fragment in the export template (CSS, logo, generation date).
+
+    Args:
+        body_html: Document content
+        add_logo: Include Pixia logo if True
+
+    Returns:
+        Complete HTML document string
+    """
+    generation_date = datetime.now().strftime("%d/%m/%Y à %H:%M")
+    return "".join(
+        (
+            _HEAD,
+            _LOGO_HEADER if add_logo else "",
+            _GENERATION_INFO.format(date=generation_date),
+            body_html,
+            _TAIL,
+        )
+    )
+
+
+def course_html(
+    course: CourseOutput,
+    add_logo: bool = True,
+    image_src: Optional[ImageSource] = None,
+) -> str:
+    """Complete HTML document of a course (see `course_body_html`)."""
+    return html_document(course_body_html(course, image_src), add_logo)
+
+
+def part_cache_info():
+    """Hit/miss counters of the per-part Markdown memo."""
+    return _part_content_html.cache_info()
@@ -6,54 +6,205 @@ with styling, logos, and generation metadata.
 """
 
 import base64
+import gzip
+import io
 import logging
 import os
 import re
 import tempfile
-from datetime import datetime
+from html import escape
 from io import BytesIO
-from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
-import markdown
 from fastapi.responses import Response
+from pypdf import PdfWriter
 from xhtml2pdf import pisa
 
 from src.models.cours_models import CourseOutput
+from src.models.exercise_models import QCM, ExerciseOutput
+from src.utils.pdf_template import (
+    PAGE_BREAK_HTML,
+    course_body_html,
+    course_html,
+    diagram_data_uri,
+    html_document,
+    markdown_to_html,
+)
 
 logger = logging.getLogger(__name__)
 
-ASSETS_DIR = Path(__file__).parent.parent / "assets"
-LOGO_PATH = ASSETS_DIR / "logo.png"
-LOGO_SIZE = 140  # Logo width in pixels
+# src of diagram images in export HTML, resolved to files by the link callback
+IMAGE_SCHEME = "diagram:"
+
+# Bump when the exported layout changes: cached PDFs (src.utils.pdf_cache)
+# of earlier versions are then re-rendered
+PDF_TEMPLATE_VERSION = "2"
 
 
 def course_output_to_markdown(course: CourseOutput) -> str:
     """
     Convert CourseOutput to Markdown format.
 
+    Diagrams are embedded as data URIs so the file stands alone; PDF exports
+    do not go through this Markdown (see `course_pdf_bytes`).
+
     Args:
         course: CourseOutput with title and sections
 
     Returns:
         Formatted Markdown content
     """
-    md_content = f"# {course.title}\n\n"
+    md_content = io.StringIO()
+    md_content.write(f"# {course.title}\n\n")
 
     for idx, part in enumerate(course.parts, 1):
-        md_content += f"## {idx}. {part.title}\n\n"
-        md_content += f"{part.content}\n\n"
+        md_content.write(f"## {idx}. {part.title}\n\n")
+        md_content.write(f"{part.content}\n\n")
 
         if part.img_base64:
-            md_content += f"### Diagram - {part.title}\n\n"
+            md_content.write(f"### Diagram - {part.title}\n\n")
             if part.schema_description:
-                md_content += f"*{part.schema_description}*\n\n"
-            md_content += f"![Diagram {idx}](data:image/png;base64,{part.img_base64})\n\n"
+                md_content.write(f"*{part.schema_description}*\n\n")
+            md_content.write(f"![Diagram {idx}]({diagram_data_uri(part)})\n\n")
 
         if idx < len(course.parts):
-            md_content += "---\n\n"
+            md_content.write("---\n\n")
+
+    return md_content.getvalue()
+
+
+def exercise_output_to_markdown(exercise: ExerciseOutput, heading: str = "#") -> str:
+    """
+    Convert ExerciseOutput to Markdown: questions first, answer key at the end.
+
+    Args:
+        exercise: ExerciseOutput (QCM and open question blocks)
+        heading: Markdown heading prefix of the title
+
+    Returns:
+        Formatted Markdown content
+    """
+    questions = [f"{heading} {exercise.title}\n\n"]
+    answers = [f"{heading}# Corrigé\n\n"]
+
+    for idx, block in enumerate(exercise.exercises, 1):
+        questions.append(f"{heading}# {idx}. {block.topic}\n\n")
+        answers.append(f"**{idx}. {block.topic}**\n\n")
+        for number, question in enumerate(block.questions, 1):
+            questions.append(f"**{idx}.{number}** {question.question}\n\n")
+            if isinstance(block, QCM):
+                questions.extend(f"- ☐ {answer.text}\n" for answer in question.answers)
+                questions.append("\n")
+                correct = ", ".join(a.text for a in question.answers if a.is_correct)
+                answers.append(f"- {idx}.{number} : {correct}\n")
+            else:
+                answers.append(f"- {idx}.{number}\n")
+            answers.append(f"  *{question.explanation}*\n")
+        answers.append("\n")
+
+    if not exercise.exercises:
+        return "".join(questions)
+    return "".join(questions) + "---\n\n" + "".join(answers)
+
+
+def _diagram_files(
+    course: CourseOutput, directory: str, image_files: Dict[str, str]
+) -> Dict[str, str]:
+    """
+    Map the index of each part with a diagram to an image file.
+
+    Parts referenced by `img_hash` use the files written by the caller
+    (`write_course_assets`); inline `img_base64` diagrams are decoded to
+    `directory`.
+    """
+    files: Dict[str, str] = {}
+    for idx, part in enumerate(course.parts, 1):
+        if part.img_hash and part.img_hash in image_files:
+            files[str(idx)] = image_files[part.img_hash]
+        elif part.img_base64:
+            data = base64.b64decode(part.img_base64)
+            if part.img_format == "svgz":
+                data = gzip.decompress(data)
+            extension = ".png" if part.img_format == "png" else ".svg"
+            path = os.path.join(directory, f"diagram-{idx}{extension}")
+            with open(path, "wb") as f:
+                f.write(data)
+            files[str(idx)] = path
+    return files
+
+
+def _render_pdf(full_html: str, dest, files: Dict[str, str]) -> None:
+    """Render HTML to `dest`, resolving `diagram:<index>` images to files."""
+
+    def link_callback(uri: str, rel: str) -> str:
+        if uri.startswith(IMAGE_SCHEME):
+            return files.get(uri[len(IMAGE_SCHEME):], uri)
+        return uri
+
+    pisa.CreatePDF(
+        src=full_html, dest=dest, encoding='utf-8', link_callback=link_callback
+    )
+
+
+def _image_src(files: Dict[str, str]):
+    return lambda idx, part: f"{IMAGE_SCHEME}{idx}" if str(idx) in files else None
+
+
+def chapter_pdf_file(
+    title: str,
+    course: Optional[CourseOutput],
+    exercise: Optional[ExerciseOutput],
+    evaluation: Optional[ExerciseOutput],
+    output_pdf_path: str,
+    image_files: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Render a deep course chapter (course, exercises, evaluation) to a PDF file.
+
+    Run it through the PDF pool. The PDF goes to disk so the caller can
+    stream it without holding it; each section starts on a new page.
+
+    Args:
+        image_files: Diagram files by `img_hash` (see `write_course_assets`)
+
+    Returns:
+        Path to created PDF file
+    """
+    with tempfile.TemporaryDirectory(prefix="chapter_pdf_") as workdir:
+        files = (
+            _diagram_files(course, workdir, image_files or {}) if course else {}
+        )
+        sections = [f"<h1>{escape(title)}</h1>"]
+        if course is not None:
+            sections.append(course_body_html(course, _image_src(files)))
+        for document in (exercise, evaluation):
+            if document is not None and document.exercises:
+                sections.append(markdown_to_html(exercise_output_to_markdown(document)))
+
+        full_html = html_document(PAGE_BREAK_HTML.join(sections))
+        with open(output_pdf_path, "wb") as pdf_file:
+            _render_pdf(full_html, pdf_file, files)
+    return output_pdf_path
+
 
-    return md_content
+def merge_pdf_files(pdf_paths: List[str], output_pdf_path: str) -> str:
+    """
+    Concatenate PDF files into one (run it through the PDF pool).
+
+    Args:
+        pdf_paths: PDFs to concatenate, in order
+        output_pdf_path: Output file path
+
+    Returns:
+        Path to created PDF file
+    """
+    writer = PdfWriter()
+    for path in pdf_paths:
+        writer.append(path)
+    with open(output_pdf_path, "wb") as pdf_file:
+        writer.write(pdf_file)
+    writer.close()
+    return output_pdf_path
 
 
 def save_markdown_to_file(markdown_content: str, output_path: Optional[str] = None) -> str:
@@ -89,171 +240,7 @@ def _build_html_template(markdown_content: str, add_logo: bool = True) -> str:
     Returns:
         Complete HTML document string
     """
-    generation_date = datetime.now().strftime("%d/%m/%Y à %H:%M")
-    html_content = markdown.markdown(
-        markdown_content,
-        extensions=['extra', 'tables', 'fenced_code', 'nl2br']
-    )
-
-    generation_info = f"""
-    <div class="generation-info" style="text-align: center; margin-bottom: 30px;">
-        <p style="color: #7f8c8d; font-size: 9pt; font-style: italic; margin: 0;">
-            Generated on {generation_date}
-        </p>
-    </div>
-    """
-
-    logo_base64 = ""
-    page_template = ""
-
-    if add_logo and LOGO_PATH.exists():
-        with open(LOGO_PATH, "rb") as img_file:
-            logo_base64 = base64.b64encode(img_file.read()).decode('utf-8')
-
-        page_template = f"""
-        <div id="header_content" style="position: absolute; top: 0; right: 0; width: 100%; text-align: right; padding: 10px 20px;">
-            <img src="data:image/png;base64,{logo_base64}" alt="Pixia" style="width: {LOGO_SIZE}px; height: auto; opacity: 0.7;" />
-        </div>
-        """
-
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <style>
-            @page {{
-                size: A4;
-                margin: 2.5cm 2cm 2cm 2cm;
-
-                @frame header {{
-                    -pdf-frame-content: header_content;
-                    top: 0.5cm;
-                    margin-left: 2cm;
-                    margin-right: 2cm;
-                    height: 2cm;
-                }}
-            }}
-
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                font-size: 11pt;
-            }}
-
-            h1 {{
-                color: #2c3e50;
-                border-bottom: 3px solid #3498db;
-                padding-bottom: 10px;
-                font-size: 24pt;
-                font-weight: 700;
-                margin-top: 20px;
-                page-break-after: avoid;
-            }}
-
-            h2 {{
-                color: #34495e;
-                margin-top: 30px;
-                font-size: 18pt;
-                font-weight: 600;
-                page-break-after: avoid;
-            }}
-
-            h3 {{
-                color: #7f8c8d;
-                font-size: 14pt;
-                font-weight: 600;
-                page-break-after: avoid;
-            }}
-
-            code {{
-                background-color: #f4f4f4;
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-family: 'Courier New', monospace;
-                font-size: 9pt;
-            }}
-
-            pre {{
-                background-color: #f8f8f8;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 15px;
-                overflow-x: auto;
-                page-break-inside: avoid;
-            }}
-
-            pre code {{
-                background-color: transparent;
-                padding: 0;
-            }}
-
-            img {{
-                max-width: 100%;
-                height: auto;
-                display: block;
-                margin: 20px auto;
-                page-break-inside: avoid;
-            }}
-
-            hr {{
-                border: none;
-                border-top: 2px solid #ecf0f1;
-                margin: 30px 0;
-            }}
-
-            table {{
-                border-collapse: collapse;
-                width: 100%;
-                margin: 20px 0;
-                page-break-inside: avoid;
-            }}
-
-            th, td {{
-                border: 1px solid #ddd;
-                padding: 8px;
-                text-align: left;
-            }}
-
-            th {{
-                background-color: #3498db;
-                color: white;
-                font-weight: 600;
-            }}
-
-            blockquote {{
-                border-left: 4px solid #3498db;
-                padding-left: 20px;
-                margin-left: 0;
-                color: #555;
-                font-style: italic;
-            }}
-
-            p {{
-                margin: 10px 0;
-                text-align: justify;
-            }}
-
-            ul, ol {{
-                margin: 10px 0;
-                padding-left: 30px;
-            }}
-
-            li {{
-                margin: 5px 0;
-            }}
-        </style>
-    </head>
-    <body>
-        {page_template}
-        {generation_info}
-        {html_content}
-    </body>
-    </html>
-    """
-
-    return full_html
+    return html_document(markdown_to_html(markdown_content), add_logo)
 
 
 def markdown_to_pdf(
@@ -303,18 +290,19 @@ def save_course_as_pdf(
     """
     logger.info(f"[SAVE_FILES] 📄 Generating PDF for course: {course.title}")
 
-    markdown_content = course_output_to_markdown(course)
-    md_path = save_markdown_to_file(markdown_content)
-    pdf_path = markdown_to_pdf(markdown_content, output_pdf_path)
+    if output_pdf_path is None:
+        fd, output_pdf_path = tempfile.mkstemp(suffix=".pdf", prefix="course_")
+        os.close(fd)
+
+    with open(output_pdf_path, "wb") as pdf_file:
+        _write_course_pdf(course, pdf_file, {})
+    logger.info(f"[SAVE_FILES] ✅ PDF generated: {output_pdf_path}")
 
-    if not keep_markdown:
-        try:
-            os.unlink(md_path)
-            md_path = None
-        except Exception as e:
-            logger.warning(f"[SAVE_FILES] ⚠️ Failed to delete temporary Markdown: {e}")
+    md_path = None
+    if keep_markdown:
+        md_path = save_markdown_to_file(course_output_to_markdown(course))
 
-    return pdf_path, md_path
+    return output_pdf_path, md_path
 
 
 def sanitize_filename(filename: str) -> str:
@@ -335,33 +323,54 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def generate_course_pdf_response(course: CourseOutput) -> Response:
+def _write_course_pdf(course: CourseOutput, dest, image_files: Dict[str, str]) -> None:
+    with tempfile.TemporaryDirectory(prefix="course_pdf_") as workdir:
+        files = _diagram_files(course, workdir, image_files)
+        full_html = course_html(course, add_logo=True, image_src=_image_src(files))
+        _render_pdf(full_html, dest, files)
+
+
+def course_pdf_bytes(
+    course: CourseOutput, image_files: Optional[Dict[str, str]] = None
+) -> bytes:
     """
-    Generate in-memory PDF from CourseOutput and return as FastAPI Response.
+    Render a course to PDF bytes (CPU-bound: run it through the PDF pool).
 
-    PDF is created in memory with no disk writes.
+    Diagrams are handed to xhtml2pdf as files through its link callback,
+    never as base64 inside Markdown or HTML.
 
     Args:
         course: CourseOutput to convert
+        image_files: Diagram files by `img_hash` (see `write_course_assets`)
 
     Returns:
-        FastAPI Response with PDF content and download headers
+        PDF document bytes
     """
-    logger.info(f"[SAVE_FILES] 📄 Generating PDF for frontend: {course.title}")
-
-    markdown_content = course_output_to_markdown(course)
-    full_html = _build_html_template(markdown_content, add_logo=True)
-
     pdf_buffer = BytesIO()
-    pisa.CreatePDF(src=full_html, dest=pdf_buffer, encoding='utf-8')
+    _write_course_pdf(course, pdf_buffer, image_files or {})
+    return pdf_buffer.getvalue()
 
-    pdf_bytes = pdf_buffer.getvalue()
-    filename = sanitize_filename(course.title) + ".pdf"
 
-    logger.info(f"[SAVE_FILES] ✅ PDF generated in memory: {filename} ({len(pdf_bytes)} bytes)")
+def pdf_response(
+    pdf_bytes: bytes, title: str, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Wrap PDF bytes in a download Response.
+
+    Args:
+        pdf_bytes: PDF document
+        title: Title used for the attachment filename
+        headers: Extra headers (ETag, Cache-Control, ...)
 
+    Returns:
+        FastAPI Response with PDF content and download headers
+    """
+    filename = sanitize_filename(title) + ".pdf"
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **(headers or {}),
+        },
     )
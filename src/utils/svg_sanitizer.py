@@ -0,0 +1,115 @@
+"""
+Sanitizer for rendered SVG diagrams.
+
+Diagram sources are written by the LLM, and renderers pass some of it
+through (Mermaid HTML labels, PlantUML/Vega-Lite links). The SVG is served
+from the API origin and inlined by the frontend, so before it is stored or
+inlined:
+
+- script-capable and navigating elements (script, iframe, object, embed,
+  meta, link, base) are dropped with their content,
+- event handler attributes (on*) are dropped,
+- href / xlink:href are kept only for internal references ("#id"),
+- any attribute whose value is a javascript: URL is dropped,
+- comments, processing instructions and the DOCTYPE (entities) are dropped.
+
+The document is re-serialized token by token with expat, without namespace
+processing, so prefixes and xmlns declarations are kept as written (the
+XHTML labels of Mermaid keep rendering when inlined).
+"""
+
+import logging
+import re
+from typing import List, Optional
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_ELEMENTS = frozenset(
+    {"script", "iframe", "object", "embed", "meta", "link", "base"}
+)
+HREF_ATTRIBUTES = frozenset({"href", "xlink:href"})
+_WHITESPACE = re.compile(r"[\s\x00-\x1f]+")
+
+
+def _escape_text(content: str) -> str:
+    # ">" stays as is: <style> content is raw text once inlined in HTML
+    return content.replace("&", "&amp;").replace("<", "&lt;")
+
+
+def _local_name(name: str) -> str:
+    return name.rsplit(":", 1)[-1].lower()
+
+
+def _allowed_attribute(name: str, value: str) -> bool:
+    if _local_name(name).startswith("on"):
+        return False
+    if name.lower() in HREF_ATTRIBUTES and not value.strip().startswith("#"):
+        return False
+    return not _WHITESPACE.sub("", value).lower().startswith("javascript:")
+
+
+def sanitize_svg(data: bytes) -> Optional[bytes]:
+    """
+    Return a script-free copy of an SVG document.
+
+    Args:
+        data: SVG document (UTF-8)
+
+    Returns:
+        Sanitized SVG bytes, or None if the document is not well-formed XML
+    """
+    out: List[str] = []
+    blocked_depth = 0
+    empty = False  # last token is a start tag with nothing after it yet
+
+    def start(name, attributes):
+        nonlocal blocked_depth, empty
+        if blocked_depth or _local_name(name) in BLOCKED_ELEMENTS:
+            blocked_depth += 1
+            return
+        attrs = "".join(
+            f" {key}={quoteattr(value)}"
+            for key, value in attributes.items()
+            if _allowed_attribute(key, value)
+        )
+        out.append(f"<{name}{attrs}>")
+        empty = True
+
+    def end(name):
+        nonlocal blocked_depth, empty
+        if blocked_depth:
+            blocked_depth -= 1
+            return
+        if empty:
+            # <br/> and friends: "</br>" would be a second break once inlined
+            out[-1] = out[-1][:-1] + "/>"
+        else:
+            out.append(f"</{name}>")
+        empty = False
+
+    def text(content):
+        nonlocal empty
+        if not blocked_depth:
+            out.append(_escape_text(content))
+            empty = False
+
+    def entity_declaration(*_):
+        raise ValueError("entity declarations are not allowed")
+
+    parser = expat.ParserCreate("utf-8")
+    parser.buffer_text = True
+    parser.ordered_attributes = False
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text
+    parser.EntityDeclHandler = entity_declaration
+
+    try:
+        parser.Parse(data, True)
+    except (expat.ExpatError, ValueError) as e:
+        logger.warning(f"[SVG] Rejected malformed diagram: {e}")
+        return None
+
+    return "".join(out).encode("utf-8")
@@ -0,0 +1,79 @@
+"""
+Shared plumbing of the two-tier caches (LLM responses, diagrams, PDFs).
+
+Each cache keeps an in-process LRU in front of a Postgres store, shares one
+computation between concurrent callers of the same key, and exposes the
+same hit/miss counters through `stats()` (see `/api/health/metrics`).
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Tuple, TypeVar
+
+from src.utils.lru import BytesLRU
+
+T = TypeVar("T")
+
+
+class TwoTierCache:
+    """Base class: LRU tier, single-flight and counters."""
+
+    def __init__(self, max_bytes: int, persistent: bool = True, counters: Iterable[str] = ()):
+        self.persistent = persistent
+        self._memory = BytesLRU(max_bytes)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "errors": 0,
+            **{name: 0 for name in counters},
+        }
+
+    async def _single_flight(
+        self, key: str, produce: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+        Run `produce()` once for all concurrent callers of `key`.
+
+        If the caller running it is cancelled, a waiting caller takes over
+        instead of being cancelled with it.
+
+        Returns:
+            The result, and whether it was shared from another caller's run
+        """
+        while key in self._inflight:
+            future = self._inflight[key]
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not future.cancelled() or (current and current.cancelling()):
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await produce()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid "exception was never retrieved" when nobody else waited
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters, hit ratio and in-memory footprint."""
+        hits = self._stats["memory_hits"] + self._stats["persistent_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.size,
+        }
@@ -0,0 +1,26 @@
+"""Offline test setup: dummy settings so src.config loads without a .env."""
+
+import os
+
+for name, value in {
+    "APP_NAME": "test",
+    "ENV": "test",
+    "HOST": "localhost",
+    "PORT": "8000",
+    "DEBUG": "false",
+    "GOOGLE_API_KEY": "test",
+    "GEMINI_MODEL_2_5_FLASH": "gemini-2.5-flash",
+    "GEMINI_MODEL_2_5_FLASH_LITE": "gemini-2.5-flash-lite",
+    "GEMINI_MODEL_2_5_FLASH_LIVE": "gemini-2.5-flash-live",
+    "GEMINI_MODEL_2_5_FLASH_IMAGE": "gemini-2.5-flash-image",
+    "DB_USER_SQL": "test",
+    "DB_PASSWORD_SQL": "test",
+    "DB_NAME_SQL": "test",
+    "DB_HOST_SQL": "localhost",
+    "OIDC_GOOGLE_CLIENT_ID": "test",
+    "JWT_SECRET_KEY": "test",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "GOOGLE_CLIENT_SECRET_B64": "e30=",
+    "GEMINI_FILES_BACKEND": "fake",
+}.items():
+    os.environ.setdefault(name, value)
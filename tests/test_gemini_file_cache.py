@@ -0,0 +1,152 @@
+"""GeminiFileCache with the fake files backend, no network and no database."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from google.adk.artifacts import InMemoryArtifactService
+from google.genai import types
+
+from src.bdd.gemini_file_cache import (
+    EXPIRED_FILE_NOTE,
+    REPEATED_FILE_NOTE,
+    FakeFilesBackend,
+    GeminiFileCache,
+    artifact_reference,
+)
+
+KEY = {"app_name": "test", "user_id": "user", "session_id": "session"}
+
+
+class InMemoryFileCache(GeminiFileCache):
+    """GeminiFileCache keeping its references in a dict instead of Postgres."""
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        self.rows = {}
+
+    async def _load(self, key):
+        return self.rows.get(tuple(key.values()))
+
+    async def _store(self, key, uploaded):
+        self.rows[tuple(key.values())] = SimpleNamespace(
+            uri=uploaded.uri,
+            mime_type=uploaded.mime_type,
+            expires_at=uploaded.expires_at,
+        )
+
+
+@pytest.fixture
+def backend():
+    return FakeFilesBackend(timedelta(hours=48))
+
+
+@pytest.fixture
+def cache(backend):
+    return InMemoryFileCache(backend)
+
+
+@pytest_asyncio.fixture
+async def artifact_service():
+    service = InMemoryArtifactService()
+    await service.save_artifact(
+        **KEY,
+        filename="syllabus.pdf",
+        artifact=types.Part.from_bytes(data=b"%PDF-1.4", mime_type="application/pdf"),
+    )
+    return service
+
+
+def user_message(*parts):
+    return types.Content(role="user", parts=[types.Part(text="Bonjour"), *parts])
+
+
+@pytest.mark.asyncio
+async def test_reference_is_resolved_to_an_uploaded_file(cache, backend, artifact_service):
+    history = [user_message(artifact_reference("syllabus.pdf"))]
+
+    resolved = await cache.resolve_contents(
+        history, **KEY, artifact_service=artifact_service
+    )
+
+    part = resolved[0].parts[1]
+    assert part.file_data.file_uri.startswith("fake://files/")
+    assert part.file_data.mime_type == "application/pdf"
+    assert len(backend.uploads) == 1
+    # The history itself keeps the reference
+    assert history[0].parts[1].file_data.file_uri == "artifact://syllabus.pdf"
+
+
+@pytest.mark.asyncio
+async def test_valid_reference_is_not_uploaded_again(cache, backend, artifact_service):
+    history = [
+        user_message(artifact_reference("syllabus.pdf")),
+        user_message(artifact_reference("syllabus.pdf")),
+    ]
+
+    await cache.resolve_contents(history, **KEY, artifact_service=artifact_service)
+    await cache.resolve_contents(history, **KEY, artifact_service=artifact_service)
+
+    assert len(backend.uploads) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_reference_carries_the_file(cache, artifact_service):
+    history = [
+        user_message(artifact_reference("syllabus.pdf")),
+        user_message(artifact_reference("syllabus.pdf")),
+        user_message(artifact_reference("syllabus.pdf")),
+    ]
+
+    resolved = await cache.resolve_contents(
+        history, **KEY, artifact_service=artifact_service
+    )
+
+    assert [c.parts[1].text for c in resolved[:2]] == [REPEATED_FILE_NOTE] * 2
+    assert resolved[2].parts[1].file_data.file_uri.startswith("fake://files/")
+
+
+@pytest.mark.asyncio
+async def test_expired_reference_is_uploaded_again(cache, artifact_service):
+    await cache.resolve_contents(
+        [user_message(artifact_reference("syllabus.pdf"))],
+        **KEY,
+        artifact_service=artifact_service,
+    )
+    row = next(iter(cache.rows.values()))
+    row.expires_at = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    resolved = await cache.resolve_contents(
+        [user_message(artifact_reference("syllabus.pdf"))],
+        **KEY,
+        artifact_service=artifact_service,
+    )
+
+    assert resolved[0].parts[1].file_data.file_uri == row.uri
+    assert next(iter(cache.rows.values())).expires_at > row.expires_at
+
+
+@pytest.mark.asyncio
+async def test_persisted_files_api_uri_is_not_replayed(cache, artifact_service):
+    stale = types.Part.from_uri(
+        file_uri="https://generativelanguage.googleapis.com/v1beta/files/abc",
+        mime_type="application/pdf",
+    )
+
+    resolved = await cache.resolve_contents(
+        [user_message(stale)], **KEY, artifact_service=artifact_service
+    )
+
+    assert resolved[0].parts[1].text == EXPIRED_FILE_NOTE
+
+
+@pytest.mark.asyncio
+async def test_deleted_artifact_becomes_a_note(cache, artifact_service):
+    resolved = await cache.resolve_contents(
+        [user_message(artifact_reference("missing.pdf"))],
+        **KEY,
+        artifact_service=artifact_service,
+    )
+
+    assert resolved[0].parts[1].text == EXPIRED_FILE_NOTE
@@ -0,0 +1,38 @@
+"""sanitize_svg on hostile and ordinary diagram markup."""
+
+from src.utils.svg_sanitizer import sanitize_svg
+
+SVG_NS = 'xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"'
+
+
+def test_strips_script_handlers_and_external_links():
+    svg = f"""<svg {SVG_NS} onload="alert(1)">
+<script>alert(1)</script>
+<a xlink:href="javascript:alert(1)"><text>label</text></a>
+<image href="https://example.com/x.png"/>
+<set attributeName="href" to=" java\tscript:alert(1)"/>
+<foreignObject><div xmlns="http://www.w3.org/1999/xhtml" onclick="x()">
+<iframe src="https://example.com"/>Texte</div></foreignObject>
+</svg>""".encode()
+
+    clean = sanitize_svg(svg).decode()
+
+    for needle in ("script", "onload", "onclick", "javascript", "example.com", "iframe"):
+        assert needle not in clean.lower()
+    assert "<text>label</text>" in clean
+    assert 'xmlns="http://www.w3.org/1999/xhtml"' in clean
+    assert "Texte" in clean
+
+
+def test_keeps_internal_references_and_style():
+    svg = f'<svg {SVG_NS}><style>.a>.b{{fill:red}}</style><use href="#n1"/></svg>'.encode()
+
+    clean = sanitize_svg(svg).decode()
+
+    assert "<style>.a>.b{fill:red}</style>" in clean
+    assert '<use href="#n1"/>' in clean
+
+
+def test_rejects_entities_and_malformed_documents():
+    assert sanitize_svg(b'<!DOCTYPE svg [<!ENTITY a "aaaa">]><svg>&a;</svg>') is None
+    assert sanitize_svg(b"<svg><g></svg>") is None
@@ -0,0 +1,77 @@
+"""Single-flight behaviour of TwoTierCache, no database."""
+
+import asyncio
+
+import pytest
+
+from src.utils.two_tier_cache import TwoTierCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_run():
+    cache = TwoTierCache(1024)
+    runs = 0
+    release = asyncio.Event()
+
+    async def produce():
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(cache._single_flight("k", produce)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*tasks)
+    assert runs == 1
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert all(value == "value" for value, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_waiter_takes_over_when_the_runner_is_cancelled():
+    cache = TwoTierCache(1024)
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(60)
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    leader = asyncio.create_task(cache._single_flight("k", slow))
+    await started.wait()
+    follower = asyncio.create_task(cache._single_flight("k", fast))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await follower == ("fast", False)
+    assert not cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_runner():
+    cache = TwoTierCache(1024)
+    release = asyncio.Event()
+
+    async def produce():
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(cache._single_flight("k", produce))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache._single_flight("k", produce))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    release.set()
+    assert await leader == ("value", False)